@@ -4,8 +4,6 @@ import platform
 
 import semver
 
-from multiscript.application import MultiscriptApplication
-
 
 # Flag to turn pyinstaller argv-emulation on macOS on (True) or off (False)
 #
@@ -17,11 +15,24 @@ ARGV_EMULATION = False
 _app = None
 
 def app():
+    '''Returns the application singleton, creating a (Qt) MultiscriptApplication if none has been set.'''
     global _app
     if _app is None:
+        # Imported here, so that Qt is only imported if needed
+        from multiscript.application import MultiscriptApplication
         _app = MultiscriptApplication()
     return _app
 
+def app_is_set() -> bool:
+    '''Returns True if the application singleton has been created or set.'''
+    return _app is not None
+
+def set_app(application):
+    '''Sets the application singleton returned by app(). Used to run without Qt, by setting a
+    MultiscriptBaseApplication before app() is first called.'''
+    global _app
+    _app = application
+
 
 _platform_system = None
 
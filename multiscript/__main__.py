@@ -1,10 +1,8 @@
 
 import logging
+import sys
 import traceback
 
-from PySide6 import QtCore, QtWidgets
-from PySide6.QtCore import Qt
-
 import multiscript
 
 
@@ -14,6 +12,13 @@ _logger.setLevel(logging.DEBUG)
 
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in ("run", "batch"):
+        # Headless plan runs. Qt is never imported.
+        from multiscript import cli
+        sys.exit(cli.main(sys.argv[1:]))
+
+    from PySide6 import QtWidgets
+
     # On Windows, the Fusion style looks better than the native style
     if multiscript.on_windows():
         QtWidgets.QApplication.setStyle("Fusion")
@@ -8,331 +8,19 @@ import sys
 import traceback
 import zipfile
 
-import pluginlib
 from PySide6 import QtCore, QtWidgets, QtGui
-from PySide6.QtCore import Qt, QStandardPaths
+from PySide6.QtCore import QStandardPaths
 
 import multiscript
 from multiscript import plan
+from multiscript.base_application import MultiscriptBaseApplication, PLUGIN_FILE_EXTENSION, PLUGIN_FILE_FILTER
 from multiscript.qt_custom.concurrency import call_main_thread_later
 from multiscript.ui.main_window import MainWindow
 from multiscript.util.exception_catcher import catch_unhandled_exceptions
 
-# Plugins we import to ensure pyinstaller includes them in the distribution
-from multiscript.plugins.base import Plugin
-from multiscript.plugins.builtin import BuiltinPlugin
-
 
 _logger = logging.getLogger(__name__)
 
-PLUGIN_FILE_EXTENSION = ".mplugin"
-PLUGIN_FILE_FILTER = "*" + PLUGIN_FILE_EXTENSION
-DEFAULT_TEMPLATE_NAMES = ["Default Template.docx", "Default Template.txt"]
-
-# TODO: Extract other plugin functionality into a plugin manager, but still expose
-#       key plugins through the application object.
-
-
-class MultiscriptBaseApplication:
-    '''Application base class.
-    
-    It contains most of the application-specific code, but omits most of the
-    Qt-related functionality.
-    '''
-    
-    def __init__(self):
-        self._app_config_group = None
-        self._attribution_contents = None
-        self.replace_missing_templates()
-
-        self._known_plugins = {}    # Needed by plugin-loading architecture
-        self._plugins = []          # Current list of loaded plugins
-        self._plugins_by_id = {}
-
-        self._sources = []
-        self._sources_by_long_id = {}
-
-        self._outputs = []
-        self._outputs_by_long_id = {}
-
-    def replace_missing_templates(self):
-        for template_name in DEFAULT_TEMPLATE_NAMES:
-            template_path = self.templates_dir_path / template_name
-            if not template_path.exists():
-                internal_template_path = Path(__file__).parent / "templates" / template_name
-                # TODO: Handle any exception raised by attempting to copy the template.
-                # Programmatically create a fresh template?
-                shutil.copyfile(internal_template_path, template_path)
-
-    @property
-    def all_plugins(self):
-        return self._plugins
-
-    def plugin(self, id):
-        '''Returns the plugin instance with the given id, or None if there is no loaded
-        plugin with that id.
-        '''
-        if id in self._plugins_by_id:
-            return self._plugins_by_id[id]
-        else:
-            return None
-
-    @property
-    def all_sources(self):
-        '''A collated list of all BibleSources from all loaded plugins.'''
-        return self._sources
-    
-    def source(self, long_id):
-        '''Returns a particular BibleSource using its long_id (without needing a reference to its plugin).
-        '''
-        return self._sources_by_long_id[long_id]
-    
-    @property
-    def all_outputs(self):
-        '''A collated list of all BibleOutputs from all loaded plugins.'''
-        return self._outputs
-    
-    def outputs_for_ext(self, template_file_ext):
-        '''Returns a collated list of all BibleOutputs that accept the given template file
-        extension (e.g. '.docx').
-        '''
-        return [output for output in self.all_outputs if template_file_ext in output.accepted_template_exts]
-
-    def output(self, long_id):
-        '''Returns a particular BibleOutput using its long_id (without needing a reference to its plugin).
-        '''
-        return self._outputs_by_long_id[long_id]
-
-    @property
-    def all_accepted_template_exts(self):
-        '''A collated list of all the template file extensions from all available BibleOutputs.'''
-        all_exts = set()
-        for output in self.all_outputs:
-            all_exts.update(output.accepted_template_exts)
-        return sorted(list(all_exts))
-
-    def load_plugins(self):
-        '''Load all available plugins, including the built-in plugin. Must be called at least
-        once at application startup, to ensure the built-in plugin is loaded.
-
-        Can be safely called multiple times to discover any newly added plugins.
-        '''
-        if len(self._plugins) == 0:
-            # Load builtin plugin
-            self._update_plugin_collections(BuiltinPlugin())
-
-            # Merely importing the BuiltinPlugin causes it be detected by the PluginLoader.
-            # We therefore call _get_new_plugin_list once first, so the BuiltinPlugin is not
-            # accidentally associated with later plugin folders.
-            self._get_new_plugin_list(Plugin, prefix_package='multiscript')
-
-        # Load plugins from base plugin folders
-        plugin_base_paths = []
-        if self.app_plugin_dir_path is not None and self.app_plugin_dir_path.is_dir():
-            plugin_base_paths.append(self.app_plugin_dir_path)
-        alt_plugins_path = self.app_config_group.plugins.altPluginsPath
-        if alt_plugins_path is not None and alt_plugins_path.is_dir():
-            plugin_base_paths.append(alt_plugins_path)
-        
-        for base_path in plugin_base_paths:
-            self._load_plugins_at_base_path(base_path)
-
-    def _load_plugins_at_base_path(self, base_path):
-        _logger.debug(f"Searching for plugins in base path {base_path}")
-        for sub_path in Path(base_path).iterdir():
-            self._load_plugin_at_path(sub_path)
-
-    def _load_plugin_at_path(self, path):
-        '''Load any available plugin at the specified path. Returns the plugin instance if successful,
-        otherwise returns None.
-
-        Can be safely called multiple times to discover any newly added plugins at the path.
-        '''
-        path = Path(path) # Ensure we have a path object, and not just a str
-        # Ignore the path if it's not a directory, or it's hidden
-        if not path.is_dir() or path.name[0] == '.':
-            return None
-        # Ignore any source code for test plugin in the alt plugins directory
-        if path.name == 'app_multiscript_test_plugin' and \
-           path.parent == self.app_config_group.plugins.altPluginsPath:
-           return None
-        # Make sure we have the required directory structure
-        plugin_id = path.name
-        if not (path / "plugin/").is_dir() or not (path / "plugin" / plugin_id).is_dir():
-            return None
-
-        # Include any site-packages directory in the plugin
-        site_packages_path = path / "site-packages/"
-        if site_packages_path.is_dir():
-        # This code doesn't seem to work when frozen with pyinstaller.
-        #     site.addsitedir(site_packages_path)
-        # So we just try this instead:
-            sys.path.append(str(site_packages_path))
-
-        # We will only search within the 'plugin' subdir
-        search_path = path / "plugin"
-
-        _logger.debug(f"\tSearching for plugins in {search_path}")
-        search_path_in_syspath = search_path in sys.path
-        if not search_path_in_syspath:
-            sys.path.append(str(search_path))
-        new_plugins = self._get_new_plugin_list(Plugin, paths=[str(search_path)], prefix_package='multiscript')
-        if not search_path_in_syspath:
-            sys.path.remove(str(search_path))
-        num_new_plugins = len(new_plugins)
-        if num_new_plugins == 0:
-            _logger.debug(f"\t\tNo new plugins found in directory: {search_path.name}")
-            return None
-        elif num_new_plugins > 1:
-            _logger.debug(f"\t\tToo many plugin classes ({num_new_plugins}) found in {search_path.name}. Ignoring path")
-            return None
-        else:
-            _logger.debug("\t\tFound: " + str(new_plugins))
-            # Exactly one plugin in the sub_path, so we instantiate it
-            plugin_instance = None
-            try:
-                plugin_instance = new_plugins[0]()
-                plugin_instance.id = plugin_id
-                plugin_instance.base_path = search_path.parent
-                self._update_plugin_collections(plugin_instance)
-            except Exception as exception:
-                _logger.debug(f"\t\tThe plugin {plugin_id} could not be instantiated.")
-                _logger.exception(exception)
-            return plugin_instance
-
-    def _update_plugin_collections(self, plugin_instance):
-        '''For a new plugin_instance, update the internal collections of plugins, sources, outputs etc.
-        '''
-        self._plugins.append(plugin_instance)
-        self._plugins_by_id[plugin_instance.id] = plugin_instance
-
-        plugin_sources = plugin_instance.all_sources
-        self._sources.extend(plugin_sources)
-        self._sources_by_long_id.update({source.long_id: source for source in plugin_sources})
-
-        plugin_outputs = plugin_instance.all_outputs
-        self._outputs.extend(plugin_outputs)
-        self._outputs_by_long_id.update({output.long_id: output for output in plugin_outputs})
-
-    def _get_new_plugin_list(self, plugin_class, **plugin_loader_args):
-        '''Returns a simple list of newly loaded plugins which are subclasses of plugin_class
-        
-        plugin_loader_args is a dict of any arguments to be supplied to the PluginLoader.
-        '''
-        new_plugin_items = self._get_new_plugin_items(**plugin_loader_args)
-        new_plugin_list = list(new_plugin_items.get(plugin_class.__name__, {}).values())
-        return new_plugin_list
-
-    def _get_new_plugin_items(self, **plugin_loader_args):
-        '''Returns newly loaded plugins, in the same format as pluginlib.PluginLoader().plugins.items()
-        
-        plugin_loader_args is a dict of any arguments to be supplied to the PluginLoader.
-        '''
-        new_plugins = {}
-
-        # Note that pluginglib.PluginLoader always includes previously loaded plugins when asked to load
-        # new plugins. We therefore use the existing collection of (previously loaded) plugins, to determine
-        # which plugins are genuinely new.
-        try:
-            loader = pluginlib.PluginLoader(**plugin_loader_args)
-            all_plugins = loader.plugins.items() # All old and new plugins together
-
-            for plugin_type, plugins_by_name in all_plugins:
-                if not plugin_type in self._known_plugins:
-                    # A new root-level plugin type has been discovered
-                    self._known_plugins[plugin_type] = {}
-                    new_plugins[plugin_type] = {}
-                
-                for plugin_name, plugin_class in plugins_by_name.items():
-                    if not plugin_name in self._known_plugins[plugin_type]:
-                        # A new plugin has been discovered
-                        if not plugin_type in new_plugins:
-                            # We need to create a root-level entry for the new plugin
-                            new_plugins[plugin_type] = {}
-                
-                        self._known_plugins[plugin_type][plugin_name] = plugin_class
-                        new_plugins[plugin_type][plugin_name] = plugin_class
-        except Exception as exception:
-            _logger.debug(f"\t\tThere was a problem trying to load plugins using these args: {plugin_loader_args}")
-            _logger.exception(exception)
-
-        return new_plugins  # Return only the newly loaded plugins
-
-    @property
-    def user_app_data_path(self):
-        path = Path(QStandardPaths.writableLocation(QStandardPaths.AppDataLocation))
-        return path
-
-    @property
-    def user_docs_path(self):
-        path = Path(QStandardPaths.writableLocation(QStandardPaths.DocumentsLocation))
-        return path
-
-    @property
-    def app_docs_path(self):
-        path = self.user_docs_path / "Multiscript"
-        path.mkdir(parents=True, exist_ok=True) # Ensure directory exists
-        return path
-
-    @property
-    def templates_dir_path(self):
-        path = self.app_docs_path / "Templates"
-        path.mkdir(parents=True, exist_ok=True) # Ensure directory exists
-        return path
-
-    @property
-    def default_template_path(self):
-        self.replace_missing_templates()
-        path = self.templates_dir_path / DEFAULT_TEMPLATE_NAMES[0]
-        return path
-
-    @property
-    def output_dir_path(self):
-        path = self.app_docs_path / "Output"
-        path.mkdir(parents=True, exist_ok=True) # Ensure directory exists
-        return path
-
-    @property
-    def app_config_path(self):
-        return self.user_app_data_path / "Config" / "app_config.json"
-
-    @property
-    def app_plugin_dir_path(self):
-        path = self.user_app_data_path / "Plugins"
-        path.mkdir(parents=True, exist_ok=True) # Ensure directory exists
-        return path
-
-    @property
-    def icon(self):
-        return QtGui.QIcon(str(Path(__file__).parent / "icons" / "multiscript.svg"))
-
-    @property
-    def app_config_group(self):
-        if self._app_config_group is None:
-            # Load app config from file
-            self._app_config_group = multiscript.config.app.load_app_config_group(self.app_config_path)
-
-            # If loading from file didn't work, create a new default app config
-            if self._app_config_group is None:
-                self._app_config_group = multiscript.config.app.AppConfigGroup()
-                self._app_config_group.save()
-            
-        return self._app_config_group
-
-    @property
-    def attribution_contents(self):
-        if self._attribution_contents is not None:
-            return self._attribution_contents
-
-        attribution_path = Path(__file__).parent.parent / Path("Attribution.html")
-        try:
-            with open(attribution_path) as file:
-                self._attribution_contents = file.read()
-        except:
-            self._attribution_contents = ""
-
-        return self._attribution_contents
-
 
 class MultiscriptApplication(QtWidgets.QApplication, MultiscriptBaseApplication):
     '''Application class that adds in most of the Qt-related functionality.
@@ -362,6 +50,20 @@ class MultiscriptApplication(QtWidgets.QApplication, MultiscriptBaseApplication)
         self.setApplicationName("Multiscript")
         self.setWindowIcon(self.icon)
 
+    @property
+    def user_app_data_path(self):
+        path = Path(QStandardPaths.writableLocation(QStandardPaths.AppDataLocation))
+        return path
+
+    @property
+    def user_docs_path(self):
+        path = Path(QStandardPaths.writableLocation(QStandardPaths.DocumentsLocation))
+        return path
+
+    @property
+    def icon(self):
+        return QtGui.QIcon(str(Path(__file__).parent / "icons" / "multiscript.svg"))
+
     def ui_init(self):
         # Note that we can't include this code in the __init__ method, as the QApplication
         # needs to have *finished* initialising before we start creating QWidgets like windows.
@@ -0,0 +1,89 @@
+from collections import OrderedDict
+import threading
+
+from bibleref.ref import BibleRange
+
+from multiscript.bible.content import BibleContent
+from multiscript.bible.verse_id import range_to_ids
+from multiscript.bible.version import BibleVersion
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024   # Default memory limit of the app's BibleContentCache
+
+
+class BibleContentCache:
+    '''An in-memory LRU cache of loaded BibleContent, so that running a plan again (e.g. after changing its
+    template or output config) needn't load its Bible content from the sources again.
+
+    Content is keyed by the version's long_id and content_settings, and the range's verse ids. It's stored in
+    its compact binary encoding (see BibleContent.to_bytes()), so the cache's memory use is known, and each
+    get() returns a new BibleContent that the caller can modify freely. When the total size of the entries
+    exceeds max_bytes, the least recently used entries are evicted.
+
+    All methods are thread-safe.
+    '''
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hit_count = 0          # Number of get() calls that found content
+        self.miss_count = 0         # Number of get() calls that found no content
+        self._entries: OrderedDict[tuple, bytes] = OrderedDict()   # In order of least to most recently used
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(bible_version: BibleVersion, bible_range: BibleRange) -> tuple:
+        '''Returns the cache key for the content of bible_range in bible_version.'''
+        return (bible_version.long_id, bible_version.content_settings, range_to_ids(bible_range))
+
+    def get(self, bible_version: BibleVersion, bible_range: BibleRange) -> BibleContent:
+        '''Returns a new BibleContent holding the cached content of bible_range in bible_version, or None if
+        it isn't cached.'''
+        key = self.key(bible_version, bible_range)
+        with self._lock:
+            encoded_content = self._entries.get(key)
+            if encoded_content is None:
+                self.miss_count += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hit_count += 1
+        bible_content = BibleContent.from_bytes(encoded_content, bible_version)
+        bible_content.bible_range = bible_range
+        return bible_content
+
+    def put(self, bible_content: BibleContent):
+        '''Adds a copy of bible_content, which must have its bible_version and bible_range set, to the cache.'''
+        key = self.key(bible_content.bible_version, bible_content.bible_range)
+        encoded_content = bible_content.to_bytes()
+        with self._lock:
+            self._remove(key)
+            if len(encoded_content) > self.max_bytes:
+                return
+            self._entries[key] = encoded_content
+            self._total_bytes += len(encoded_content)
+            while self._total_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def discard_version(self, version_long_id: str):
+        '''Removes all the cached content of the version with version_long_id, e.g. because the version's
+        content has changed.'''
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == version_long_id]:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    @property
+    def total_bytes(self) -> int:
+        '''The total size of the cached content, in bytes.'''
+        return self._total_bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key: tuple):
+        encoded_content = self._entries.pop(key, None)
+        if encoded_content is not None:
+            self._total_bytes -= len(encoded_content)
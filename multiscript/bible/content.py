@@ -1,9 +1,43 @@
-from enum import Enum, auto
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from collections.abc import Iterable, MutableSequence
+from enum import Enum, Flag, auto
+import functools
+import hashlib
+import mmap
+from pathlib import Path
+import struct
+import sys
+import threading
 
 from bibleref.ref import BibleBook, BibleVerse, BibleRange
+import unicodedataplus
+
+from multiscript.bible.verse_id import NO_VERSE_ID, chap_base_id, range_from_ids, range_to_ids, verse_from_id, \
+                                        verse_to_id
+from multiscript.util.exception import MultiscriptException
 
 PART_NAME_LEN_WIDTH   = 25 # For justifying string representations of BibleContentParts
 
+_TYPE_CODE_MASK = 0x7F          # Bits of a token type code holding the BibleStreamTokenType value
+_POETRY_FLAG    = 0x80          # Bit set in the type code of START_PARA tokens for poetry paragraphs
+
+_MIN_TEXT_PARTS_TO_JOIN = 64    # Minimum number of pending text parts before they're joined to a stream's text buffer
+
+TOKEN_BATCH_SIZE = 4096         # Maximum number of tokens passed in each call to BibleStreamHandler.add_token_batch()
+
+#
+# Binary encoding of BibleContent and BibleStream (see BibleStream.to_bytes()). All integers are little-endian,
+# and each section starts on an 8-byte boundary, so the arrays can be read straight out of a memory-mapped file.
+#
+CONTENT_MAGIC           = b"MSBC"
+STREAM_MAGIC            = b"MSBS"
+ENCODING_VERSION        = 1
+_CONTENT_HEADER         = struct.Struct("<4sHHii")  # Magic, version, reserved, range start id, range end id
+_STREAM_HEADER          = struct.Struct("<4sHHQQ")  # Magic, version, reserved, token count, text length in bytes
+_ALIGNMENT              = 8
+
 
 class BibleContent:
     def __init__(self):
@@ -14,12 +48,51 @@ class BibleContent:
     @property
     def bible_range(self) -> BibleRange:
         return self._bible_range
-    
+
     @bible_range.setter
     def bible_range(self, value: BibleRange):
         self._bible_range: BibleRange = value
         self.body.current_verse = self._bible_range.start
 
+    def to_bytes(self) -> bytes:
+        '''Returns a compact binary encoding of this content's range and body, which can be decoded with
+        BibleContent.from_bytes(). The Bible version isn't included.'''
+        start_id, end_id = range_to_ids(self.bible_range) if self.bible_range is not None else \
+                           (NO_VERSE_ID, NO_VERSE_ID)
+        return _CONTENT_HEADER.pack(CONTENT_MAGIC, ENCODING_VERSION, 0, start_id, end_id) + \
+               _padding(_CONTENT_HEADER.size) + self.body.to_bytes()
+
+    @classmethod
+    def from_bytes(cls, buffer, bible_version: 'BibleVersion' = None) -> 'BibleContent':
+        '''Returns a new BibleContent decoded from buffer, which holds an encoding created by to_bytes(). buffer
+        can be any bytes-like object, including an mmap. Raises a BibleContentFormatError if buffer doesn't hold
+        a supported encoding.'''
+        buffer = memoryview(buffer).cast('B')
+        if len(buffer) < _CONTENT_HEADER.size:
+            raise BibleContentFormatError("The Bible content data is truncated.")
+        magic, version, reserved, start_id, end_id = _CONTENT_HEADER.unpack_from(buffer)
+        _check_magic_and_version(magic, version, CONTENT_MAGIC)
+
+        bible_content = cls()
+        bible_content.bible_version = bible_version
+        if start_id != NO_VERSE_ID:
+            bible_content.bible_range = range_from_ids(start_id, end_id)
+        bible_content.body = BibleStream.from_bytes(buffer[_aligned(_CONTENT_HEADER.size):], bible_content)
+        return bible_content
+
+    def to_file(self, path):
+        '''Writes the binary encoding of this content (see to_bytes()) to the file at path.'''
+        Path(path).write_bytes(self.to_bytes())
+
+    @classmethod
+    def from_file(cls, path, bible_version: 'BibleVersion' = None) -> 'BibleContent':
+        '''Returns a new BibleContent decoded from a file written by to_file(). The file is memory-mapped, so
+        only the encoded arrays are copied out of it.'''
+        with open(path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as file_map:
+                with memoryview(file_map) as buffer:
+                    return cls.from_bytes(buffer, bible_version)
+
     def __str__(self):
         string = ""
         if self.bible_version is not None:
@@ -62,12 +135,34 @@ class BibleStreamHandler:
     def add_end_small_caps(self):
         pass
 
+    def add_token_batch(self, token_batch: list[tuple['BibleStreamTokenType', object]]):
+        '''Adds a run of tokens at once. Each item in token_batch is a (BibleStreamTokenType, value) tuple, where
+        value is the text of a TEXT token, is_poetry for a START_PARA token, and None for other tokens.
+
+        BibleStream.copyStreamTo() calls this method in place of the individual add_*() methods, but only
+        for handlers that override it. Handlers can override it to emit output in bulk, rather than paying
+        the cost of a method call and an output operation for every token. This default implementation just
+        calls the individual methods.
+        '''
+        for token_type, value in token_batch:
+            if token_type is BibleStreamTokenType.TEXT:
+                self.add_text(value)
+            elif token_type is BibleStreamTokenType.START_PARA:
+                self.add_start_paragraph(value)
+            else:
+                getattr(self, _HANDLER_METHOD_NAMES[token_type.value])()
+
+
+def handles_token_batches(bible_stream_handler: BibleStreamHandler) -> bool:
+    '''Returns True if bible_stream_handler overrides BibleStreamHandler.add_token_batch().'''
+    return getattr(type(bible_stream_handler), 'add_token_batch', None) is not BibleStreamHandler.add_token_batch
+
 
 class TextOnlyHandler(BibleStreamHandler):
     def __init__(self):
         self.text = ""
         self._capitalize = False
-    
+
     def add_text(self, text: str):
         self.text += (text.upper() if self._capitalize else text)
 
@@ -83,13 +178,66 @@ class TextOnlyHandler(BibleStreamHandler):
     def add_end_small_caps(self):
         self._capitalize = False
 
+    def add_token_batch(self, token_batch):
+        text_parts = [self.text]
+        for token_type, value in token_batch:
+            if token_type is BibleStreamTokenType.TEXT:
+                text_parts.append(value.upper() if self._capitalize else value)
+            elif token_type is BibleStreamTokenType.END_PARA:
+                text_parts.append("\n\n")
+            elif token_type is BibleStreamTokenType.LINE_BREAK:
+                text_parts.append("\n")
+            elif token_type is BibleStreamTokenType.START_SMALL_CAPS:
+                self._capitalize = True
+            elif token_type is BibleStreamTokenType.END_SMALL_CAPS:
+                self._capitalize = False
+        self.text = "".join(text_parts)
+
 
 class BibleStream(BibleStreamHandler):
+    '''A stream of BibleStreamTokens, built up by calling the BibleStreamHandler methods.
+
+    Tokens aren't stored as individual objects, as a whole-book stream has hundreds of thousands of them.
+    Instead the stream keeps parallel compact arrays with one entry per token: a type code, the integer id
+    of the token's verse, and the offset and length of the token's text in a single shared text buffer.
+    The tokens property returns a sequence of lightweight BibleStreamToken views onto these arrays.
+
+    The stream also keeps an index of the span of tokens belonging to each verse, so that view() can find the
+    tokens of a BibleRange with a binary search, and return them as a BibleStreamView without copying.
+
+    The plain text returned by all_text() is kept between calls and only extended by the tokens added since,
+    so reading it doesn't need the whole stream to be replayed.
+    '''
     def __init__(self, bible_content=None):
         self.bible_content: BibleContent = bible_content
-        self.tokens: list[BibleStreamToken] = []
-        self.current_verse: BibleVerse = None
-        
+        self._current_verse: BibleVerse = None
+        self._current_verse_id: int = NO_VERSE_ID
+
+        self._type_codes = array('B')   # BibleStreamTokenType value of each token, plus _POETRY_FLAG
+        self._verse_ids = array('i')    # Verse id of each token (see multiscript.bible.verse_id)
+        self._text_starts = array('q')  # Offset of each token's text in the text buffer
+        self._text_lens = array('i')    # Length of each token's text (0 for tokens without text)
+        self._text_buffer = ""          # The shared text buffer, excluding any _text_parts not yet joined to it
+        self._text_parts = []           # Text added since the text buffer was last joined
+        self._text_len = 0              # Length of the text buffer including _text_parts
+
+        # The verse index. Each span is a run of consecutive tokens with the same verse id.
+        self._span_verse_ids = array('i')   # Verse id of each span
+        self._span_starts = array('q')      # Index of the first token of each span
+        self._verse_ids_sorted = True       # True if verse ids never decrease, so spans can be binary searched
+        self._verse_index_valid = True      # False if the index must be rebuilt before use
+
+        # The plain text of the stream, as returned by all_text()
+        self._plain_text_handler = TextOnlyHandler()    # Holds the plain text of the entries added to it so far
+        self._plain_text_entry_count = 0    # Number of entries added to _plain_text_handler
+        self._plain_text_last_text_len = 0  # Text length of the last of those entries (it may grow by merging)
+        self._script_counts = Counter()     # Count of code points of each script in the plain text counted so far
+        self._script_counted_len = 0        # Length of the plain text counted in _script_counts
+
+        # Guards the state above that's updated lazily while reading (the joined text buffer, the verse index and
+        # the plain text), so that a stream can be read from several threads once it's been built.
+        self._read_lock = threading.RLock()
+
         self.in_chap_num: bool = False
         self.in_verse_num: bool = False
         self.small_caps_level: int = 0
@@ -105,7 +253,7 @@ class BibleStream(BibleStreamHandler):
         self.insert_missing_whitespace = False      # If True, whitespace will be added between strings if it
                                                     # doesn't exist.
         self.space_str = " "                        # Whitespace to add
- 
+
         self.insert_missing_chap_num = False        # If True, a verse 1 without a previous chapter number will have
                                                     # the chapter number automatically inserted.
         self.insert_missing_first_verse_num = False # If True, a chapter number without a subsequent verse 1 number
@@ -114,7 +262,10 @@ class BibleStream(BibleStreamHandler):
                                                     # text.
         self.psalms_include_titles = True           # True if Psalms include titles, which are treated as part of
                                                     # verse 1 but occur before the verse 1 number.
-        
+        self.merge_text = True                      # If True, text added straight after text in the same verse is
+                                                    # merged into the previous text token, rather than adding
+                                                    # another token.
+
         # TODO: Add switch to insert new paragraph at chapter boundaries if not provided.
 
         #
@@ -124,37 +275,192 @@ class BibleStream(BibleStreamHandler):
         self._insert_space_before_text = False      # Internal flag: if True, whitespace will be added before
                                                     # the next text string.
 
+    def to_bytes(self) -> bytes:
+        '''Returns a compact binary encoding of the tokens in this stream, which can be decoded with
+        BibleStream.from_bytes(). The encoding is versioned, and is laid out as:
+
+            Header:         magic (b"MSBS"), encoding version, reserved, token count, text length in bytes
+            Text starts:    int64 offset of each token's text in the text (in code points)
+            Verse ids:      int32 verse id of each token (see multiscript.bible.verse_id)
+            Text lengths:   int32 length of each token's text (in code points)
+            Type codes:     uint8 type code of each token
+            Text:           the text of all the tokens, in UTF-8
+
+        Each section is padded to a multiple of 8 bytes. The behavioural switches (e.g. strip_text) aren't
+        included, as they only affect how tokens are added.
+        '''
+        if sum(self._text_lens) != len(self.text_buffer):
+            self._keep_entries(range(len(self._type_codes)))    # Drop the text of removed tokens
+        text_bytes = self.text_buffer.encode('utf-8')
+        sections = [_STREAM_HEADER.pack(STREAM_MAGIC, ENCODING_VERSION, 0, len(self._type_codes), len(text_bytes))]
+        for token_array in (self._text_starts, self._verse_ids, self._text_lens, self._type_codes):
+            if sys.byteorder != 'little':
+                token_array = array(token_array.typecode, token_array)
+                token_array.byteswap()
+            sections.append(token_array.tobytes())
+        sections.append(text_bytes)
+        return b"".join(section + _padding(len(section)) for section in sections)
+
+    def digest(self) -> bytes:
+        '''Returns a SHA-256 digest of the tokens in this stream (their types, verses and text), which is the same
+        for any streams holding the same tokens.'''
+        text_buffer = self.text_buffer
+        token_text = "".join([text_buffer[text_start:text_start + text_len]
+                              for text_start, text_len in zip(self._text_starts, self._text_lens) if text_len > 0])
+        hash = hashlib.sha256(self._type_codes.tobytes())
+        hash.update(self._verse_ids.tobytes())
+        hash.update(self._text_lens.tobytes())
+        hash.update(token_text.encode('utf-8'))
+        return hash.digest()
+
+    @classmethod
+    def from_bytes(cls, buffer, bible_content: BibleContent = None) -> 'BibleStream':
+        '''Returns a new BibleStream decoded from buffer, which holds an encoding created by to_bytes(). buffer
+        can be any bytes-like object, including an mmap. Each of the token arrays and the text is copied out of
+        buffer in a single operation. Raises a BibleContentFormatError if buffer doesn't hold a supported
+        encoding.'''
+        buffer = memoryview(buffer).cast('B')
+        if len(buffer) < _STREAM_HEADER.size:
+            raise BibleContentFormatError("The Bible stream data is truncated.")
+        magic, version, reserved, token_count, text_byte_len = _STREAM_HEADER.unpack_from(buffer)
+        _check_magic_and_version(magic, version, STREAM_MAGIC)
+
+        bible_stream = cls(bible_content)
+        offset = _aligned(_STREAM_HEADER.size)
+        token_arrays = []
+        for typecode in ('q', 'i', 'i', 'B'):
+            token_array = array(typecode)
+            section_len = token_count * token_array.itemsize
+            if offset + section_len > len(buffer):
+                raise BibleContentFormatError("The Bible stream data is truncated.")
+            token_array.frombytes(buffer[offset:offset + section_len])
+            if sys.byteorder != 'little':
+                token_array.byteswap()
+            token_arrays.append(token_array)
+            offset += _aligned(section_len)
+        if offset + text_byte_len > len(buffer):
+            raise BibleContentFormatError("The Bible stream data is truncated.")
+
+        bible_stream._text_starts, bible_stream._verse_ids, bible_stream._text_lens, bible_stream._type_codes = \
+            token_arrays
+        bible_stream._text_buffer = str(buffer[offset:offset + text_byte_len], 'utf-8')
+        bible_stream._text_len = len(bible_stream._text_buffer)
+        bible_stream._verse_index_valid = False
+        bible_stream._invalidate_plain_text()
+        if token_count > 0:
+            bible_stream.current_verse = BibleVerse(verse_from_id(bible_stream._verse_ids[-1]))
+        return bible_stream
+
+    @property
+    def current_verse(self) -> BibleVerse:
+        '''The BibleVerse that tokens added to the stream belong to.'''
+        return self._current_verse
+
+    @current_verse.setter
+    def current_verse(self, value: BibleVerse):
+        self._current_verse = value
+        self._current_verse_id = verse_to_id(value)
+
+    @property
+    def tokens(self) -> 'BibleStreamTokens':
+        '''The tokens in this stream, as a mutable sequence of BibleStreamToken views.'''
+        return BibleStreamTokens(self)
+
+    @tokens.setter
+    def tokens(self, value):
+        entries = [self._entry_for_token(token) for token in value]
+        self._clear()
+        for entry in entries:
+            self._append_entry(*entry)
+
+    @property
+    def text_buffer(self) -> str:
+        '''The buffer holding the text of all the text tokens in this stream.'''
+        if len(self._text_parts) > 0:
+            with self._read_lock:
+                if len(self._text_parts) > 0:
+                    self._text_buffer += "".join(self._text_parts)
+                    self._text_parts = []
+        return self._text_buffer
+
+    def view(self, bible_range: BibleRange = None) -> 'BibleStreamView':
+        '''Returns a BibleStreamView of the tokens in this stream belonging to the verses of bible_range
+        (or of all the tokens, if bible_range is None). The tokens aren't copied.
+
+        When verses were added in canonical order (as they normally are) this takes O(log n) time.
+        '''
+        return BibleStreamView(self, self._indices_for_range(bible_range), bible_range)
+
     def constrain(self, bible_range):
-        new_tokens = []
-        for token in self.tokens:
-            if bible_range.contains(token.bible_verse):
-                new_tokens.append(token)
-        self.tokens = new_tokens
+        self._keep_entries(self._indices_for_range(bible_range))
         #
         # TODO: Close any unbalanced tokens. (e.g. we may have truncated a paragraph part-way through, so it would
         # be good to add any missing close-paragraph or open-paragraph tokens etc.)
         #
 
     def copyStreamTo(self, bible_stream_handler):
-        for token in self.tokens:
-            token.copyTokenTo(bible_stream_handler)
+        self._copy_entries_to(bible_stream_handler, range(len(self._type_codes)))
 
     def all_text(self):
         '''Returns only the basic plain text in the BibleStream.'''
-        text_receiver = TextOnlyHandler()
-        self.copyStreamTo(text_receiver)
-        return text_receiver.text
+        with self._read_lock:
+            self._update_plain_text()
+            return self._plain_text_handler.text
+
+    @property
+    def character_count(self) -> int:
+        '''The number of characters in the plain text of the stream (see all_text()).'''
+        return len(self.all_text())
+
+    def script_counts(self) -> Counter:
+        '''Returns a Counter of the number of code points of each Unicode script in the plain text of the stream.
+        The keys are the long Unicode script names (e.g. 'Latin'), including 'Common' and 'Inherited'.
+
+        Only the text added since the counts were last requested is counted.
+        '''
+        with self._read_lock:
+            plain_text = self.all_text()
+            for char in plain_text[self._script_counted_len:]:
+                self._script_counts[_char_script(char)] += 1
+            self._script_counted_len = len(plain_text)
+            return Counter(self._script_counts)
 
     def add_token(self, token):
+        '''Adds the type and any text of token to the end of the stream, at the current verse. The token then
+        becomes a view of the added entry.
+        '''
         if self._expected_token_type is not None and token.type is not self._expected_token_type:
             self.handle_unexpected_token(token)
-        
-        token.bible_verse = self.current_verse
-        self.tokens.append(token)
+
+        type_code, verse_id, text = self._entry_for_token(token)
+        self._append_entry(type_code, self._current_verse_id, text)
+        token.bible_stream = self
+        token._index = len(self._type_codes) - 1
+
+    def _add(self, token_type, text="", is_poetry=False):
+        '''Adds a new token to the end of the stream, at the current verse, without creating a token object
+        (unless it's needed for handle_unexpected_token()).'''
+        if self._expected_token_type is not None and token_type is not self._expected_token_type:
+            token_class = _TOKEN_CLASSES[token_type.value]
+            if token_type is BibleStreamTokenType.TEXT:
+                self.handle_unexpected_token(token_class(self, self.current_verse, text))
+            elif token_type is BibleStreamTokenType.START_PARA:
+                self.handle_unexpected_token(token_class(self, self.current_verse, is_poetry))
+            else:
+                self.handle_unexpected_token(token_class(self, self.current_verse))
+
+        if token_type is BibleStreamTokenType.TEXT and self.merge_text and len(self._type_codes) > 0 and \
+           self._type_codes[-1] == _TEXT_CODE and self._verse_ids[-1] == self._current_verse_id and \
+           self._text_starts[-1] + self._text_lens[-1] == self._text_len:
+            # The previous token's text is at the end of the text buffer, so we can just extend it.
+            self._append_text(text)
+            self._text_lens[-1] += len(text)
+        else:
+            self._append_entry(token_type.value | (_POETRY_FLAG if is_poetry else 0), self._current_verse_id, text)
 
     def handle_unexpected_token(self, token):
         # We already know the token is not of the expected type.
-        
+
         # If necessary, add any missing verse 1 number.
         if self.insert_missing_first_verse_num and \
             self._expected_token_type is BibleStreamTokenType.START_VERSE_NUM:
@@ -173,33 +479,33 @@ class BibleStream(BibleStreamHandler):
             text = text.strip()
 
         if self.insert_missing_whitespace and self._insert_space_before_text and \
-            len(text) > 0 and not text[0].isspace():                
+            len(text) > 0 and not text[0].isspace():
             text = self.space_str + text
-        
+
         if len(text) > 0:
-            self.add_token(BibleTextToken(self, self.current_verse, text))        
+            self._add(BibleStreamTokenType.TEXT, text)
             if self.insert_missing_whitespace:
                 self._insert_space_before_text = not text[-1].isspace()
 
     def add_start_paragraph(self, is_poetry=False):
-        self.add_token(BibleStartParagraphToken(self, self.current_verse, is_poetry))
+        self._add(BibleStreamTokenType.START_PARA, is_poetry=is_poetry)
         self._insert_space_before_text = False # First text of para needs no leading space
 
     def add_end_paragraph(self):
-        self.add_token(BibleEndParagraphToken(self, self.current_verse))
+        self._add(BibleStreamTokenType.END_PARA)
 
     def add_line_break(self):
-        self.add_token(BibleLineBreakToken(self, self.current_verse))
+        self._add(BibleStreamTokenType.LINE_BREAK)
         self._insert_space_before_text = False # First text of new line needs no leading space
 
     def add_start_chap_num(self):
         # If a space is needed, insert it now before the start of the chapter number
         self._insert_any_needed_space_before_number()
-        self.add_token(BibleStartChapNumToken(self, self.current_verse))
+        self._add(BibleStreamTokenType.START_CHAP_NUM)
         self.in_chap_num = True
 
     def add_end_chap_num(self):
-        self.add_token(BibleEndChapNumToken(self, self.current_verse))
+        self._add(BibleStreamTokenType.END_CHAP_NUM)
         self.in_chap_num = False
         if self.insert_missing_first_verse_num:
             self._expected_token_type = BibleStreamTokenType.START_VERSE_NUM
@@ -211,43 +517,368 @@ class BibleStream(BibleStreamHandler):
         # If necessary, add any missing chap number
         if self.insert_missing_chap_num and \
            self.current_verse is not None and self.current_verse.is_first_in_chap() and \
-           (len(self.tokens) == 0 or self.tokens[-1].type is not BibleStreamTokenType.END_CHAP_NUM):
-            
+           (len(self._type_codes) == 0 or self._type_codes[-1] != BibleStreamTokenType.END_CHAP_NUM.value):
+
             self.add_start_chap_num()
             self.add_text(str(self.current_verse.chap_num))
             self.add_end_chap_num()
-            self.add_token(BibleStartVerseNumToken(self, self.current_verse))
+            self._add(BibleStreamTokenType.START_VERSE_NUM)
             self._insert_space_before_text = False  # We don't want extra space here
             self.add_text(self.verse_sep)   # We need to add the verse seperator inside the verse num section
             self._insert_space_before_text = False  # We don't want extra space here
         else:
-            self.add_token(BibleStartVerseNumToken(self, self.current_verse))
+            self._add(BibleStreamTokenType.START_VERSE_NUM)
         self.in_verse_num = True
 
     def add_end_verse_num(self):
-        self.add_token(BibleEndVerseNumToken(self, self.current_verse))
+        self._add(BibleStreamTokenType.END_VERSE_NUM)
         self.in_verse_num = False
 
     def add_start_small_caps(self):
-        self.add_token(BibleStartSmallCapsToken(self, self.current_verse))
+        self._add(BibleStreamTokenType.START_SMALL_CAPS)
         self.small_caps_level += 1
 
     def add_end_small_caps(self):
-        self.add_token(BibleEndSmallCapsToken(self, self.current_verse))
+        self._add(BibleStreamTokenType.END_SMALL_CAPS)
         self.small_caps_level -= 1
 
+    def add_verses(self, verses: Iterable[tuple[BibleVerse, str, str, 'VerseFlag']]):
+        '''Adds many verses at once. Each item of verses is a (bible_verse, verse_num_text, text, verse_flags)
+        tuple, and adding it is equivalent to:
+
+            if verse_flags & VerseFlag.START_PARA:
+                add_start_paragraph(is_poetry=bool(verse_flags & VerseFlag.POETRY))
+            current_verse = bible_verse
+            add_start_verse_num()
+            add_text(verse_num_text)
+            add_end_verse_num()
+            add_text(text)
+            if verse_flags & VerseFlag.LINE_BREAK:
+                add_line_break()
+            if verse_flags & VerseFlag.END_PARA:
+                add_end_paragraph()
+
+        verse_flags may be None. The same switches and normalisation apply, but the common case (a verse that
+        isn't the first in its chapter) is handled in a single loop that writes to the token arrays directly,
+        which is several times faster than calling the methods for each verse.
+        '''
+        type_codes = self._type_codes
+        verse_ids = self._verse_ids
+        text_starts = self._text_starts
+        text_lens = self._text_lens
+        strip_text = self.strip_text
+        insert_missing_whitespace = self.insert_missing_whitespace
+        space_str = self.space_str
+
+        # Per-chapter state
+        book = None
+        chap_num = None
+        chap_verse_id = 0           # Verse id of the chapter's verse 0
+        first_verse_num = None      # Number of the chapter's first verse, if insert_missing_chap_num, else 0
+
+        for bible_verse, verse_num_text, text, verse_flags in verses:
+            if verse_flags and verse_flags & VerseFlag.START_PARA:
+                self.add_start_paragraph(is_poetry=bool(verse_flags & VerseFlag.POETRY))
+
+            if bible_verse.book is not book or bible_verse.chap_num != chap_num:
+                book = bible_verse.book
+                chap_num = bible_verse.chap_num
+                chap_verse_id = chap_base_id(book, chap_num)
+                first_verse_num = bible_verse.first_verse().verse_num if self.insert_missing_chap_num else 0
+            verse_num = bible_verse.verse_num
+            verse_id = chap_verse_id | verse_num
+            self._current_verse = bible_verse
+            self._current_verse_id = verse_id
+
+            if self._expected_token_type is not None or verse_num <= first_verse_num:
+                # Leave any unexpected tokens and missing chapter numbers to the individual methods
+                self.add_start_verse_num()
+                self.add_text(verse_num_text)
+                self.add_end_verse_num()
+                self.add_text(text)
+            else:
+                self._insert_any_needed_space_before_number()
+                if self._verse_index_valid:
+                    self._index_appended_verse_id(verse_id, len(type_codes))
+                type_codes.append(_START_VERSE_NUM_CODE)
+                verse_ids.append(verse_id)
+                text_starts.append(0)
+                text_lens.append(0)
+
+                if strip_text:
+                    verse_num_text = verse_num_text.strip()
+                if len(verse_num_text) > 0:
+                    type_codes.append(_TEXT_CODE)
+                    verse_ids.append(verse_id)
+                    text_starts.append(self._append_text(verse_num_text))
+                    text_lens.append(len(verse_num_text))
+                    if insert_missing_whitespace:
+                        self._insert_space_before_text = not verse_num_text[-1].isspace()
+
+                type_codes.append(_END_VERSE_NUM_CODE)
+                verse_ids.append(verse_id)
+                text_starts.append(0)
+                text_lens.append(0)
+
+                if strip_text:
+                    text = text.strip()
+                if insert_missing_whitespace and self._insert_space_before_text and \
+                   len(text) > 0 and not text[0].isspace():
+                    text = space_str + text
+                if len(text) > 0:
+                    type_codes.append(_TEXT_CODE)
+                    verse_ids.append(verse_id)
+                    text_starts.append(self._append_text(text))
+                    text_lens.append(len(text))
+                    if insert_missing_whitespace:
+                        self._insert_space_before_text = not text[-1].isspace()
+
+            if verse_flags and verse_flags & VerseFlag.LINE_BREAK:
+                self.add_line_break()
+            if verse_flags and verse_flags & VerseFlag.END_PARA:
+                self.add_end_paragraph()
+
     def _insert_any_needed_space_before_number(self):
         if self.insert_missing_whitespace and self._insert_space_before_text:
             # Stripping text needs to be turned off in order to add a string that
             # is only space. So we need to save and restore the state of self.strip_text
             strip_text = self.strip_text
             self.strip_text = False
+            # For the text we're adding, use the verse metadata of the previous token.
+            current_verse_id = self._current_verse_id
+            if len(self._verse_ids) > 0:
+                self._current_verse_id = self._verse_ids[-1]
             self.add_text(self.space_str)
+            self._current_verse_id = current_verse_id
             self.strip_text = strip_text
 
-            # For the text we just added, use the verse metadata of the previous token.
-            if len(self.tokens) > 1:
-                self.tokens[-1].bible_verse = BibleVerse(self.tokens[-2].bible_verse)
+    #
+    # Access to the token arrays
+    #
+
+    def _entry_for_token(self, token) -> tuple:
+        '''Returns the (type code, verse id, text) entry for storing token in the token arrays.'''
+        if token.type is None:
+            raise ValueError(f"{type(token).__name__} has no BibleStreamTokenType, so can't be added to a stream")
+        type_code = token.type.value
+        if token.type is BibleStreamTokenType.START_PARA and token.is_poetry:
+            type_code |= _POETRY_FLAG
+        return (type_code, verse_to_id(token.bible_verse), token.text if token.has_text else "")
+
+    def _append_entry(self, type_code: int, verse_id: int, text: str = ""):
+        if self._verse_index_valid:
+            self._index_appended_verse_id(verse_id, len(self._type_codes))
+        self._type_codes.append(type_code)
+        self._verse_ids.append(verse_id)
+        self._text_starts.append(self._append_text(text))
+        self._text_lens.append(len(text))
+
+    def _insert_entry(self, index: int, type_code: int, verse_id: int, text: str = ""):
+        self._verse_index_valid = False
+        self._invalidate_plain_text()
+        self._type_codes.insert(index, type_code)
+        self._verse_ids.insert(index, verse_id)
+        self._text_starts.insert(index, self._append_text(text))
+        self._text_lens.insert(index, len(text))
+
+    def _append_text(self, text: str) -> int:
+        '''Appends text to the text buffer, and returns its offset in the buffer.'''
+        if len(text) == 0:
+            return 0
+        text_start = self._text_len
+        self._text_parts.append(text)
+        self._text_len += len(text)
+        # Join the pending parts once they are a sizable fraction of the buffer, so they never take much memory
+        # while the total copying done by joins stays proportional to the length of the text.
+        if len(self._text_parts) >= _MIN_TEXT_PARTS_TO_JOIN and \
+           (self._text_len - len(self._text_buffer)) * 4 >= len(self._text_buffer):
+            self._text_buffer += "".join(self._text_parts)
+            self._text_parts = []
+        return text_start
+
+    def _delete_entries(self, index):
+        '''Deletes the entry at index (an int or slice) from each token array.
+
+        The text of deleted entries is left in the text buffer until the stream is next constrained.'''
+        self._verse_index_valid = False
+        self._invalidate_plain_text()
+        del self._type_codes[index]
+        del self._verse_ids[index]
+        del self._text_starts[index]
+        del self._text_lens[index]
+
+    def _keep_entries(self, indices):
+        '''Keeps only the entries at indices (a range or ascending sequence of ints), and compacts the text buffer
+        to match.'''
+        if isinstance(indices, range) and indices.step == 1:
+            entry_slice = slice(indices.start, indices.stop)
+            self._type_codes = self._type_codes[entry_slice]
+            self._verse_ids = self._verse_ids[entry_slice]
+            text_starts = self._text_starts[entry_slice]
+            self._text_lens = self._text_lens[entry_slice]
+        else:
+            self._type_codes = array('B', map(self._type_codes.__getitem__, indices))
+            self._verse_ids = array('i', map(self._verse_ids.__getitem__, indices))
+            text_starts = array('q', map(self._text_starts.__getitem__, indices))
+            self._text_lens = array('i', map(self._text_lens.__getitem__, indices))
+
+        text_buffer = self.text_buffer
+        text_parts = []
+        text_len = 0
+        for entry_index, entry_text_len in enumerate(self._text_lens):
+            if entry_text_len > 0:
+                text_start = text_starts[entry_index]
+                text_parts.append(text_buffer[text_start:text_start + entry_text_len])
+                text_starts[entry_index] = text_len
+                text_len += entry_text_len
+        self._text_starts = text_starts
+        self._text_buffer = "".join(text_parts)
+        self._text_parts = []
+        self._text_len = text_len
+        self._verse_index_valid = False
+        self._invalidate_plain_text()
+
+    def _clear(self):
+        self._keep_entries(range(0))
+
+    def _copy_entries_to(self, bible_stream_handler, indices):
+        '''Copies the entries at indices (a range or sequence of ints) to bible_stream_handler.'''
+        if handles_token_batches(bible_stream_handler):
+            self._copy_entry_batches_to(bible_stream_handler, indices)
+            return
+
+        handler_methods = [getattr(bible_stream_handler, method_name) if method_name is not None else None
+                           for method_name in _HANDLER_METHOD_NAMES]
+        add_text = bible_stream_handler.add_text
+        add_start_paragraph = bible_stream_handler.add_start_paragraph
+        text_buffer = self.text_buffer
+        type_codes = self._type_codes
+        text_starts = self._text_starts
+        text_lens = self._text_lens
+        for index in indices:
+            type_code = type_codes[index]
+            if type_code == _TEXT_CODE:
+                text_start = text_starts[index]
+                add_text(text_buffer[text_start:text_start + text_lens[index]])
+            elif type_code & _TYPE_CODE_MASK == _START_PARA_CODE:
+                add_start_paragraph(bool(type_code & _POETRY_FLAG))
+            else:
+                handler_methods[type_code]()
+
+    def _copy_entry_batches_to(self, bible_stream_handler, indices):
+        text_buffer = self.text_buffer
+        type_codes = self._type_codes
+        text_starts = self._text_starts
+        text_lens = self._text_lens
+        for batch_start in range(0, len(indices), TOKEN_BATCH_SIZE):
+            token_batch = []
+            for index in indices[batch_start:batch_start + TOKEN_BATCH_SIZE]:
+                type_code = type_codes[index]
+                if type_code == _TEXT_CODE:
+                    text_start = text_starts[index]
+                    text = text_buffer[text_start:text_start + text_lens[index]]
+                    token_batch.append((BibleStreamTokenType.TEXT, text))
+                elif type_code & _TYPE_CODE_MASK == _START_PARA_CODE:
+                    token_batch.append((BibleStreamTokenType.START_PARA, bool(type_code & _POETRY_FLAG)))
+                else:
+                    token_batch.append((_TOKEN_TYPES[type_code], None))
+            bible_stream_handler.add_token_batch(token_batch)
+
+    #
+    # The plain text
+    #
+
+    def _update_plain_text(self):
+        '''Adds the text of any entries added since the last update to the plain text.'''
+        entry_count = self._plain_text_entry_count
+        if entry_count > 0 and self._type_codes[entry_count - 1] == _TEXT_CODE and \
+           self._text_lens[entry_count - 1] > self._plain_text_last_text_len:
+            # Text has since been merged into the last entry we added
+            text_start = self._text_starts[entry_count - 1]
+            merged_text = self.text_buffer[text_start + self._plain_text_last_text_len:
+                                           text_start + self._text_lens[entry_count - 1]]
+            self._plain_text_handler.add_token_batch([(BibleStreamTokenType.TEXT, merged_text)])
+        if entry_count < len(self._type_codes):
+            self._copy_entries_to(self._plain_text_handler, range(entry_count, len(self._type_codes)))
+        self._plain_text_entry_count = len(self._type_codes)
+        self._plain_text_last_text_len = self._text_lens[-1] if len(self._text_lens) > 0 else 0
+
+    def _invalidate_plain_text(self):
+        self._plain_text_handler = TextOnlyHandler()
+        self._plain_text_entry_count = 0
+        self._plain_text_last_text_len = 0
+        self._script_counts = Counter()
+        self._script_counted_len = 0
+
+    #
+    # The verse index
+    #
+
+    def _index_appended_verse_id(self, verse_id: int, index: int):
+        '''Updates the verse index for a token with verse_id appended at index.'''
+        if len(self._span_verse_ids) == 0 or self._span_verse_ids[-1] != verse_id:
+            if len(self._span_verse_ids) > 0 and verse_id < self._span_verse_ids[-1]:
+                self._verse_ids_sorted = False
+            self._span_verse_ids.append(verse_id)
+            self._span_starts.append(index)
+
+    def _set_verse_id_at(self, index: int, verse_id: int):
+        if self._verse_index_valid and self._verse_ids_sorted and index == len(self._verse_ids) - 1:
+            # Changing the last token's verse is common while adding tokens, so update the index in place.
+            if self._span_starts[-1] == index:
+                del self._span_verse_ids[-1]
+                del self._span_starts[-1]
+            self._index_appended_verse_id(verse_id, index)
+        else:
+            self._verse_index_valid = False
+        self._verse_ids[index] = verse_id
+
+    def _ensure_verse_index(self):
+        if self._verse_index_valid:
+            return
+        with self._read_lock:
+            if self._verse_index_valid:
+                return
+            self._span_verse_ids = array('i')
+            self._span_starts = array('q')
+            self._verse_ids_sorted = True
+            for index, verse_id in enumerate(self._verse_ids):
+                self._index_appended_verse_id(verse_id, index)
+            self._verse_index_valid = True
+
+    def _indices_for_range(self, bible_range: BibleRange):
+        '''Returns the indices of the tokens belonging to the verses of bible_range (or all the tokens if
+        bible_range is None). This is a range if verses were added in canonical order, otherwise an array.'''
+        if bible_range is None:
+            return range(len(self._type_codes))
+        self._ensure_verse_index()
+        start_id, end_id = range_to_ids(bible_range)
+        if self._verse_ids_sorted:
+            start_span = bisect_left(self._span_verse_ids, start_id)
+            end_span = bisect_right(self._span_verse_ids, end_id, lo=start_span)
+            start = self._span_starts[start_span] if start_span < len(self._span_starts) else len(self._type_codes)
+            stop = self._span_starts[end_span] if end_span < len(self._span_starts) else len(self._type_codes)
+            return range(start, stop)
+        else:
+            return array('q', (index for index, verse_id in enumerate(self._verse_ids)
+                               if start_id <= verse_id <= end_id))
+
+    def _token_at(self, index: int) -> 'BibleStreamToken':
+        '''Returns a BibleStreamToken view of the entry at index, which must not be negative.'''
+        token_class = _TOKEN_CLASSES[self._type_codes[index] & _TYPE_CODE_MASK]
+        token = token_class.__new__(token_class)
+        token.bible_stream = self
+        token._index = index
+        return token
+
+    def _text_at(self, index: int) -> str:
+        text_start = self._text_starts[index]
+        return self.text_buffer[text_start:text_start + self._text_lens[index]]
+
+    def _set_text_at(self, index: int, text: str):
+        self._invalidate_plain_text()
+        self._text_starts[index] = self._append_text(text)
+        self._text_lens[index] = len(text)
 
     def __str__(self):
         string = ""
@@ -256,6 +887,141 @@ class BibleStream(BibleStreamHandler):
         return string[:-1] # Remove trailing newline
 
 
+class BibleContentFormatError(MultiscriptException):
+    pass
+
+
+def _aligned(length: int) -> int:
+    '''Returns length rounded up to a multiple of the encoding's alignment.'''
+    return (length + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _padding(length: int) -> bytes:
+    '''Returns the padding needed after a section of length bytes in an encoding.'''
+    return bytes(_aligned(length) - length)
+
+
+def _check_magic_and_version(magic: bytes, version: int, expected_magic: bytes):
+    if magic != expected_magic:
+        raise BibleContentFormatError("The data is not encoded Bible content.")
+    if version > ENCODING_VERSION:
+        raise BibleContentFormatError(f"The Bible content encoding version {version} is newer than this version " +
+                                      "of Multiscript supports.")
+
+
+class BibleStreamTokens(MutableSequence):
+    '''The tokens of a BibleStream, as a mutable sequence of BibleStreamToken views onto the stream's arrays.
+
+    A view refers to its token by index, so views shouldn't be kept after tokens are inserted into or removed
+    from the stream. Tokens returned by pop() are detached copies, and may be kept.
+    '''
+    __slots__ = ('_bible_stream',)
+
+    def __init__(self, bible_stream: BibleStream):
+        self._bible_stream = bible_stream
+
+    def __len__(self):
+        return len(self._bible_stream._type_codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._bible_stream._token_at(token_index) for token_index in range(*index.indices(len(self)))]
+        return self._bible_stream._token_at(self._normalize_index(index))
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            if index.step not in (None, 1):
+                raise ValueError("Extended slice assignment is not supported for BibleStream tokens")
+            entries = [self._bible_stream._entry_for_token(token) for token in value]
+            start = index.indices(len(self))[0]
+            del self[index]
+            for entry_index, entry in enumerate(entries):
+                self._bible_stream._insert_entry(start + entry_index, *entry)
+        else:
+            index = self._normalize_index(index)
+            entry = self._bible_stream._entry_for_token(value)
+            self._bible_stream._delete_entries(index)
+            self._bible_stream._insert_entry(index, *entry)
+
+    def __delitem__(self, index):
+        if not isinstance(index, slice):
+            index = self._normalize_index(index)
+        self._bible_stream._delete_entries(index)
+
+    def __iter__(self):
+        bible_stream = self._bible_stream
+        for index in range(len(bible_stream._type_codes)):
+            yield bible_stream._token_at(index)
+
+    def insert(self, index, value):
+        self._bible_stream._insert_entry(min(max(index + len(self) if index < 0 else index, 0), len(self)),
+                                         *self._bible_stream._entry_for_token(value))
+
+    def pop(self, index=-1):
+        token = self[index]
+        token._detach()
+        del self[index]
+        return token
+
+    def clear(self):
+        self._bible_stream._clear()
+
+    def _normalize_index(self, index: int) -> int:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("BibleStream token index out of range")
+        return index
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+
+class BibleStreamView:
+    '''A read-only view of some of the tokens of a BibleStream, usually those of a BibleRange. Create views
+    with BibleStream.view(). A view doesn't copy the tokens, so many views (e.g. of overlapping passages) can
+    share one loaded stream.
+
+    Like token views, a BibleStreamView refers to its tokens by index, so it shouldn't be kept after tokens are
+    inserted into or removed from the stream. Tokens may still be added to the end of the stream.
+    '''
+    def __init__(self, bible_stream: BibleStream, indices, bible_range: BibleRange = None):
+        self.bible_stream: BibleStream = bible_stream
+        self.bible_range: BibleRange = bible_range
+        self._indices = indices     # A range, or an array of token indices in ascending order
+
+    @property
+    def tokens(self) -> list['BibleStreamToken']:
+        '''Returns the tokens in this view, as a list of BibleStreamToken views.'''
+        return [self.bible_stream._token_at(index) for index in self._indices]
+
+    def view(self, bible_range: BibleRange) -> 'BibleStreamView':
+        '''Returns a BibleStreamView of the tokens in this view that belong to the verses of bible_range.'''
+        range_indices = self.bible_stream._indices_for_range(bible_range)
+        if isinstance(self._indices, range) and isinstance(range_indices, range):
+            indices = range(max(self._indices.start, range_indices.start), min(self._indices.stop, range_indices.stop))
+        else:
+            range_index_set = set(range_indices)
+            indices = array('q', (index for index in self._indices if index in range_index_set))
+        return BibleStreamView(self.bible_stream, indices, bible_range)
+
+    def copyStreamTo(self, bible_stream_handler):
+        self.bible_stream._copy_entries_to(bible_stream_handler, self._indices)
+
+    def all_text(self):
+        '''Returns only the basic plain text in the view.'''
+        text_receiver = TextOnlyHandler()
+        self.copyStreamTo(text_receiver)
+        return text_receiver.text
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __str__(self):
+        return "\n".join(str(token) for token in self.tokens)
+
+
 class BibleStreamTokenType(Enum):
     ''' This Enum allows the type of a BibleStreamToken to be determined faster than
     calling isinstance()
@@ -272,20 +1038,58 @@ class BibleStreamTokenType(Enum):
     END_SMALL_CAPS      = auto()
 
 
+class VerseFlag(Flag):
+    '''Paragraph flags for the verses passed to BibleStream.add_verses().'''
+    NONE        = 0
+    START_PARA  = auto()    # Start a paragraph before the verse
+    POETRY      = auto()    # The paragraph started by START_PARA is poetry
+    LINE_BREAK  = auto()    # Add a line break after the verse
+    END_PARA    = auto()    # End the paragraph after the verse
+
+
 class BibleStreamToken:
+    '''A token in a BibleStream.
+
+    Tokens read from a BibleStream are lightweight views of the stream's arrays (see BibleStream.tokens).
+    Tokens can also be created standalone, in which case they hold their own data.
+    '''
+    __slots__ = ('bible_stream', '_index', '_bible_verse')
+
+    type: 'BibleStreamTokenType' = None # For testing the type of the token faster than calling isinstance()
+    is_start: bool = False              # True for tokens that represent the start of something
+    is_end: bool = False                # True for tokens that represent the end of something
+    has_text: bool = False              # True for tokens that contain text
+
     def __init__(self, bible_stream, bible_verse):
         self.bible_stream: BibleStream = bible_stream
-        self.bible_verse: BibleVerse = bible_verse
-        self.type: BibleStreamTokenType = None # For testing the type of the token faster than calling isinstance()
-        self.is_start: bool = False   # True for tokens that represent the start of something
-        self.is_end: bool = False     # True for tokens that represent the end of something
-        self.has_text: bool = False   # True for tokens that contain text
+        self._index: int = None         # Index of this token in bible_stream's arrays, or None if standalone
+        self._bible_verse: BibleVerse = bible_verse
+
+    @property
+    def bible_verse(self) -> BibleVerse:
+        if self._index is None:
+            return self._bible_verse
+        return verse_from_id(self.bible_stream._verse_ids[self._index])
+
+    @bible_verse.setter
+    def bible_verse(self, value: BibleVerse):
+        if self._index is None:
+            self._bible_verse = value
+        else:
+            self.bible_stream._set_verse_id_at(self._index, verse_to_id(value))
 
     def copyTokenTo(self, bible_stream_handler):
         '''Subclasses to override.
         '''
         pass
 
+    def _detach(self):
+        '''Copies this token's data out of its stream, making it a standalone token. Subclasses with more data
+        should extend this.'''
+        bible_verse = self.bible_verse
+        self._index = None
+        self._bible_verse = bible_verse
+
     def __str__(self):
         string = ""
         if self.bible_verse is not None:
@@ -301,110 +1105,187 @@ class BibleStreamToken:
 
 
 class BibleTextToken(BibleStreamToken):
+    __slots__ = ('_text',)
+
+    type = BibleStreamTokenType.TEXT
+    has_text = True
+
     def __init__(self, bible_stream, bible_verse, text):
         super().__init__(bible_stream, bible_verse)
-        self.type = BibleStreamTokenType.TEXT
-        self.has_text = True
-        self.text = text
+        self._text = text
+
+    @property
+    def text(self) -> str:
+        if self._index is None:
+            return self._text
+        return self.bible_stream._text_at(self._index)
+
+    @text.setter
+    def text(self, value: str):
+        if self._index is None:
+            self._text = value
+        else:
+            self.bible_stream._set_text_at(self._index, value)
 
     def copyTokenTo(self, bible_stream_handler):
         bible_stream_handler.add_text(self.text)
 
+    def _detach(self):
+        text = self.text
+        super()._detach()
+        self._text = text
+
     def __str__(self):
         return super().__str__() + self.text + "|"
 
 
 class BibleStartParagraphToken(BibleStreamToken):
+    __slots__ = ('_is_poetry',)
+
+    type = BibleStreamTokenType.START_PARA
+    is_start = True
+
     def __init__(self, bible_stream, bible_verse, is_poetry=False):
         super().__init__(bible_stream, bible_verse)
-        self.type = BibleStreamTokenType.START_PARA
-        self.is_start = True
-        self.is_poetry = is_poetry
+        self._is_poetry = is_poetry
+
+    @property
+    def is_poetry(self) -> bool:
+        if self._index is None:
+            return self._is_poetry
+        return bool(self.bible_stream._type_codes[self._index] & _POETRY_FLAG)
+
+    @is_poetry.setter
+    def is_poetry(self, value: bool):
+        if self._index is None:
+            self._is_poetry = value
+        else:
+            self.bible_stream._type_codes[self._index] = self.type.value | (_POETRY_FLAG if value else 0)
 
     def copyTokenTo(self, bible_stream_handler):
         bible_stream_handler.add_start_paragraph(self.is_poetry)
 
+    def _detach(self):
+        is_poetry = self.is_poetry
+        super()._detach()
+        self._is_poetry = is_poetry
+
     def _token_name_for_str(self):
         token_name = super()._token_name_for_str()
         token_name += " (Poetry)" if self.is_poetry else ""
-        return token_name     
+        return token_name
 
 
 class BibleEndParagraphToken(BibleStreamToken):
-    def __init__(self, bible_stream, bible_verse):
-        super().__init__(bible_stream, bible_verse)
-        self.type = BibleStreamTokenType.END_PARA
-        self.is_end = True
+    __slots__ = ()
+
+    type = BibleStreamTokenType.END_PARA
+    is_end = True
 
     def copyTokenTo(self, bible_stream_handler):
         bible_stream_handler.add_end_paragraph()
 
 
 class BibleLineBreakToken(BibleStreamToken):
-    def __init__(self, bible_stream, bible_verse):
-        super().__init__(bible_stream, bible_verse)
-        self.type = BibleStreamTokenType.LINE_BREAK
+    __slots__ = ()
+
+    type = BibleStreamTokenType.LINE_BREAK
 
     def copyTokenTo(self, bible_stream_handler):
         bible_stream_handler.add_line_break()
 
 
 class BibleStartChapNumToken(BibleStreamToken):
-    def __init__(self, bible_stream, bible_verse):
-        super().__init__(bible_stream, bible_verse)
-        self.type = BibleStreamTokenType.START_CHAP_NUM
-        self.is_start = True
+    __slots__ = ()
+
+    type = BibleStreamTokenType.START_CHAP_NUM
+    is_start = True
 
     def copyTokenTo(self, bible_stream_handler):
         bible_stream_handler.add_start_chap_num()
 
 
 class BibleEndChapNumToken(BibleStreamToken):
-    def __init__(self, bible_stream, bible_verse):
-        super().__init__(bible_stream, bible_verse)
-        self.type = BibleStreamTokenType.END_CHAP_NUM
-        self.is_end = True
+    __slots__ = ()
+
+    type = BibleStreamTokenType.END_CHAP_NUM
+    is_end = True
 
     def copyTokenTo(self, bible_stream_handler):
         bible_stream_handler.add_end_chap_num()
 
 
 class BibleStartVerseNumToken(BibleStreamToken):
-    def __init__(self, bible_stream, bible_verse):
-        super().__init__(bible_stream, bible_verse)
-        self.type = BibleStreamTokenType.START_VERSE_NUM
-        self.is_start = True
+    __slots__ = ()
+
+    type = BibleStreamTokenType.START_VERSE_NUM
+    is_start = True
 
     def copyTokenTo(self, bible_stream_handler):
         bible_stream_handler.add_start_verse_num()
 
 
 class BibleEndVerseNumToken(BibleStreamToken):
-    def __init__(self, bible_stream, bible_verse):
-        super().__init__(bible_stream, bible_verse)
-        self.type = BibleStreamTokenType.END_VERSE_NUM
-        self.is_end = True
+    __slots__ = ()
+
+    type = BibleStreamTokenType.END_VERSE_NUM
+    is_end = True
 
     def copyTokenTo(self, bible_stream_handler):
         bible_stream_handler.add_end_verse_num()
 
 
 class BibleStartSmallCapsToken(BibleStreamToken):
-    def __init__(self, bible_stream, bible_verse):
-        super().__init__(bible_stream, bible_verse)
-        self.type = BibleStreamTokenType.START_SMALL_CAPS
-        self.is_start = True
+    __slots__ = ()
+
+    type = BibleStreamTokenType.START_SMALL_CAPS
+    is_start = True
 
     def copyTokenTo(self, bible_stream_handler):
         bible_stream_handler.add_start_small_caps()
 
 
 class BibleEndSmallCapsToken(BibleStreamToken):
-    def __init__(self, bible_stream, bible_verse):
-        super().__init__(bible_stream, bible_verse)
-        self.type = BibleStreamTokenType.END_SMALL_CAPS
-        self.is_end = True
+    __slots__ = ()
+
+    type = BibleStreamTokenType.END_SMALL_CAPS
+    is_end = True
 
     def copyTokenTo(self, bible_stream_handler):
         bible_stream_handler.add_end_small_caps()
 
+
+# BibleStreamToken subclasses, indexed by BibleStreamTokenType value
+_TOKEN_CLASSES = [None] * (len(BibleStreamTokenType) + 1)
+for _token_class in (BibleTextToken, BibleStartParagraphToken, BibleEndParagraphToken, BibleLineBreakToken,
+                     BibleStartChapNumToken, BibleEndChapNumToken, BibleStartVerseNumToken, BibleEndVerseNumToken,
+                     BibleStartSmallCapsToken, BibleEndSmallCapsToken):
+    _TOKEN_CLASSES[_token_class.type.value] = _token_class
+del _token_class
+
+# Names of the BibleStreamHandler methods for tokens without arguments, indexed by BibleStreamTokenType value
+_HANDLER_METHOD_NAMES = [None] * (len(BibleStreamTokenType) + 1)
+_HANDLER_METHOD_NAMES[BibleStreamTokenType.END_PARA.value]          = "add_end_paragraph"
+_HANDLER_METHOD_NAMES[BibleStreamTokenType.LINE_BREAK.value]        = "add_line_break"
+_HANDLER_METHOD_NAMES[BibleStreamTokenType.START_CHAP_NUM.value]    = "add_start_chap_num"
+_HANDLER_METHOD_NAMES[BibleStreamTokenType.END_CHAP_NUM.value]      = "add_end_chap_num"
+_HANDLER_METHOD_NAMES[BibleStreamTokenType.START_VERSE_NUM.value]   = "add_start_verse_num"
+_HANDLER_METHOD_NAMES[BibleStreamTokenType.END_VERSE_NUM.value]     = "add_end_verse_num"
+_HANDLER_METHOD_NAMES[BibleStreamTokenType.START_SMALL_CAPS.value]  = "add_start_small_caps"
+_HANDLER_METHOD_NAMES[BibleStreamTokenType.END_SMALL_CAPS.value]    = "add_end_small_caps"
+
+# BibleStreamTokenTypes, indexed by value
+_TOKEN_TYPES = [None] * (len(BibleStreamTokenType) + 1)
+for _token_type in BibleStreamTokenType:
+    _TOKEN_TYPES[_token_type.value] = _token_type
+del _token_type
+
+_TEXT_CODE              = BibleStreamTokenType.TEXT.value
+_START_PARA_CODE        = BibleStreamTokenType.START_PARA.value
+_START_VERSE_NUM_CODE   = BibleStreamTokenType.START_VERSE_NUM.value
+_END_VERSE_NUM_CODE     = BibleStreamTokenType.END_VERSE_NUM.value
+
+
+@functools.cache
+def _char_script(char: str) -> str:
+    return unicodedataplus.script(char)
@@ -0,0 +1,74 @@
+'''Compact integer ids for Bible verses.
+
+A verse id packs a verse's book, chapter and verse number into a single int, as
+(book order << 16) | (chapter << 8) | verse. Verse ids sort in canonical order, so the verses of a BibleRange
+are exactly the ids from its start verse's id to its end verse's id, and range checks are integer comparisons.
+
+BibleVerse objects are only created from ids when needed, and are interned, so each verse is only ever created
+once. Interned BibleVerses are shared, so they must not be modified.
+'''
+import threading
+
+from bibleref.ref import BibleBook, BibleFlag, BibleRange, BibleVerse
+
+
+NO_VERSE_ID = -1                # The verse id used for no verse (None)
+
+_ALL_BOOKS = list(BibleBook)    # Indexed by BibleBook.order
+
+_interned_verses: dict[int, BibleVerse] = {}
+_interned_verses_lock = threading.Lock()
+
+
+def verse_id(book: BibleBook, chap_num: int, verse_num: int) -> int:
+    '''Returns the verse id of a verse, given its book, chapter number and verse number.'''
+    return (book.order << 16) | (chap_num << 8) | verse_num
+
+
+def verse_to_id(bible_verse: BibleVerse) -> int:
+    '''Returns the verse id of bible_verse, or NO_VERSE_ID if bible_verse is None.'''
+    if bible_verse is None:
+        return NO_VERSE_ID
+    return (bible_verse.book.order << 16) | (bible_verse.chap_num << 8) | bible_verse.verse_num
+
+
+def verse_from_id(id: int) -> BibleVerse:
+    '''Returns the interned BibleVerse for a verse id, or None if id is NO_VERSE_ID.'''
+    bible_verse = _interned_verses.get(id)
+    if bible_verse is None:
+        if id < 0:
+            return None
+        with _interned_verses_lock:
+            bible_verse = _interned_verses.setdefault(id, BibleVerse(_ALL_BOOKS[id >> 16], (id >> 8) & 0xFF,
+                                                                     id & 0xFF))
+    return bible_verse
+
+
+def intern_verse(bible_verse: BibleVerse) -> BibleVerse:
+    '''Returns the interned BibleVerse equal to bible_verse.'''
+    return verse_from_id(verse_to_id(bible_verse))
+
+
+def range_to_ids(bible_range: BibleRange) -> tuple[int, int]:
+    '''Returns the verse ids of the start and end verses of bible_range.'''
+    return (verse_to_id(bible_range.start), verse_to_id(bible_range.end))
+
+
+def range_from_ids(start_id: int, end_id: int) -> BibleRange:
+    '''Returns the BibleRange from the verse with id start_id to the verse with id end_id.'''
+    # The range keeps its start and end verses, so they mustn't be the shared interned verses
+    start = BibleVerse(verse_from_id(start_id))
+    end = BibleVerse(verse_from_id(end_id))
+    flags = BibleFlag.MULTIBOOK if start.book is not end.book else None
+    return BibleRange(start=start, end=end, flags=flags)
+
+
+def book_to_ids(book: BibleBook) -> tuple[int, int]:
+    '''Returns the lowest and highest verse ids that verses in book can have.'''
+    return (verse_id(book, 0, 0), verse_id(book, 0xFF, 0xFF))
+
+
+def chap_base_id(book: BibleBook, chap_num: int) -> int:
+    '''Returns the verse id of verse 0 of a chapter. The id of each verse in the chapter is this id plus its
+    verse number.'''
+    return (book.order << 16) | (chap_num << 8)
@@ -1,4 +1,5 @@
 
+import asyncio
 from pprint import pformat
 
 import multiscript
@@ -80,8 +81,57 @@ class BibleVersion:
     def abbrev(self, value: str):
         self.user_labels.abbrev = value if value is not None else ""
 
+    @property
+    def content_settings(self) -> tuple:
+        '''Returns a hashable summary of any settings that change the content this version loads (e.g. how its
+        text is normalised). Loaded content is only reused by later plan runs if these settings are the same.
+
+        Subclasses with such settings should override. The default implementation returns an empty tuple.
+        '''
+        return ()
+
     def load_content(self, bible_range, bible_content, plan_runner=None):
-        pass        
+        '''Subclasses should override to load the content of bible_range for this version into
+        bible_content.
+
+        During a plan run, this method is called on a worker thread, and may be called concurrently for
+        different ranges and versions from the same BibleSource, up to the source's max_concurrent_loads.
+        '''
+        pass
+
+    def load_contents(self, bible_ranges, bible_contents, plan_runner=None):
+        '''Loads the content of every range in bible_ranges for this version into the BibleContent at the
+        same index in bible_contents.
+
+        Subclasses may optionally override this method to load all of a plan's ranges at once, which lets
+        them plan their fetching across the whole plan (e.g. merging adjacent ranges, or fetching a whole
+        book in one request). If a subclass overrides this method, the plan runner calls it once per plan
+        run instead of calling load_content() for each range. The default implementation just calls
+        load_content() for each range.
+        '''
+        for bible_range, bible_content in zip(bible_ranges, bible_contents):
+            self.load_content(bible_range, bible_content, plan_runner)
+
+    @property
+    def has_batch_load(self) -> bool:
+        '''Returns True if this version's class overrides load_contents().'''
+        return type(self).load_contents is not BibleVersion.load_contents
+
+    async def load_content_async(self, bible_range, bible_content, plan_runner=None):
+        '''Coroutine alternative to load_content(), for sources that load content with asyncio (e.g. using an
+        asyncio HTTP client), and so can keep many requests in flight without a thread for each.
+
+        Subclasses may optionally override this method. If a subclass overrides it (and not load_contents()),
+        the plan runner awaits it for each range on a private asyncio event loop instead of calling
+        load_content(), with up to the source's max_concurrent_loads in progress at once. The default
+        implementation just calls load_content() on a separate thread.
+        '''
+        await asyncio.to_thread(self.load_content, bible_range, bible_content, plan_runner)
+
+    @property
+    def has_async_load(self) -> bool:
+        '''Returns True if this version's class overrides load_content_async().'''
+        return type(self).load_content_async is not BibleVersion.load_content_async
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.id})" + "\n" + \
@@ -0,0 +1,324 @@
+'''Command-line interface for running plans headlessly, without Qt (e.g. on servers with no display):
+
+    python -m multiscript run PLAN [--output DIR]
+    python -m multiscript batch PLANS... [--workers N] [--output DIR] [--report FILE]
+
+Nothing in this module imports PySide6. Plans are run by a MultiscriptBaseApplication, which shares the
+user's app config, plugins and templates with the GUI app, but creates no windows.
+'''
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import glob
+import json
+import logging
+import os
+from pathlib import Path
+import re
+import sys
+import threading
+import time
+
+import multiscript
+from multiscript.plan.monitor import PlanMonitor
+
+
+_logger = logging.getLogger(__name__)
+
+PROGRESS_REPORT_INTERVAL = 10   # Percentage points between progress reports on the console
+DEFAULT_BATCH_WORKERS = min(4, os.cpu_count() or 1)     # Default number of a batch's plans run concurrently
+
+
+class ConsolePlanMonitor(PlanMonitor):
+    '''PlanMonitor that reports a plan run's progress on the console, with each line starting with prefix.
+
+    There's no one to ask for confirmations, so their messages are just reported, and the run continues.
+    '''
+    def __init__(self, stream=None, prefix: str = ""):
+        self.stream = stream if stream is not None else sys.stderr
+        self.prefix = prefix
+        self.confirmation_messages: list[str] = []  # Messages of the confirmations requested during the run
+        self._last_reported_percent = None
+        self._lock = threading.Lock()
+
+    def set_progress_percent(self, progress):
+        percent = int(progress)
+        with self._lock:
+            last_percent = self._last_reported_percent
+            if last_percent is not None and percent < last_percent + PROGRESS_REPORT_INTERVAL and \
+               not (percent == 100 and last_percent < 100):
+                return
+            self._last_reported_percent = percent
+            self._print(f"Progress: {percent}%")
+
+    def set_status_text(self, text):
+        with self._lock:
+            self._print(_plain_text(text))
+
+    def request_confirmation(self, message=None, path=None):
+        if message is None:
+            return
+        message = _plain_text(message)
+        if path is not None:
+            message += f" ({path})"
+        with self._lock:
+            self.confirmation_messages.append(message)
+            self._print(f"Note: {message}")
+
+    def _print(self, text):
+        print(self.prefix + text, file=self.stream, flush=True)
+
+
+def _plain_text(rich_text: str) -> str:
+    '''Returns the rich text used in monitor messages as plain text.'''
+    return re.sub(r"<[^>]*>", "", re.sub(r"<br\s*/?>", " ", rich_text)).strip()
+
+
+@dataclass
+class BatchPlanResult:
+    '''The result of running one of the plans in a batch.'''
+    plan_path: Path
+    succeeded: bool = False
+    seconds: float = 0.0            # Time taken to load and run the plan
+    error: str = ""                 # Why the plan failed, if it did
+    errors: list[str] = field(default_factory=list)    # Errors reported by the plan run (see PlanRunner.errors)
+    notes: list[str] = field(default_factory=list)     # Confirmation messages reported during the run
+
+    def to_dict(self) -> dict:
+        return {"plan": str(self.plan_path), "succeeded": self.succeeded, "seconds": round(self.seconds, 3),
+                "error": self.error, "errors": self.errors, "notes": self.notes}
+
+
+def new_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m multiscript",
+                                     description="Run Multiscript plans without the graphical interface.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run a plan, creating its output files.")
+    run_parser.add_argument("plan", type=Path, help="Path of the plan file (.mplan) to run.")
+    run_parser.add_argument("--output", "-o", type=Path, default=None, metavar="DIR",
+                            help="Directory for the output files, instead of the plan's output directory.")
+
+    batch_parser = subparsers.add_parser("batch", help="Run many plans, sharing loaded Bible content, parsed " +
+                                                       "templates and fonts between them.")
+    batch_parser.add_argument("plans", nargs="+", metavar="PLANS",
+                              help="Plan files, directories to search for plan files, or glob patterns of plan " +
+                                   "files (e.g. 'plans/**/*.mplan').")
+    batch_parser.add_argument("--workers", "-w", type=_positive_int, default=DEFAULT_BATCH_WORKERS, metavar="N",
+                              help=f"Number of plans to run at once (default {DEFAULT_BATCH_WORKERS}).")
+    batch_parser.add_argument("--output", "-o", type=Path, default=None, metavar="DIR",
+                              help="Directory in which each plan's output is put in a subdirectory named after " +
+                                   "the plan, instead of the plans' output directories.")
+    batch_parser.add_argument("--report", "-r", type=Path, default=None, metavar="FILE",
+                              help="Path of a JSON file to write the batch's summary report to.")
+    return parser
+
+
+def _positive_int(value: str) -> int:
+    int_value = int(value)
+    if int_value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return int_value
+
+
+def main(argv=None) -> int:
+    '''Runs the command in argv (which defaults to sys.argv[1:]), and returns the exit status.'''
+    args = new_arg_parser().parse_args(argv)
+    if args.command == "run":
+        return run_plan(args.plan, args.output)
+    elif args.command == "batch":
+        plan_paths = find_plan_paths(args.plans)
+        if len(plan_paths) == 0:
+            _logger.error("No plan files found.")
+            return 1
+        start_time = time.perf_counter()
+        results = run_batch(plan_paths, args.workers, args.output)
+        total_seconds = time.perf_counter() - start_time
+        print_batch_report(results, total_seconds)
+        if args.report is not None:
+            save_batch_report(results, total_seconds, args.report)
+        return 0 if all(result.succeeded for result in results) else 1
+    return 2
+
+
+def run_plan(plan_path: Path, output_dir_path: Path = None, monitor: PlanMonitor = None) -> int:
+    '''Loads and runs the plan at plan_path, and returns the exit status. output_dir_path (if not None) replaces
+    the plan's output directory.
+    '''
+    _set_up_app()
+    result = BatchPlanResult(plan_path.resolve())
+    plan = _load_plan(result, output_dir_path)
+    if plan is not None:
+        _run_loaded_plan(plan, result, monitor if monitor is not None else ConsolePlanMonitor())
+    if not result.succeeded:
+        _logger.error(result.error)
+        return 1
+    _logger.info(f'Created the output of "{plan_path.name}" in "{plan.output_dir_abspath}".')
+    return 0
+
+
+def find_plan_paths(plan_specs: list[str]) -> list[Path]:
+    '''Returns the resolved paths of the plan files in plan_specs, each of which may be a plan file, a directory
+    to search (including subdirectories) for plan files, or a glob pattern of plan files. Each plan is only
+    included once.
+    '''
+    from multiscript.plan import PLAN_FILE_EXTENSION
+
+    plan_paths: dict[Path, bool] = {}   # Used as an ordered set
+    for plan_spec in plan_specs:
+        spec_path = Path(plan_spec)
+        if spec_path.is_dir():
+            spec_plan_paths = sorted(spec_path.rglob("*" + PLAN_FILE_EXTENSION))
+        elif spec_path.is_file():
+            spec_plan_paths = [spec_path]
+        else:
+            spec_plan_paths = sorted(Path(path_str) for path_str in glob.glob(plan_spec, recursive=True)
+                                     if path_str.endswith(PLAN_FILE_EXTENSION))
+            if len(spec_plan_paths) == 0:
+                _logger.warning(f'No plan files found for "{plan_spec}".')
+        for plan_path in spec_plan_paths:
+            plan_paths[plan_path.resolve()] = True
+    return list(plan_paths.keys())
+
+
+def run_batch(plan_paths: list[Path], workers: int = DEFAULT_BATCH_WORKERS,
+              output_dir_path: Path = None) -> list[BatchPlanResult]:
+    '''Runs the plans at plan_paths, up to workers at once, and returns their results in the same order.
+
+    All the plans are run in this process, so they share the app's caches of Bible content, parsed templates and
+    fonts. If output_dir_path is not None, each plan's output is put in a subdirectory of it named after the
+    plan. Plans with the same output directory are run one after the other, so that they don't write to it at
+    the same time.
+    '''
+    _set_up_app()
+    results = [BatchPlanResult(plan_path) for plan_path in plan_paths]
+
+    # Group the plans by output directory
+    plan_groups: dict[Path, list[tuple['Plan', BatchPlanResult]]] = {}
+    output_dir_names: set[str] = set()
+    for result in results:
+        load_start_time = time.perf_counter()
+        plan_output_dir_path = None
+        if output_dir_path is not None:
+            plan_output_dir_path = output_dir_path / _unique_name(result.plan_path.stem, output_dir_names)
+        plan = _load_plan(result, plan_output_dir_path)
+        result.seconds = time.perf_counter() - load_start_time
+        if plan is not None:
+            plan_groups.setdefault(plan.output_dir_abspath, []).append((plan, result))
+
+    _logger.info(f"Running {len(results)} plans, up to {workers} at once.")
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Plan") as executor:
+        futures = [executor.submit(_run_plan_group, plan_group) for plan_group in plan_groups.values()]
+        for future in futures:
+            future.result()
+    return results
+
+
+def _unique_name(name: str, used_names: set[str]) -> str:
+    '''Returns name, or name with a number appended if it's already in used_names, and adds it to used_names.'''
+    unique_name = name
+    number = 2
+    while unique_name.casefold() in used_names:
+        unique_name = f"{name} ({number})"
+        number += 1
+    used_names.add(unique_name.casefold())
+    return unique_name
+
+
+def _run_plan_group(plan_group: list[tuple['Plan', BatchPlanResult]]):
+    for plan, result in plan_group:
+        monitor = ConsolePlanMonitor(prefix=f"[{result.plan_path.stem}] ")
+        _run_loaded_plan(plan, result, monitor)
+
+
+def _set_up_app():
+    '''Sets a MultiscriptBaseApplication (with its plugins loaded) as the app, unless an app is already set.'''
+    # Imported here, so that parsing the command line (e.g. for --help) stays quick
+    from multiscript.base_application import MultiscriptBaseApplication
+
+    logging.getLogger("multiscript").setLevel(logging.INFO)
+    if not multiscript.app_is_set():
+        app = MultiscriptBaseApplication()
+        multiscript.set_app(app)
+        app.load_plugins()
+
+
+def _load_plan(result: BatchPlanResult, output_dir_path: Path = None) -> 'Plan':
+    '''Returns the plan at result.plan_path, with its output directory replaced by output_dir_path (if not None).
+    If the plan can't be loaded, returns None and records the error in result.
+    '''
+    import multiscript.plan
+
+    if not result.plan_path.is_file():
+        result.error = f'Plan file "{result.plan_path}" not found.'
+        return None
+    error_list = []
+    plan = multiscript.plan.load(result.plan_path, error_list)
+    if plan is None:
+        result.error = f'Plan file "{result.plan_path}" could not be loaded.'
+        return None
+    for error in error_list:
+        _logger.warning(f'The plan "{result.plan_path.name}" was loaded with this error: {error}')
+    if output_dir_path is not None:
+        plan.output_dir_path = output_dir_path.resolve()
+    return plan
+
+
+def _run_loaded_plan(plan: 'Plan', result: BatchPlanResult, monitor: PlanMonitor):
+    '''Runs plan, and records whether it succeeded, and the time it took, in result. The plan fails if it
+    can't be run, or if its run reports any errors.
+    '''
+    from multiscript.plan.runner import PlanRunner
+
+    start_time = time.perf_counter()
+    try:
+        runner = PlanRunner(plan, monitor)
+        runner.run()
+        result.errors = [_plain_text(error) for error in runner.errors]
+        if len(result.errors) == 0:
+            result.succeeded = True
+        else:
+            result.error = f'The plan "{result.plan_path.name}" ran with {len(result.errors)} error(s): ' + \
+                           " ".join(result.errors)
+    except Exception as exception:
+        _logger.exception(exception)
+        result.error = f'The plan "{result.plan_path.name}" could not be run: {exception!r}'
+    result.seconds += time.perf_counter() - start_time
+    if isinstance(monitor, ConsolePlanMonitor):
+        result.notes = monitor.confirmation_messages
+
+
+def batch_cache_stats() -> dict:
+    '''Returns the hits and misses of the app's caches that the plans of a batch share.'''
+    app = multiscript.app()
+    return {name: {"hits": cache.hit_count, "misses": cache.miss_count}
+            for name, cache in (("bible_content", app.bible_content_cache),
+                                ("templates", app.template_document_cache),
+                                ("fonts", app.font_cache))}
+
+
+def print_batch_report(results: list[BatchPlanResult], total_seconds: float, stream=None):
+    '''Prints a summary of the results of a batch, with the time taken by each plan and any failures.'''
+    stream = stream if stream is not None else sys.stdout
+    failed_count = sum(1 for result in results if not result.succeeded)
+    print(f"Ran {len(results)} plans in {total_seconds:.2f}s: {len(results) - failed_count} succeeded, " +
+          f"{failed_count} failed.", file=stream)
+    for result in results:
+        status = "OK" if result.succeeded else "FAILED"
+        line = f"  {status:<6} {result.seconds:8.2f}s  {result.plan_path}"
+        if len(result.notes) > 0:
+            line += f" ({len(result.notes)} notes)"
+        print(line, file=stream)
+        if not result.succeeded:
+            print(f"{'':18}{result.error}", file=stream)
+    for name, stats in batch_cache_stats().items():
+        print(f"Cache of {name.replace('_', ' ')}: {stats['hits']} hits, {stats['misses']} misses", file=stream)
+
+
+def save_batch_report(results: list[BatchPlanResult], total_seconds: float, report_path: Path):
+    '''Saves a summary of the results of a batch to a JSON file at report_path.'''
+    report = {"total_seconds": round(total_seconds, 3),
+              "plans": [result.to_dict() for result in results],
+              "caches": batch_cache_stats()}
+    with open(report_path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=4, ensure_ascii=False)
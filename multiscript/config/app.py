@@ -1,8 +1,6 @@
 
 import multiscript
 from multiscript.config.base import Config
-from multiscript.ui.app_config_general_panel import GeneralAppConfigPanel
-from multiscript.ui.app_config_plugins_panel import PluginsAppConfigPanel
 from multiscript.util import serialize
 
 
@@ -63,6 +61,7 @@ class GeneralAppConfig(AppConfig):
         self.download_and_install_fonts = True
 
     def new_config_widget(self):
+        from multiscript.ui.app_config_general_panel import GeneralAppConfigPanel
         return GeneralAppConfigPanel(None)
 
 
@@ -73,6 +72,7 @@ class PluginsAppConfig(AppConfig):
         self.altPluginsPath = None
 
     def new_config_widget(self):
+        from multiscript.ui.app_config_plugins_panel import PluginsAppConfigPanel
         return PluginsAppConfigPanel(None)
 
 
@@ -13,7 +13,8 @@ class Config:
         instance). This method returns None if this Config doesn't use an
         accompanying widget.
 
-        ConfigWidgets use a load/store mechanism.
+        ConfigWidgets use a load/store mechanism. Subclasses should import their widget class within this
+        method, so that configs can be used without importing Qt.
         '''
         return None
 
@@ -1,7 +1,6 @@
 
 import multiscript
 from multiscript.config.base import Config
-from multiscript.ui.plan_config_general_panel import GeneralPlanConfigPanel
 
 
 class PlanConfigGroup(Config):
@@ -38,8 +37,10 @@ class GeneralPlanConfig(PlanConfig):
         self.confirm_after_template_expansion = False
         self.create_template_copies = True
         self.always_overwrite_output = False
+        self.pipelined_run = False
 
     def new_config_widget(self):
+        from multiscript.ui.plan_config_general_panel import GeneralPlanConfigPanel
         return GeneralPlanConfigPanel(None)
 
 
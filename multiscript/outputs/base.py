@@ -50,13 +50,16 @@ class BibleOutput:
         through runner.all_version_combos and calls generate_combo_item() for
         each combination. Finally it calls cleanup().
 
-        Subclasses can override this method for more complex algorithms.
+        Subclasses can override this method for more complex algorithms. Overrides
+        must call runner.prepare_versions() before creating the output for each
+        combination.
         '''
         from multiscript.plan.runner import CancelError
 
         self.setup(runner)
         for version_combo in runner.all_version_combos:
             try:
+                runner.prepare_versions(version_combo.versions)
                 template_obj = self.get_template_obj(runner, version_combo)
                 self.generate_combo_item(runner, version_combo, template_obj)
             except CancelError:
@@ -64,8 +67,8 @@ class BibleOutput:
                 raise
             except Exception as exception:
                 _logger.exception(exception)
-                runner.monitors.request_confirmation(f"<b>There was an error creating an output " +
-                                                     f"for these versions:<br>{version_combo}.</b>")
+                runner.report_error(f"<b>There was an error creating an output " +
+                                    f"for these versions:<br>{version_combo}.</b>")
             runner.increment_progress_step_count()
         self.cleanup(runner)
 
@@ -1,13 +1,15 @@
 
 from dataclasses import dataclass
+import hashlib
 import logging
 from pathlib import Path
 import shutil
 
+import multiscript
 from multiscript.outputs.base import BibleOutput
 from multiscript.plan.runner import PlanRunner
 from multiscript.plan.symbols import column_symbols
-from multiscript.util import compare
+from multiscript.util import compare, serialize
 
 
 _logger = logging.getLogger(__name__)
@@ -35,7 +37,7 @@ class FileSetOutput(BibleOutput):
         '''Overriden from BibleOutput.setup(). Called prior to looping through the version
         combos.
 
-        We use this method to set up the cache of file metadata for the run.
+        We use this method to set up the caches of file metadata and fingerprints for the run.
         '''
         super().setup(runner)
         empty_file_metadata: dict[str, 'FileMetaData'] = {}
@@ -45,6 +47,10 @@ class FileSetOutput(BibleOutput):
         except AttributeError:
             # If not, create a blank cache.
             runner.run_record.fileset_metadata = empty_file_metadata
+        if not hasattr(runner.run_record, 'fileset_fingerprints'):
+            # Fingerprints of the inputs each file was last created from, by the file's path
+            runner.run_record.fileset_fingerprints = {}
+        runner.output_runs[self.long_id].version_fingerprints = {}  # Fingerprint of each version, once calculated
 
     def cache_file_metadata(self, runner, path):
         '''Get the on-disk metatdata for the given path, and store it in the cache'''
@@ -68,6 +74,9 @@ class FileSetOutput(BibleOutput):
         for str_path in list(runner.run_record.fileset_metadata.keys()):
             if not Path(str_path).exists():
                 del runner.run_record.fileset_metadata[str_path]
+        for str_path in list(runner.run_record.fileset_fingerprints.keys()):
+            if str_path not in runner.run_record.fileset_metadata:
+                del runner.run_record.fileset_fingerprints[str_path]
 
     def generate_combo_item(self, runner, version_combo, template_obj=None, is_template=False):
         '''Overrides BibleOutput.generate_combo_item(). The item returned is the path
@@ -80,6 +89,17 @@ class FileSetOutput(BibleOutput):
         '''
         filepath = self.get_item_filepath(runner, version_combo, is_template)
 
+        # If the file hasn't been edited, and was created from the same inputs, there's no need to create it again.
+        # (We always expand the base template again if the user wants to check it.)
+        fingerprint = self.get_item_fingerprint(runner, version_combo, template_obj, is_template)
+        confirm_expansion = template_obj == runner.base_template_path and \
+                            runner.plan.config.general.confirm_after_template_expansion
+        if filepath.exists() and not runner.plan.config.general.always_overwrite_output and \
+           not confirm_expansion and runner.run_record.fileset_fingerprints.get(str(filepath)) == fingerprint and \
+           self.get_cached_file_metadata(runner, filepath) == FileMetaData(filepath):
+            self.log_file_unchanged(runner, filepath, is_template)
+            return filepath
+
         # We normally save to the expected filepath, unless we need to check if the output has really changed,
         # in which case we will save to a temporary directory.
         savepath = filepath
@@ -130,6 +150,7 @@ class FileSetOutput(BibleOutput):
             if compare.cmp_file(savepath, filepath, expand_zip=True):
                 # New file is identical to the existing file, so no need to update the existing file.
                 self.log_file_unchanged(runner, filepath, is_template)
+                runner.run_record.fileset_fingerprints[str(filepath)] = fingerprint
                 return filepath
             else:
                 # Replace existing file with new file.
@@ -142,6 +163,7 @@ class FileSetOutput(BibleOutput):
             pass
         else:
             self.cache_file_metadata(runner, filepath)
+            runner.run_record.fileset_fingerprints[str(filepath)] = fingerprint
 
         if is_template:
             runner.monitors.request_confirmation(
@@ -198,6 +220,45 @@ class FileSetOutput(BibleOutput):
         runner.monitors.set_substatus_text(log_message.strip())
         _logger.info(log_message)
 
+    def get_item_fingerprint(self, runner, version_combo, template_obj, is_template) -> str:
+        '''Returns a fingerprint of the inputs used to create the item for version_combo: the template, the
+        plan's config and the sizes of its version columns, and the labels, config and content of
+        version_combo's versions. If a file's fingerprint is unchanged since it was created, and the file hasn't
+        been edited since, it isn't created again.
+
+        Only the settings that are saved with the plan are included, so fingerprints are the same in every
+        process. The other versions of the plan aren't included, as the tags only use the versions of the
+        item's own combo (e.g. ALL_VERS_USER_LANG lists the languages of the combo's versions). Subclasses that
+        create items using any other inputs should override to add them to the fingerprint.
+        '''
+        hash = hashlib.sha256()
+        hash.update(repr((str(multiscript.get_app_version()), self.long_id, is_template, str(version_combo),
+                          str(runner.bible_ranges), [len(version_col) for version_col in runner.version_cols],
+                          serialize.dumps(runner.plan.config.general),
+                          serialize.dumps(runner.plan.config.outputs.get(self.long_id)))).encode('utf-8'))
+        if isinstance(template_obj, Path) and template_obj.exists():
+            hash.update(template_obj.read_bytes())
+        else:
+            hash.update(repr(template_obj).encode('utf-8'))
+        for version in version_combo.versions:
+            hash.update(self.get_version_fingerprint(runner, version))
+        return hash.hexdigest()
+
+    def get_version_fingerprint(self, runner, version) -> bytes:
+        '''Returns a fingerprint of version's labels, config and the Bible content loaded for it. The
+        fingerprints are calculated once per run.'''
+        version_fingerprints = runner.output_runs[self.long_id].version_fingerprints
+        if id(version) not in version_fingerprints:
+            hash = hashlib.sha256(repr((version.id, serialize.dumps(version.user_labels),
+                                        serialize.dumps(version.native_labels), version.copyright,
+                                        version.font_family, version.is_rtl,
+                                        serialize.dumps(version.output_config.get(self.long_id)))).encode('utf-8'))
+            for bible_content in runner.bible_contents.get(version, []):
+                hash.update(str(bible_content.bible_range).encode('utf-8'))
+                hash.update(bible_content.body.digest())
+            version_fingerprints[id(version)] = hash.digest()
+        return version_fingerprints[id(version)]
+
     def get_item_filepath(self, runner, version_combo, is_template):
         return runner.output_dir_path / Path(self.get_item_filename(runner, version_combo, is_template))
 
@@ -233,6 +294,37 @@ class FileSetOutput(BibleOutput):
         '''
         return object()
     
+    def read_template(self, runner, template_path):
+        '''Returns a new document of the template at template_path, as parsed by parse_document(). Subclasses can
+        call this method from load_document(). If this output can copy its documents (see copy_document()), the
+        parsed template is kept in the runner's template document cache, so it's only parsed once.
+        '''
+        document_cache = runner.template_document_cache
+        if document_cache is not None:
+            document = document_cache.get(self, template_path)
+            if document is not None:
+                return document
+        document = self.parse_document(template_path)
+        if document_cache is not None:
+            document_copy = self.copy_document(document)
+            if document_copy is not None:
+                document_cache.put(self, template_path, document)
+                document = document_copy
+        return document
+
+    def parse_document(self, template_path):
+        '''Subclasses using read_template() must override this method to return the document parsed from the
+        template at template_path, without any changes.
+        '''
+        return object()
+
+    def copy_document(self, document):
+        '''Subclasses can override this method to return a copy of document that can be modified without
+        affecting the original, so that parsed templates can be cached (see read_template()). The default
+        implementation returns None, as the document object is opaque to FileSetOutput.
+        '''
+        return None
+
     def save_document(self, runner, version_combo, document, filepath):
         '''Subclasses must override this method to save the document as a new file.
         The document object itself is opaque to FileSetOuput.
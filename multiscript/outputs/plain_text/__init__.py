@@ -4,7 +4,6 @@ import logging
 
 from multiscript.outputs.base import OutputVersionConfig, OutputPlanConfig, OutputPlanRun, OutputBibleStreamHandler
 from multiscript.outputs.tagged import TaggedOutput, TaggedDocCursor, Tags
-from multiscript.outputs.plain_text.plain_text_plan_config_panel import PlainTextPlanConfigPanel
 from multiscript.plan.symbols import column_symbols
 
 
@@ -56,9 +55,15 @@ class PlainTextOutput(TaggedOutput):
     #
 
     def load_document(self, runner, version_combo, template_path):
+        return self.read_template(runner, template_path)
+
+    def parse_document(self, template_path):
         with open(template_path, 'r', encoding='utf-8') as file:
             document = PlainTextDocument(file.read())
         return document
+
+    def copy_document(self, document):
+        return PlainTextDocument(str(document))
     
     def save_document(self, runner, version_combo, document, filepath):
         with open(filepath, 'w', encoding='utf-8') as file:
@@ -269,6 +274,35 @@ class PlainTextBibleStreamHandler(OutputBibleStreamHandler):
     def add_end_small_caps(self):
         self._capitalize = False
 
+    def add_token_batch(self, token_batch):
+        # Every token adds at most some text, so we collect all the batch's text and insert it into the document
+        # at once, rather than rebuilding the document string for every token.
+        batch_cursor = PlainTextBatchCursor(self.cursor)
+        self.cursor = batch_cursor
+        try:
+            super().add_token_batch(token_batch)
+        finally:
+            self.cursor = batch_cursor.cursor
+            batch_cursor.flush()
+
+
+class PlainTextBatchCursor(PlainTextDocCursor):
+    '''A PlainTextDocCursor that collects the text added to it, and inserts it at another cursor on flush().
+    '''
+    def __init__(self, cursor):
+        super().__init__(cursor.document, cursor.current_index)
+        self.cursor = cursor
+        self.para_is_rtl = cursor.para_is_rtl
+        self._text_parts = []
+
+    def add_text(self, text):
+        if text is not None:
+            self._text_parts.append(text)
+
+    def flush(self):
+        self.cursor.add_text("".join(self._text_parts))
+        self._text_parts = []
+
 
 class PlainTextPlanConfig(OutputPlanConfig):
     def __init__(self, bible_output):
@@ -282,6 +316,7 @@ class PlainTextPlanConfig(OutputPlanConfig):
         self.use_poetry_tabs = True             # True if poetry should be indented with a tab
 
     def new_config_widget(self):
+        from multiscript.outputs.plain_text.plain_text_plan_config_panel import PlainTextPlanConfigPanel
         return PlainTextPlanConfigPanel(None)
 
 
@@ -0,0 +1,62 @@
+from collections import OrderedDict
+from pathlib import Path
+import threading
+
+
+DEFAULT_MAX_ENTRIES = 64    # Default number of documents kept by the app's TemplateDocumentCache
+
+
+class TemplateDocumentCache:
+    '''An in-memory LRU cache of parsed template documents, so that a template used by many output items, or by
+    many plans in a batch (see multiscript.cli), is only parsed once.
+
+    Documents are keyed by their output's long_id and the template file's path, modification time and size, so
+    an edited template is parsed again. Only outputs that can copy their documents (see
+    FileSetOutput.copy_document()) use the cache, and each get() returns a new copy that the caller can modify
+    freely. When there are more than max_entries documents, the least recently used are evicted.
+
+    All methods are thread-safe.
+    '''
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hit_count = 0          # Number of get() calls that found a document
+        self.miss_count = 0         # Number of get() calls that found no document
+        self._entries: OrderedDict[tuple, object] = OrderedDict()  # In order of least to most recently used
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(output, template_path: Path) -> tuple:
+        '''Returns the cache key for the document parsed by output from the template at template_path.'''
+        template_path = Path(template_path).resolve()
+        stat = template_path.stat()
+        return (output.long_id, str(template_path), stat.st_mtime_ns, stat.st_size)
+
+    def get(self, output, template_path: Path):
+        '''Returns a new copy of the document output parsed from the template at template_path, or None if it
+        isn't cached.'''
+        key = self.key(output, template_path)
+        with self._lock:
+            document = self._entries.get(key)
+            if document is None:
+                self.miss_count += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hit_count += 1
+        return output.copy_document(document)
+
+    def put(self, output, template_path: Path, document):
+        '''Adds document, which output has just parsed from the template at template_path, to the cache. The
+        document mustn't be modified afterwards.'''
+        key = self.key(output, template_path)
+        with self._lock:
+            self._entries[key] = document
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
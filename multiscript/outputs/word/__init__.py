@@ -1,4 +1,5 @@
 
+import copy
 from enum import Enum, auto
 import logging
 
@@ -11,8 +12,6 @@ from docx.text.paragraph import Paragraph
 
 from multiscript.outputs.base import OutputVersionConfig, OutputPlanConfig, OutputPlanRun, OutputBibleStreamHandler
 from multiscript.outputs.tagged import TaggedOutput, TaggedDocCursor, Tags
-from multiscript.outputs.word.version_config_word_panel import WordVersionConfigPanel
-from multiscript.outputs.word.plan_config_word_panel import WordPlanConfigPanel
 from multiscript.plan.symbols import column_symbols
 
 
@@ -73,7 +72,7 @@ class WordOutput(TaggedOutput):
     #
 
     def load_document(self, runner, version_combo, template_path):
-        document = docx.Document(template_path)
+        document = self.read_template(runner, template_path)
 
         # Apply formatting to styles
         for combo_element in version_combo:
@@ -112,6 +111,12 @@ class WordOutput(TaggedOutput):
 
         return document
     
+    def parse_document(self, template_path):
+        return docx.Document(template_path)
+
+    def copy_document(self, document):
+        return copy.deepcopy(document)
+
     def save_document(self, runner, version_combo, document, filepath):
         document.save(filepath)
 
@@ -440,6 +445,7 @@ class WordPlanConfig(OutputPlanConfig):
         self.apply_direct_formatting = False
 
     def new_config_widget(self):
+        from multiscript.outputs.word.plan_config_word_panel import WordPlanConfigPanel
         return WordPlanConfigPanel(None)
 
 
@@ -449,6 +455,7 @@ class WordVersionConfig(OutputVersionConfig):
         self.font_size = 0
 
     def new_config_subform(self):
+        from multiscript.outputs.word.version_config_word_panel import WordVersionConfigPanel
         return WordVersionConfigPanel(None)
 
 
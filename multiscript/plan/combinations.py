@@ -198,6 +198,11 @@ class BibleVersionCombo(MutableSequence):
 
         return template_combo
 
+    @property
+    def versions(self):
+        '''Returns a list of the versions in this combo, omitting any elements whose version is None.'''
+        return [element.version for element in self.data if element.version is not None]
+
     @property
     def is_partial(self):
         '''Returns True if any of the elements in this combo have their version set to None.'''
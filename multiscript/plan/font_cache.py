@@ -0,0 +1,47 @@
+import threading
+
+import fontfinder
+
+
+class FontCache:
+    '''Caches the font finding of plan runs, so that later plan runs in this session (e.g. the other plans of a
+    batch, see multiscript.cli) needn't repeat it. It holds a single FontFinder, and the font family found for
+    each script (which only depends on the script and its variant).
+
+    Runners hold install_lock while checking for, downloading and installing fonts, so that concurrent plan
+    runs don't install the same fonts at once.
+
+    All methods are thread-safe.
+    '''
+    def __init__(self):
+        self.hit_count = 0          # Number of find_family() calls that found a cached family
+        self.miss_count = 0         # Number of find_family() calls that had to find the family
+        self.install_lock = threading.RLock()
+        self._font_finder: fontfinder.FontFinder = None
+        self._families: dict[tuple[str, str], str] = {}     # Font family by main script and script variant
+        self._lock = threading.Lock()
+
+    @property
+    def font_finder(self) -> fontfinder.FontFinder:
+        with self._lock:
+            if self._font_finder is None:
+                self._font_finder = fontfinder.FontFinder()
+            return self._font_finder
+
+    def find_family(self, text_info: fontfinder.TextInfo) -> str:
+        '''Returns the preferred font family for text_info (see FontFinder.find_family()).'''
+        key = (text_info.main_script, text_info.script_variant)
+        with self._lock:
+            if key in self._families:
+                self.hit_count += 1
+                return self._families[key]
+            self.miss_count += 1
+        font_family = self.font_finder.find_family(text_info)
+        with self._lock:
+            self._families[key] = font_family
+        return font_family
+
+    def clear(self):
+        with self._lock:
+            self._families.clear()
+            self._font_finder = None
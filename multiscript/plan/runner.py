@@ -1,8 +1,14 @@
 
+import asyncio
+from collections import deque
+import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from operator import attrgetter
 from pathlib import Path
+import platform
 from tempfile import TemporaryDirectory
+import threading
 
 import requests
 
@@ -10,11 +16,14 @@ from bibleref.ref import BibleRange, BibleRangeList
 import fontfinder
 
 import multiscript
+from multiscript.bible.cache import BibleContentCache
 from multiscript.bible.content import BibleContent
 from multiscript.bible.version import BibleVersion
 from multiscript.outputs.base import OutputPlanRun
+from multiscript.outputs.template_cache import TemplateDocumentCache
 from multiscript.plan import combinations, Plan
 from multiscript.plan.combinations import BibleVersionCombo, BibleVersionColumn
+from multiscript.plan.font_cache import FontCache
 from multiscript.plan.monitor import PlanMonitorCollection
 from multiscript.util import serialize, util
 from multiscript.util.exception import MultiscriptException
@@ -22,6 +31,10 @@ from multiscript.util.exception import MultiscriptException
 _logger = logging.getLogger(__name__)
 
 PLAN_RUN_RECORD_FILENAME = ".multiscript.mrun"
+DEFAULT_MAX_LOAD_WORKERS = 8    # Default maximum number of Bible content loads performed concurrently
+CANCEL_POLL_INTERVAL = 0.25     # Seconds between checks for cancellation while waiting on worker threads
+FONT_PLATFORMS = ("Darwin", "Windows")  # Values of platform.system() on which fontfinder can select and install
+                                        # fonts
 
 
 class PlanRunner:
@@ -34,6 +47,15 @@ class PlanRunner:
         self.total_progress_steps: int = 0
         self.progress_step_count: int = 0
 
+        # Maximum number of Bible content loads performed concurrently. Each BibleSource can further limit
+        # the number of its own loads using its max_concurrent_loads attribute.
+        self.max_load_workers: int = DEFAULT_MAX_LOAD_WORKERS
+
+        # Private asyncio event loop, and the thread running it, for sources that load content with coroutines.
+        # Only running while Bible content is being loaded.
+        self._async_loop: asyncio.AbstractEventLoop = None
+        self._async_loop_thread: threading.Thread = None
+
         # BibleRangeList to be processed
         self.bible_ranges: BibleRangeList = BibleRangeList([])
         
@@ -46,9 +68,35 @@ class PlanRunner:
         
         # Uses BibleVersions as keys to a list of BibleContents (one for each range in self.bible_ranges)
         self.bible_contents: dict[BibleVersion, list[BibleContent]] = {}    
+
+        # Cache of Bible content loaded by earlier plan runs. Content found here isn't loaded from the sources
+        # again, and newly loaded content is added to it. May be set to None to always load all the content.
+        self.content_cache: BibleContentCache = multiscript.app().bible_content_cache
+
+        # Caches of parsed templates and of font finding, shared with other plan runs. Either may be set to None
+        # for this run to do its own.
+        self.template_document_cache: TemplateDocumentCache = multiscript.app().template_document_cache
+        self.font_cache: FontCache = multiscript.app().font_cache
+
+        # State of the Bible content loads while they're in progress (see _start_content_loads())
+        self._content_lists: dict[BibleVersion, list[BibleContent]] = {}
+        self._uncached_indices: dict[BibleVersion, list[int]] = {}  # Indices of the ranges each version must load
+        self._load_futures: dict[BibleVersion, dict[int, concurrent.futures.Future]] = {}   # Futures still awaited
+        self._load_executor: ThreadPoolExecutor = None
+        self._source_load_queues: dict['BibleSource', SourceLoadQueue] = {}
+        self._loading_sources: set['BibleSource'] = set()
+        self._async_sources: set['BibleSource'] = set()
+
+        # In a pipelined run, the versions whose content and fonts aren't yet ready for the outputs.
+        # Keys: versions Vals: True (we're using the dict as an ordered set)
+        self._unprepared_versions: dict[BibleVersion, bool] = {}
         
-        # FontFinder API object for font selection and installation.
-        self.font_finder = fontfinder.FontFinder()
+        # FontFinder API object for font selection and installation. Created when first needed.
+        self._font_finder: fontfinder.FontFinder = None
+
+        # True once the monitors have confirmed downloading fonts. A pipelined run may download fonts for each
+        # group of versions as they become ready, but only asks for confirmation the first time.
+        self._font_download_confirmed = False
 
         # An empty object other classes may use for persisting data between plan runs with the same
         # output directory.
@@ -59,6 +107,10 @@ class PlanRunner:
 
         # A temporary directory made available during the plan run
         self.temp_dir_path = None
+
+        # Messages of the errors that occurred during the run (see report_error()). Errors don't stop the run,
+        # but mean that some of its output is missing or incomplete.
+        self.errors: list[str] = []
         
         #
         # Convert the data in the plan into the required form for this runner.
@@ -88,6 +140,14 @@ class PlanRunner:
         # For ease of display, sort the version_cols list by symbol index
         self.version_cols.sort(key=attrgetter('symbol_index'))
 
+    @property
+    def font_finder(self) -> fontfinder.FontFinder:
+        if self.font_cache is not None:
+            return self.font_cache.font_finder
+        if self._font_finder is None:
+            self._font_finder = fontfinder.FontFinder()
+        return self._font_finder
+
     @property
     def all_versions(self) -> list[BibleVersion]:
         return list(self._all_versions.keys())
@@ -104,27 +164,64 @@ class PlanRunner:
             with TemporaryDirectory() as temp_dir:
                 self.temp_dir_path = Path(temp_dir)
                 self.calc_total_progress_steps()
-                self.load_bible_content()
-
-                try:
-                    self.select_auto_fonts()
-                except Exception as exception:
-                    _logger.exception(exception)
-                    self.monitors.request_confirmation("There was a problem selecting fonts.")
-
-                try:
-                    self.download_and_install_fonts()
-                except Exception as exception:
-                    _logger.exception(exception)
-                    self.monitors.request_confirmation("There was a problem downloading and installing fonts.")
-
-                self.create_bible_outputs()
+                if self.plan.config.general.pipelined_run:
+                    self._run_pipelined()
+                else:
+                    self.load_bible_content()
+                    self._prepare_fonts(self.all_versions)
+                    self.create_bible_outputs()
             self.temp_dir_path = None
         finally:
             self.save_plan_run_record()
 
         _logger.info("Finished")
 
+    def _run_pipelined(self):
+        '''Creates the outputs while the Bible content is still loading. Each version combo's output is created as
+        soon as the content of its versions has loaded and their fonts are ready (see prepare_versions()).
+        '''
+        _logger.info("Creating outputs while loading Bible content.")
+        try:
+            self._unprepared_versions = dict(self._all_versions)
+            self._start_content_loads()
+            self.create_bible_outputs()
+            self.prepare_versions(self.all_versions)    # Any versions the outputs didn't need
+        finally:
+            self._unprepared_versions = {}
+            self._finish_content_loads()
+
+    def prepare_versions(self, versions):
+        '''Outputs must call this method with the versions of each version combo before creating its output. In a
+        pipelined run, it waits for the content of any of versions still loading, then selects and installs their
+        fonts. Each version is only prepared once, and font downloads are only confirmed once per run. Otherwise
+        all the versions are already prepared before the outputs are created, and this method does nothing.
+        '''
+        new_versions = [version for version in versions if version in self._unprepared_versions]
+        if len(new_versions) == 0:
+            return
+        for version in new_versions:
+            self._wait_for_content_loads(version)
+            del self._unprepared_versions[version]
+        self._prepare_fonts(new_versions)
+
+    def _prepare_fonts(self, versions):
+        '''Selects fonts for any of versions using automatic fonts, then downloads and installs any fonts needed.'''
+        if platform.system() not in FONT_PLATFORMS:
+            _logger.info("Font selection and installation not currently supported on this platform.")
+            return
+
+        try:
+            self.select_auto_fonts(versions)
+        except Exception as exception:
+            _logger.exception(exception)
+            self.report_error("There was a problem selecting fonts.")
+
+        try:
+            self.download_and_install_fonts(versions)
+        except Exception as exception:
+            _logger.exception(exception)
+            self.report_error("There was a problem downloading and installing fonts.")
+
     def load_plan_run_record(self):
         '''Load the PlanRunRecord. Called at the beginning of the plan run.'''
         record_path = self.output_dir_path / PLAN_RUN_RECORD_FILENAME
@@ -163,10 +260,35 @@ class PlanRunner:
                 _logger.exception(exception)
 
     def load_bible_content(self):
-        all_sources = set()
+        '''Loads the Bible content of every version, and waits for it all to finish loading.'''
+        try:
+            self._start_content_loads()
+            for version in self.all_versions:
+                self._wait_for_content_loads(version)
+        finally:
+            self._finish_content_loads()
+
+    def _start_content_loads(self):
+        '''Schedules the loads of all the versions' Bible content onto worker threads, and returns without
+        waiting for them. _finish_content_loads() must be called afterwards, even if there's an exception.
+        '''
+        # Each version gets a list of BibleContents, one for each range in self.bible_ranges. Any content
+        # already in the content cache is taken from there, and only the rest is loaded.
         for version in self.all_versions:
-            all_sources.add(version.bible_source)
-        for source in all_sources:
+            self._content_lists[version] = []
+            self._uncached_indices[version] = []
+            for range_index, bible_range in enumerate(self.bible_ranges):
+                content = self._cached_content(version, bible_range)
+                if content is None:
+                    content = BibleContent()
+                    content.bible_version = version
+                    content.bible_range = bible_range
+                    self._uncached_indices[version].append(range_index)
+                self._content_lists[version].append(content)
+        loading_versions = [version for version in self.all_versions if len(self._uncached_indices[version]) > 0]
+
+        for source in {version.bible_source for version in loading_versions}:
+            self._loading_sources.add(source)
             try:
                 source.bible_content_loading(self)
             except Exception as exception:
@@ -175,53 +297,211 @@ class PlanRunner:
 
         _logger.info("Loading Bible versions:")
 
-        try:
-            for version in self.all_versions:
-                _logger.info(f"\tLoading {version.abbrev}:")
-                content_list = []
-
-                for bible_range in self.bible_ranges:
-                    content = BibleContent()
-                    content.bible_version = version
-                    content.bible_range = bible_range
+        # Each source can limit how many of its loads run at once. Its queue holds back the rest until one of
+        # them finishes, so that they don't take up worker threads that other sources' loads could use.
+        self._load_executor = ThreadPoolExecutor(max_workers=self.max_load_workers,
+                                                 thread_name_prefix="Bible content load")
+        self._source_load_queues = {source: SourceLoadQueue(self._load_executor, source.max_concurrent_loads)
+                                    for source in self._loading_sources}
+        self._async_sources = {version.bible_source for version in loading_versions
+                               if version.has_async_load and not version.has_batch_load}
+        async_semaphores: dict['BibleSource', asyncio.Semaphore] = {}    # Only accessed on the event loop thread
+        if len(self._async_sources) > 0:
+            self._start_async_loop(self._async_sources)
+
+        # Schedule every load onto the worker threads up front. Versions that support batch loading load all their
+        # uncached ranges with a single load_contents() call, and so have a single future (keyed by None).
+        # Otherwise each uncached range has its own future, keyed by range index.
+        for version in loading_versions:
+            range_indices = self._uncached_indices[version]
+            ranges = [self.bible_ranges[range_index] for range_index in range_indices]
+            contents = [self._content_lists[version][range_index] for range_index in range_indices]
+            load_queue = self._source_load_queues[version.bible_source]
+            if version.has_batch_load:
+                self._load_futures[version] = {None: load_queue.submit(version.load_contents, ranges, contents,
+                                                                       self)}
+            elif version.has_async_load:
+                self._load_futures[version] = {range_index: asyncio.run_coroutine_threadsafe(
+                                                    self._load_content_async(version, bible_range, content,
+                                                                             async_semaphores),
+                                                    self._async_loop)
+                                               for range_index, bible_range, content in zip(range_indices, ranges,
+                                                                                            contents)}
+            else:
+                self._load_futures[version] = {range_index: load_queue.submit(version.load_content, bible_range,
+                                                                              content, self)
+                                               for range_index, bible_range, content in zip(range_indices, ranges,
+                                                                                            contents)}
+
+    def _wait_for_content_loads(self, version):
+        '''Waits for the loads of a version scheduled by _start_content_loads(), then makes its content available
+        in self.bible_contents. Progress, cancellation and error reporting all happen on the calling thread, as
+        the monitors expect.
+        '''
+        _logger.info(f"\tLoading {version.abbrev}:")
+        content_list = self._content_lists[version]
+        version_futures = self._load_futures.pop(version, {})
+        if version.has_batch_load:
+            if None in version_futures:
+                if self._wait_for_batch_load(version, version_futures[None]):
+                    self._cache_contents(version, self._uncached_indices[version], content_list)
+            else:
+                _logger.info(f"\t\tFound {str(self.bible_ranges)} in the content cache")
+            for bible_range in self.bible_ranges:
+                self.increment_progress_step_count()
+        else:
+            for range_index, bible_range in enumerate(self.bible_ranges):
+                load_future = version_futures.get(range_index)
+                if load_future is None:
+                    _logger.info(f"\t\tFound {str(bible_range)} in the content cache")
+                else:
                     _logger.info(f"\t\tLoading {str(bible_range)}")
                     self.monitors.set_substatus_text(f"Loading {version.abbrev} {str(bible_range)}")
                     try:
-                        version.load_content(bible_range, content, self)
+                        self._wait_for_future(load_future)
+                        load_future.result()
+                        self._cache_contents(version, [range_index], content_list)
+                    except CancelError:
+                        raise
                     except Exception as exception:
                         _logger.exception(exception)
-                        self.monitors.request_confirmation(f"<b>There was an error loading {str(bible_range)} " +
-                                                        f"for the {version.abbrev}.</b>")
-                    content_list.append(content)
-                    
-                    # Noe: self.increment_progress_step_count() allows cancellation, which means a CancelError
-                    # can be raised during this call.
-                    self.increment_progress_step_count()
-
-                self.bible_contents[version] = content_list
-        finally:
-            # Allow sources to clean up after themselves, even if we had an unhandled exception, which could
-            # include a CancelError.
-            for source in all_sources:
-                try:
-                    source.bible_content_loaded(self)
-                except Exception as exception:
-                    _logger.debug(f"The source {source.name} raised an exception:")
-                    _logger.exception(exception)
-
-    def select_auto_fonts(self):
+                        self.report_error(f"<b>There was an error loading {str(bible_range)} " +
+                                          f"for the {version.abbrev}.</b>")
+                
+                # Noe: self.increment_progress_step_count() allows cancellation, which means a CancelError
+                # can be raised during this call.
+                self.increment_progress_step_count()
+
+        self.bible_contents[version] = content_list
+
+    def _finish_content_loads(self):
+        '''Cleans up after _start_content_loads(), once the loads have finished or the run has been cancelled.'''
+        # Discard any loads that haven't started, and wait for any in progress to finish, before the
+        # sources clean up.
+        for load_queue in self._source_load_queues.values():
+            load_queue.close()
+        self._source_load_queues.clear()
+        if self._load_executor is not None:
+            self._load_executor.shutdown(wait=True, cancel_futures=True)
+            self._load_executor = None
+        if self._async_loop is not None:
+            self._stop_async_loop(self._async_sources)
+        self._load_futures.clear()
+
+        # Allow sources to clean up after themselves, even if we had an unhandled exception, which could
+        # include a CancelError.
+        for source in self._loading_sources:
+            try:
+                source.bible_content_loaded(self)
+            except Exception as exception:
+                _logger.debug(f"The source {source.name} raised an exception:")
+                _logger.exception(exception)
+        self._loading_sources.clear()
+
+    def _cached_content(self, version, bible_range) -> BibleContent:
+        '''Returns the content of bible_range for version from the content cache, or None if it isn't there.'''
+        if self.content_cache is None:
+            return None
+        try:
+            return self.content_cache.get(version, bible_range)
+        except Exception as exception:
+            _logger.debug(f"The content cache couldn't be read for the {version.abbrev}:")
+            _logger.exception(exception)
+            return None
+
+    def _cache_contents(self, version, range_indices, contents):
+        '''Adds the newly loaded contents at range_indices of a version's content list to the content cache.'''
+        if self.content_cache is None:
+            return
+        for range_index in range_indices:
+            try:
+                self.content_cache.put(contents[range_index])
+            except Exception as exception:
+                _logger.debug(f"The content of {str(self.bible_ranges[range_index])} for the {version.abbrev} " +
+                              "couldn't be cached:")
+                _logger.exception(exception)
+
+    async def _load_content_async(self, version, bible_range, content, async_semaphores):
+        '''Loads a single BibleContent using the version's load_content_async(). Runs on the event loop thread.'''
+        source = version.bible_source
+        if source not in async_semaphores:
+            async_semaphores[source] = asyncio.Semaphore(max(1, source.max_concurrent_loads))
+        async with async_semaphores[source]:
+            await version.load_content_async(bible_range, content, self)
+
+    def _start_async_loop(self, async_sources):
+        '''Starts the private asyncio event loop that drives load_content_async() coroutines, on its own thread,
+        then lets each of async_sources set up any resources it needs on the loop.
+        '''
+        self._async_loop = asyncio.new_event_loop()
+        self._async_loop_thread = threading.Thread(target=self._async_loop.run_forever, name="Bible content load loop",
+                                                   daemon=True)
+        self._async_loop_thread.start()
+        for source in async_sources:
+            try:
+                asyncio.run_coroutine_threadsafe(source.bible_content_loading_async(self), self._async_loop).result()
+            except Exception as exception:
+                _logger.debug(f"The source {source.name} raised an exception:")
+                _logger.exception(exception)
+
+    def _stop_async_loop(self, async_sources):
+        '''Cancels any coroutines still running on the private event loop (e.g. if the run was cancelled), lets
+        each of async_sources clean up on the loop, then stops and closes the loop.
+        '''
+        async def cancel_all_tasks():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(cancel_all_tasks(), self._async_loop).result()
+        for source in async_sources:
+            try:
+                asyncio.run_coroutine_threadsafe(source.bible_content_loaded_async(self), self._async_loop).result()
+            except Exception as exception:
+                _logger.debug(f"The source {source.name} raised an exception:")
+                _logger.exception(exception)
+        self._async_loop.call_soon_threadsafe(self._async_loop.stop)
+        self._async_loop_thread.join()
+        self._async_loop.run_until_complete(self._async_loop.shutdown_asyncgens())
+        self._async_loop.close()
+        self._async_loop = None
+        self._async_loop_thread = None
+
+    def _wait_for_batch_load(self, version, load_future) -> bool:
+        '''Waits for a batch load of the ranges of a version. Returns True if the load succeeded.'''
+        _logger.info(f"\t\tLoading {str(self.bible_ranges)}")
+        self.monitors.set_substatus_text(f"Loading {version.abbrev}")
+        try:
+            self._wait_for_future(load_future)
+            load_future.result()
+            return True
+        except CancelError:
+            raise
+        except Exception as exception:
+            _logger.exception(exception)
+            self.report_error(f"<b>There was an error loading {str(self.bible_ranges)} " +
+                              f"for the {version.abbrev}.</b>")
+            return False
+
+    def _wait_for_future(self, future):
+        '''Waits for a future from a worker thread to complete, while still allowing the run to be paused or
+        cancelled.
+        '''
+        while not future.done():
+            concurrent.futures.wait([future], timeout=CANCEL_POLL_INTERVAL)
+            self.monitors.allow_cancel()
+
+    def select_auto_fonts(self, versions=None):
+        '''Selects fonts for the versions in versions (or all the versions if None) using automatic fonts.'''
         _logger.info("Selecting fonts:")
 
         ignored_scripts_str = multiscript.app().app_config_group.general.ignored_scripts
         ignored_scripts = {string.strip() for string in ignored_scripts_str.split(',')}
 
-        for bible_version in self._all_versions.keys():
+        for bible_version in (versions if versions is not None else self.all_versions):
             if bible_version.auto_font:
-                bible_text = ""
-                for bible_contents in self.bible_contents[bible_version]:
-                    bible_text += bible_contents.body.all_text()
-                
-                text_info = self.font_finder.analyse(bible_text)
+                text_info = self.font_finder.analyse(self._text_for_font_analysis(bible_version))
                 script_display = text_info.main_script
                 if text_info.script_variant != "":
                     script_display += f" ({text_info.script_variant})"
@@ -229,7 +509,10 @@ class PlanRunner:
                 if text_info.main_script in ignored_scripts:
                     _logger.info(f"\tFont family not selected for {script_display} script in {bible_version.abbrev}.")
                 else:
-                    font_family = self.font_finder.find_family(text_info)
+                    if self.font_cache is not None:
+                        font_family = self.font_cache.find_family(text_info)
+                    else:
+                        font_family = self.font_finder.find_family(text_info)
                     bible_version.font_family = font_family
                     bible_version.auto_font = False
                     self.plan.changed = True
@@ -242,9 +525,33 @@ class PlanRunner:
 
                 self.increment_progress_step_count()
 
-    def download_and_install_fonts(self):
+    def _text_for_font_analysis(self, bible_version) -> str:
+        '''Returns the plain text of the Bible content loaded for bible_version, up to the number of characters
+        the font finder analyses.'''
+        max_chars = self.font_finder.max_analyse_chars
+        text_parts = []
+        text_len = 0
+        for bible_content in self.bible_contents[bible_version]:
+            if text_len >= max_chars:
+                break
+            text = bible_content.body.all_text()
+            text_parts.append(text)
+            text_len += len(text)
+        return "".join(text_parts)
+
+    def download_and_install_fonts(self, versions=None):
+        '''Downloads and installs any fonts needed by the versions in versions (or all the versions if None).'''
+        if self.font_cache is None:
+            self._download_and_install_fonts(versions)
+        else:
+            with self.font_cache.install_lock:
+                self._download_and_install_fonts(versions)
+
+    def _download_and_install_fonts(self, versions):
+        if versions is None:
+            versions = self.all_versions
         try:
-            font_families = [bible_version.font_family for bible_version in self._all_versions.keys() if \
+            font_families = [bible_version.font_family for bible_version in versions if \
                              bible_version.font_family is not None and bible_version.font_family != ""]
             _logger.info("Checking installed fonts...")
             if len(self.font_finder.not_installed_families(font_families)) == 0:
@@ -266,8 +573,10 @@ class PlanRunner:
             _logger.info("Preparing to download these font families:")
             for font_family in families_for_download:
                 _logger.info(f"\t{font_family}")    
-            self.monitors.request_confirmation("Press <b>Continue</b> to download and install fonts for " +
-                                                "this plan...")
+            if not self._font_download_confirmed:
+                self.monitors.request_confirmation("Press <b>Continue</b> to download and install fonts for " +
+                                                    "this plan...")
+                self._font_download_confirmed = True
             
             _logger.info("Dowloading fonts:")
             # Need a temporary directory from here.
@@ -313,7 +622,13 @@ class PlanRunner:
                 raise
             except Exception as exception:
                 _logger.exception(exception)
-                self.monitors.request_confirmation(f"<b>There was an error creating the {output.name} output.</b>")
+                self.report_error(f"<b>There was an error creating the {output.name} output.</b>")
+
+    def report_error(self, message, path=None):
+        '''Records an error that occurred during the run in self.errors, and asks the monitors to confirm it
+        before the run continues.'''
+        self.errors.append(message)
+        self.monitors.request_confirmation(message, path)
 
     def increment_progress_step_count(self):
         self.progress_step_count += 1
@@ -324,6 +639,69 @@ class PlanRunner:
         self.monitors.set_progress_percent(int(self.progress_step_count / self.total_progress_steps * 100))
 
 
+class SourceLoadQueue:
+    '''Submits the Bible content loads of one BibleSource to an executor shared with other sources, with no more
+    than max_loads of them submitted at once. The next queued load is only submitted when one of the source's
+    submitted loads finishes.
+    '''
+    def __init__(self, executor: ThreadPoolExecutor, max_loads: int):
+        self._executor = executor
+        self._max_loads = max(1, max_loads)
+        self._submitted_count = 0   # Number of loads submitted to the executor that haven't finished
+        self._queue: deque[tuple[concurrent.futures.Future, callable, tuple]] = deque()
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args) -> concurrent.futures.Future:
+        '''Queues a call of fn(*args), and returns a Future for its result.'''
+        future = concurrent.futures.Future()
+        with self._lock:
+            self._queue.append((future, fn, args))
+        self._submit_queued()
+        return future
+
+    def close(self):
+        '''Cancels the loads still queued, and submits no more. Loads already submitted are left to the
+        executor.'''
+        with self._lock:
+            self._closed = True
+            queued = list(self._queue)
+            self._queue.clear()
+        for future, fn, args in queued:
+            future.cancel()
+
+    def _submit_queued(self):
+        while True:
+            with self._lock:
+                if self._closed or self._submitted_count >= self._max_loads or len(self._queue) == 0:
+                    return
+                future, fn, args = self._queue.popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                self._submitted_count += 1
+            try:
+                executor_future = self._executor.submit(fn, *args)
+            except RuntimeError as error:   # The executor has been shut down
+                self._load_finished(future, None, error)
+                continue
+            executor_future.add_done_callback(
+                lambda executor_future, future=future: self._load_finished(future, executor_future))
+
+    def _load_finished(self, future, executor_future, error=None):
+        with self._lock:
+            self._submitted_count -= 1
+        if error is None:
+            if executor_future.cancelled():
+                error = concurrent.futures.CancelledError()
+            else:
+                error = executor_future.exception()
+        if error is None:
+            future.set_result(executor_future.result())
+        else:
+            future.set_exception(error)
+        self._submit_queued()
+
+
 class PlanRunRecord:
     '''Class for holding data from a plan run that needs to be persisted in the output directory (e.g. cache
     data). Objects called by the PlanRunner may persist data by adding attributes to instances of this class.
@@ -201,7 +201,7 @@ class FutureResult():
         '''
         with self._paused_condition:
             self._is_paused = False
-            self._paused_condition.notify()
+            self._paused_condition.notify_all()
 
     def wait_for_resume(self):
         '''If is_paused is True, wait for resume to be called.
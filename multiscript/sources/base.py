@@ -1,6 +1,7 @@
 
 from pprint import pformat
 
+import multiscript
 from multiscript.bible.version import BibleVersion
 from multiscript.config.app import AppConfig
 from multiscript.config.plan import PlanConfig
@@ -12,6 +13,9 @@ class BibleSource:
         self.id = None
         self.name = None
         self.allow_manual_versions = True   # True if the user can add a version from this source manually
+        self.max_concurrent_loads = 1       # Max number of BibleVersion.load_content() (or load_content_async())
+                                            # calls for versions from this source that a plan run may make
+                                            # concurrently. Sources must be thread-safe before increasing this.
 
     @property
     def long_id(self):
@@ -19,6 +23,22 @@ class BibleSource:
         For a BibleSource this is a combination of its plugin long_id and the BibleSource's (short) id.'''
         return self.plugin.long_id + "/" + self.id
 
+    @property
+    def app_config(self) -> 'SourceAppConfig':
+        '''Returns the SourceAppConfig for this source stored in the app config, or None if this source
+        stores no app config.
+
+        If the app config has no entry for this source (e.g. it was saved before the source began storing
+        app config), a new default SourceAppConfig is added to it.
+        '''
+        app_config_sources = multiscript.app().app_config_group.sources
+        if self.long_id not in app_config_sources:
+            source_app_config = self.new_source_app_config()
+            if source_app_config is None:
+                return None
+            app_config_sources[self.long_id] = source_app_config
+        return app_config_sources[self.long_id]
+
     def new_bible_version(self, version_id=None, name=None, lang=None, abbrev=None):
         '''Construct a new BibleVersion for this BibleSource. This should be overridden by subclasses
         to return an appropriate subclass of BibleVersion.
@@ -65,6 +85,23 @@ class BibleSource:
         '''
         pass
 
+    async def bible_content_loading_async(self, runner):
+        '''Like bible_content_loading(), but called on the plan run's asyncio event loop, when the plan contains
+        versions from this source that load content with BibleVersion.load_content_async().
+
+        Subclasses may override to create any resources that must belong to the event loop (e.g. an asyncio
+        HTTP client session).
+        '''
+        pass
+
+    async def bible_content_loaded_async(self, runner):
+        '''Called on the plan run's asyncio event loop once loading has finished, if
+        bible_content_loading_async() was called.
+
+        Subclasses may override to clean up any resources allocated in bible_content_loading_async().
+        '''
+        pass
+
     def __repr__(self):
         return f"{self.__class__.__name__}({self.id})" + "\n" + \
         pformat(self.__dict__)
@@ -87,6 +124,12 @@ class VersionProgressReporter:
         returned by get_all_versions()'''
         pass
 
+    def replace_source_versions(self, bible_source: BibleSource, bible_versions: list[BibleVersion]):
+        '''Replace all the versions from bible_source previously added with add_versions() by bible_versions.
+        Sources can use this to first add a quickly available (e.g. cached) list of versions, and then
+        replace it if an up-to-date list turns out to be different.'''
+        pass
+
     def is_cancelled(self):
         '''Returns true if the caller of get_all_versions() wants the operation to be cancelled.'''
         pass
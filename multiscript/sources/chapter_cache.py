@@ -0,0 +1,133 @@
+import logging
+from pathlib import Path
+import sqlite3
+import threading
+import time
+
+
+_logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class ChapterCache:
+    '''A persistent, size-bounded cache of Bible chapter data downloaded by a BibleSource.
+
+    Entries are keyed by (version id, book code, chapter number), and store the raw chapter data
+    as a string (typically the JSON text of the response from the source's API). The cache is stored
+    in a single SQLite database file.
+
+    When the total size of the cached data exceeds max_size bytes, the least recently used entries are
+    evicted. Entries older than ttl seconds are treated as expired, unless allow_expired is True when
+    calling get() (e.g. when working offline).
+
+    Instances may be safely shared between threads.
+    '''
+    def __init__(self, path, max_size: int = 200 * 1024 * 1024, ttl: float = 30 * SECONDS_PER_DAY):
+        self.path: Path = Path(path)
+        self.max_size: int = max_size   # Maximum total size of cached data in bytes. 0 or less for no limit.
+        self.ttl: float = ttl           # Time-to-live of entries in seconds. 0 or less for no expiry.
+        self._lock = threading.RLock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute('''CREATE TABLE IF NOT EXISTS chapters (
+                                        version_id  TEXT NOT NULL,
+                                        book_code   TEXT NOT NULL,
+                                        chap_num    INTEGER NOT NULL,
+                                        stored      REAL NOT NULL,
+                                        accessed    REAL NOT NULL,
+                                        size        INTEGER NOT NULL,
+                                        data        TEXT NOT NULL,
+                                        PRIMARY KEY (version_id, book_code, chap_num)
+                                    )''')
+        self._connection.execute('CREATE INDEX IF NOT EXISTS chapters_accessed ON chapters (accessed)')
+        self._connection.commit()
+        self._total_size: int = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM chapters').fetchone()[0]
+
+    @property
+    def total_size(self) -> int:
+        '''The total size in bytes of all the data in the cache.'''
+        return self._total_size
+
+    def get(self, version_id: str, book_code: str, chap_num: int, allow_expired: bool = False) -> str:
+        '''Returns the cached data for the chapter, or None if the chapter is not in the cache or has expired.
+        If allow_expired is True, expired entries are still returned.
+        '''
+        with self._lock:
+            row = self._connection.execute('SELECT stored, data FROM chapters WHERE ' +
+                                           'version_id = ? AND book_code = ? AND chap_num = ?',
+                                           (version_id, book_code, chap_num)).fetchone()
+            if row is None:
+                return None
+            stored, data = row
+            now = time.time()
+            if not allow_expired and self.ttl > 0 and (now - stored) > self.ttl:
+                return None
+            self._connection.execute('UPDATE chapters SET accessed = ? WHERE ' +
+                                     'version_id = ? AND book_code = ? AND chap_num = ?',
+                                     (now, version_id, book_code, chap_num))
+            self._connection.commit()
+            return data
+
+    def put(self, version_id: str, book_code: str, chap_num: int, data: str):
+        '''Stores the data for the chapter, replacing any existing entry, then evicts the least recently
+        used entries if the cache is now too large.
+        '''
+        size = len(data.encode('utf-8'))
+        with self._lock:
+            now = time.time()
+            row = self._connection.execute('SELECT size FROM chapters WHERE ' +
+                                           'version_id = ? AND book_code = ? AND chap_num = ?',
+                                           (version_id, book_code, chap_num)).fetchone()
+            if row is not None:
+                self._total_size -= row[0]
+            self._connection.execute('INSERT OR REPLACE INTO chapters ' +
+                                     '(version_id, book_code, chap_num, stored, accessed, size, data) ' +
+                                     'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                     (version_id, book_code, chap_num, now, now, size, data))
+            self._total_size += size
+            self._evict()
+            self._connection.commit()
+
+    def _evict(self):
+        '''Removes least recently used entries until the cache is within its maximum size. Must be called
+        with self._lock held.
+        '''
+        if self.max_size <= 0 or self._total_size <= self.max_size:
+            return
+        cursor = self._connection.execute('SELECT version_id, book_code, chap_num, size FROM chapters ' +
+                                          'ORDER BY accessed ASC')
+        evictions = []
+        for version_id, book_code, chap_num, size in cursor:
+            if self._total_size <= self.max_size:
+                break
+            evictions.append((version_id, book_code, chap_num))
+            self._total_size -= size
+        self._connection.executemany('DELETE FROM chapters WHERE version_id = ? AND book_code = ? AND chap_num = ?',
+                                     evictions)
+        _logger.debug(f"Evicted {len(evictions)} chapter(s) from cache {self.path.name}")
+
+    def remove_expired(self):
+        '''Removes all expired entries from the cache.'''
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._connection.execute('DELETE FROM chapters WHERE stored < ?', (time.time() - self.ttl,))
+            self._total_size = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM chapters').fetchone()[0]
+            self._connection.commit()
+
+    def clear(self):
+        '''Removes all entries from the cache.'''
+        with self._lock:
+            self._connection.execute('DELETE FROM chapters')
+            self._connection.commit()
+            self._total_size = 0
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM chapters').fetchone()[0]
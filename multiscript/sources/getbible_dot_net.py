@@ -1,14 +1,36 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import json
+import logging
 import re
+import threading
+from typing import Iterator
 
 import bs4          # Beautiful Soup library
 import requests
 import urllib
 
-from bibleref import BibleBook, BibleRange, BibleVerse
+from bibleref import BibleBook, BibleRange
 
-from multiscript.sources.base import BibleSource, VersionProgressReporter
+import multiscript
+from multiscript.sources.base import BibleSource, SourceAppConfig, VersionProgressReporter
+from multiscript.sources.chapter_cache import ChapterCache, SECONDS_PER_DAY
+from multiscript.sources import http
+from multiscript.bible.verse_id import chap_base_id, range_to_ids, verse_from_id
 from multiscript.bible.version import BibleVersion
 from multiscript.plan.runner import PlanRunner
+from multiscript.util.exception import MultiscriptException
+
+
+_logger = logging.getLogger(__name__)
+
+API_BASE_URL = 'https://api.getbible.net/v2'
+CHAPTER_CACHE_FILENAME = "getbible.net chapters.sqlite3"
+CATALOG_CACHE_FILENAME = "getbible.net translations.json"
+DEFAULT_MAX_CONCURRENT_DOWNLOADS = 4
+BOOK_DOWNLOAD_MIN_CHAPTERS = 3      # Download a whole book at once if we need at least this many of its chapters...
+BOOK_DOWNLOAD_MIN_FRACTION = 0.25   # ...and they make up at least this fraction of the book.
 
 
 class GetBibleDotNetSource(BibleSource):
@@ -16,6 +38,15 @@ class GetBibleDotNetSource(BibleSource):
         super().__init__(plugin)
         self.id = "getbible.net"
         self.name = "GetBible.net"
+        self.max_concurrent_loads = 8
+        self.api_base_url = API_BASE_URL            # Base URL of the GetBible.net v2 API (e.g. for a local stand-in)
+        self._chapter_cache: ChapterCache = None    # Persistent cache of downloaded chapters
+        self._http_session: requests.Session = None # Connection-pooled HTTP session. Only open during plan runs.
+        self._download_executor: ThreadPoolExecutor = None  # Thread pool for concurrent downloads during plan runs
+        self._fetch_plans: dict[PlanRunner, GetBibleDotNetFetchPlan] = {}  # Chapters needed by each loading run
+        self._loading_run_count = 0                 # Number of plan runs loading content, which share the resources
+        self._rate_limiter: http.AdaptiveRateLimiter = None  # Limits requests to the server. Kept between runs.
+        self._lock = threading.RLock()              # Protects resources shared between download threads
 
     def new_bible_version(self, version_id=None, name=None, lang=None, abbrev=None):
         '''Overridden from BibleVersion.
@@ -31,7 +62,7 @@ class GetBibleDotNetSource(BibleSource):
         of a subclass of SourceAppConfig. Returns None if the source stores no 
         app config.
         '''
-        return None
+        return GetBibleDotNetAppConfig(self)
 
     def new_source_plan_config(self):
         '''Overridden from BibleVersion.
@@ -46,11 +77,87 @@ class GetBibleDotNetSource(BibleSource):
         '''Overridden from BibleVersion.
         
         Return all of the BibleVersions available for this BibleSource.
+
+        The catalog of translations is cached on disk. If there is a cached catalog and a progress_reporter,
+        the cached versions are reported straight away, and the catalog is then revalidated with the server
+        (using its ETag and Last-Modified headers). The reported versions are only replaced if the catalog
+        has actually changed.
+        '''
+        cached_catalog = self.load_catalog_cache()
+        reported_cached = False
+        if cached_catalog is not None and progress_reporter is not None:
+            progress_reporter.add_versions(self._catalog_versions(cached_catalog['catalog']))
+            reported_cached = True
+
+        try:
+            catalog = self.revalidate_catalog(cached_catalog)
+        except Exception as exception:
+            if cached_catalog is None:
+                raise
+            _logger.debug("Couldn't revalidate the GetBible.net translation catalog. Using the cached catalog.")
+            _logger.exception(exception)
+            catalog = cached_catalog
+
+        if not reported_cached:
+            return self._catalog_versions(catalog['catalog'])
+        if catalog['catalog'] != cached_catalog['catalog']:
+            progress_reporter.replace_source_versions(self, self._catalog_versions(catalog['catalog']))
+        return []
+
+    def revalidate_catalog(self, cached_catalog: dict) -> dict:
+        '''Requests the translation catalog from the server, sending the validators of cached_catalog (if any),
+        and returns the current catalog. If the server reports the cached catalog is unchanged, cached_catalog
+        is returned. Otherwise the new catalog is saved to the cache.
         '''
-        response = requests.get('https://api.getbible.net/v2/translations.json', timeout=15)
-        resp_dict = response.json()
+        headers = {}
+        if cached_catalog is not None:
+            if cached_catalog.get('etag') is not None:
+                headers['If-None-Match'] = cached_catalog['etag']
+            if cached_catalog.get('last_modified') is not None:
+                headers['If-Modified-Since'] = cached_catalog['last_modified']
+        with self.new_http_session() as http_session:
+            response = http_session.get(f'{self.api_base_url}/translations.json', headers=headers,
+                                        timeout=http.DEFAULT_TIMEOUT)
+        if cached_catalog is not None and response.status_code == requests.codes.not_modified:
+            return cached_catalog
+        response.raise_for_status()
+        catalog = {'etag':          response.headers.get('ETag'),
+                   'last_modified': response.headers.get('Last-Modified'),
+                   'catalog':       response.json()}
+        self.save_catalog_cache(catalog)
+        return catalog
+
+    @property
+    def catalog_cache_path(self):
+        return multiscript.app().app_cache_dir_path / CATALOG_CACHE_FILENAME
+
+    def load_catalog_cache(self) -> dict:
+        '''Returns the cached translation catalog, as a dictionary with the keys etag, last_modified and catalog,
+        or None if there is no usable cached catalog.
+        '''
+        try:
+            with open(self.catalog_cache_path, encoding='utf-8') as file:
+                cached_catalog = json.load(file)
+            if 'catalog' in cached_catalog:
+                return cached_catalog
+        except FileNotFoundError:
+            pass
+        except Exception as exception:
+            _logger.debug("Ignoring unreadable GetBible.net translation catalog cache.")
+            _logger.exception(exception)
+        return None
+
+    def save_catalog_cache(self, cached_catalog: dict):
+        # Write to a temporary file first, so that an interrupted write can't leave a corrupt cache
+        temp_path = self.catalog_cache_path.with_name(self.catalog_cache_path.name + ".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(cached_catalog, file)
+        temp_path.replace(self.catalog_cache_path)
+
+    def _catalog_versions(self, catalog: dict) -> list[BibleVersion]:
+        '''Returns a list of new BibleVersions for the translations in the translation catalog.'''
         versions = []
-        for key, vers_dict in resp_dict.items():
+        for key, vers_dict in catalog.items():
             id = key
             version = self.new_bible_version(id)
             version.user_labels.name = vers_dict['translation']
@@ -68,8 +175,19 @@ class GetBibleDotNetSource(BibleSource):
 
         Subclasses may override to load any resources that may need to be shared amongst versions
         from this source during the plan run.
+
+        Several plan runs may load content at once (e.g. in a batch), so the HTTP session, download thread pool
+        and chapter cache are shared by all the loading runs, and only released when the last has finished.
+        Each run has its own fetch plan.
         '''
-        pass
+        self.open_chapter_cache()
+        with self._lock:
+            self._loading_run_count += 1
+            if self._http_session is None:
+                self._http_session = self.new_http_session()
+            if self._download_executor is None:
+                self._download_executor = self.new_download_executor()
+            self._fetch_plans[runner] = GetBibleDotNetFetchPlan(self, runner.bible_ranges)
 
     def bible_content_loaded(self, runner):
         '''Overridden from BibleVersion.
@@ -78,7 +196,201 @@ class GetBibleDotNetSource(BibleSource):
 
         Subclasses may override to clean up any resources that were allocated during bible_content_loading().
         '''
-        pass
+        with self._lock:
+            self._fetch_plans.pop(runner, None)
+            self._loading_run_count = max(0, self._loading_run_count - 1)
+            if self._loading_run_count > 0:
+                # Other runs are still loading, and using the shared resources
+                return
+            if self._download_executor is not None:
+                self._download_executor.shutdown(cancel_futures=True)
+                self._download_executor = None
+            self.close_chapter_cache()
+            if self._http_session is not None:
+                self._http_session.close()
+                self._http_session = None
+        if self._rate_limiter is not None:
+            counters_summary = self._rate_limiter.counters_summary()
+            if counters_summary != "":
+                _logger.info(f"{self.name} requests: {counters_summary}")
+            self._rate_limiter.reset_counters()
+
+    def fetch_plan(self, bible_ranges, runner=None) -> 'GetBibleDotNetFetchPlan':
+        '''Returns the fetch plan for runner's plan run if it covers all of bible_ranges. Otherwise returns a
+        new fetch plan just for bible_ranges.
+        '''
+        with self._lock:
+            fetch_plan = self._fetch_plans.get(runner)
+        if fetch_plan is not None and fetch_plan.covers(bible_ranges):
+            return fetch_plan
+        return GetBibleDotNetFetchPlan(self, bible_ranges)
+
+    def new_http_session(self) -> requests.Session:
+        '''Returns a new connection-pooled HTTP session, configured using the app config.'''
+        app_config = self.app_config
+        return http.new_http_session(pool_size=app_config.http_pool_size,
+                                     max_retries=app_config.http_max_retries,
+                                     backoff_factor=app_config.http_backoff_factor,
+                                     rate_limiter=self.rate_limiter)
+
+    @property
+    def rate_limiter(self) -> http.AdaptiveRateLimiter:
+        '''The AdaptiveRateLimiter for requests to the server, or None if the app config disables rate limiting.
+        The limiter is kept between plan runs, so that what it learns about the server carries over.
+        '''
+        app_config = self.app_config
+        with self._lock:
+            if not app_config.use_rate_limiter:
+                self._rate_limiter = None
+            elif self._rate_limiter is None or \
+                 self._rate_limiter.max_requests_per_sec != app_config.http_max_requests_per_sec or \
+                 self._rate_limiter.max_concurrency != app_config.max_concurrent_downloads:
+                self._rate_limiter = http.AdaptiveRateLimiter(
+                                        max_requests_per_sec=app_config.http_max_requests_per_sec,
+                                        max_concurrency=app_config.max_concurrent_downloads)
+            return self._rate_limiter
+
+    def new_download_executor(self) -> ThreadPoolExecutor:
+        '''Returns a new thread pool for downloading chapters concurrently, configured using the app config.'''
+        return ThreadPoolExecutor(max_workers=self.app_config.max_concurrent_downloads,
+                                  thread_name_prefix=f"{self.id} download")
+
+    def http_get(self, url: str) -> requests.Response:
+        '''Performs an HTTP GET request for the url. During a plan run, the request uses the run's
+        connection-pooled HTTP session. Otherwise a temporary session is used.
+        '''
+        http_session = self._http_session
+        if http_session is not None:
+            return http_session.get(url, timeout=http.DEFAULT_TIMEOUT)
+        with self.new_http_session() as http_session:
+            return http_session.get(url, timeout=http.DEFAULT_TIMEOUT)
+
+    def open_chapter_cache(self):
+        '''Opens the persistent cache of downloaded chapters, if the app config allows it and it's not
+        already open.
+        '''
+        app_config = self.app_config
+        with self._lock:
+            if self._chapter_cache is None and app_config.use_chapter_cache:
+                self._chapter_cache = ChapterCache(multiscript.app().app_cache_dir_path / CHAPTER_CACHE_FILENAME,
+                                                   max_size=app_config.chapter_cache_max_mb * 1024 * 1024,
+                                                   ttl=app_config.chapter_cache_ttl_days * SECONDS_PER_DAY)
+
+    def close_chapter_cache(self):
+        with self._lock:
+            if self._chapter_cache is not None:
+                self._chapter_cache.close()
+                self._chapter_cache = None
+
+    def clear_chapter_cache(self):
+        '''Removes all chapters from the persistent cache of downloaded chapters.'''
+        cache_path = multiscript.app().app_cache_dir_path / CHAPTER_CACHE_FILENAME
+        if self._chapter_cache is not None:
+            self._chapter_cache.clear()
+        elif cache_path.exists():
+            chapter_cache = ChapterCache(cache_path)
+            chapter_cache.clear()
+            chapter_cache.close()
+
+    def get_chapter(self, version_id: str, book_code: str, chap_num: int) -> dict:
+        '''Returns the decoded JSON data for a chapter of a version, using the chapter cache if possible.
+
+        In offline mode, only the chapter cache is used (even for expired chapters), and a
+        ChapterNotCachedError is raised if the chapter is not in the cache.
+        '''
+        offline_mode = self.is_offline()
+        chap_dict = self.get_cached_chapter(version_id, book_code, chap_num)
+        if chap_dict is not None:
+            return chap_dict
+        if offline_mode:
+            raise ChapterNotCachedError(version_id, book_code, chap_num)
+
+        url = f'{self.api_base_url}/{version_id}/{book_code}/{chap_num}.json'
+        response = self.http_get(url)
+        response.raise_for_status()
+        chapter_cache = self._chapter_cache
+        if chapter_cache is not None:
+            chapter_cache.put(version_id, book_code, chap_num, response.text)
+        return response.json()
+
+    def is_offline(self) -> bool:
+        '''Returns True if the app config only allows chapters to be read from the chapter cache.'''
+        app_config = self.app_config
+        return app_config.use_chapter_cache and app_config.offline_mode
+
+    def get_cached_chapter(self, version_id: str, book_code: str, chap_num: int) -> dict:
+        '''Returns the decoded JSON data for a chapter of a version from the chapter cache, or None if it
+        isn't cached. In offline mode, expired chapters are also returned.
+        '''
+        self.open_chapter_cache()
+        chapter_cache = self._chapter_cache
+        if chapter_cache is None:
+            return None
+        chapter_text = chapter_cache.get(version_id, book_code, chap_num, allow_expired=self.is_offline())
+        return json.loads(chapter_text) if chapter_text is not None else None
+
+    def get_book(self, version_id: str, book_code: str) -> dict:
+        '''Downloads the decoded JSON data for a whole book of a version in a single request. Every chapter
+        of the book is added to the chapter cache.
+        '''
+        url = f'{self.api_base_url}/{version_id}/{book_code}.json'
+        response = self.http_get(url)
+        response.raise_for_status()
+        book_dict = response.json()
+        chapter_cache = self._chapter_cache
+        if chapter_cache is not None:
+            for chap_dict in book_dict['chapters']:
+                chapter_cache.put(version_id, book_code, int(chap_dict['chapter']), json.dumps(chap_dict))
+        return book_dict
+
+    def get_book_chapters(self, version_id: str, book: BibleBook, chap_nums: list[int]) -> dict[int, dict]:
+        '''Returns a dictionary of the decoded JSON data for several chapters of a book, keyed by chapter number.
+
+        Cached chapters are used where possible. If enough of the book's chapters are still needed (see
+        BOOK_DOWNLOAD_MIN_CHAPTERS and BOOK_DOWNLOAD_MIN_FRACTION), the whole book is downloaded in a single
+        request. Otherwise the remaining chapters (and any missing from the downloaded book) are downloaded
+        individually, but concurrently.
+        '''
+        book_code = GetBibleDotNetVersion.book_codes[book]
+        chapters = {}
+        for chap_num in chap_nums:
+            chap_dict = self.get_cached_chapter(version_id, book_code, chap_num)
+            if chap_dict is not None:
+                chapters[chap_num] = chap_dict
+        needed_chap_nums = [chap_num for chap_num in chap_nums if chap_num not in chapters]
+
+        if not self.is_offline() and len(needed_chap_nums) >= BOOK_DOWNLOAD_MIN_CHAPTERS and \
+           len(needed_chap_nums) >= book.chap_count() * BOOK_DOWNLOAD_MIN_FRACTION:
+            book_chapters = {int(chap_dict['chapter']): chap_dict
+                             for chap_dict in self.get_book(version_id, book_code)['chapters']}
+            for chap_num in needed_chap_nums:
+                if chap_num in book_chapters:
+                    chapters[chap_num] = book_chapters[chap_num]
+                else:
+                    _logger.info(f"Chapter {chap_num} missing from {version_id} book {book_code}, so downloading "
+                                 f"it separately.")
+            needed_chap_nums = [chap_num for chap_num in needed_chap_nums if chap_num not in chapters]
+
+        if len(needed_chap_nums) > 0:
+            for chap_num, chap_dict in zip(needed_chap_nums,
+                                           self.get_chapters(version_id, book_code, needed_chap_nums)):
+                chapters[chap_num] = chap_dict
+        return chapters
+
+    def get_chapters(self, version_id: str, book_code: str, chap_nums: list[int]) -> Iterator[dict]:
+        '''Returns an iterator over the decoded JSON data for several chapters of a book, in the same order as
+        chap_nums.
+
+        The chapters are downloaded concurrently, with at most max_concurrent_downloads (from the app config)
+        in progress at once. During a plan run, the run's download thread pool is used, which bounds the
+        number of concurrent downloads across all versions from this source.
+        '''
+        get_book_chapter = functools.partial(self.get_chapter, version_id, book_code)
+        download_executor = self._download_executor
+        if download_executor is not None:
+            return download_executor.map(get_book_chapter, chap_nums)
+        with self.new_download_executor() as download_executor:
+            return iter(list(download_executor.map(get_book_chapter, chap_nums)))
 
 
 class GetBibleDotNetVersion(BibleVersion):
@@ -154,24 +466,144 @@ class GetBibleDotNetVersion(BibleVersion):
         super().__init__(source, id, name, lang, abbrev)
 
     def load_content(self, bible_range: BibleRange, bible_content, plan_runner: PlanRunner):
-        book_code = GetBibleDotNetVersion.book_codes[bible_range.start.book]
+        self.load_contents([bible_range], [bible_content], plan_runner)
+
+    def load_contents(self, bible_ranges, bible_contents, plan_runner: PlanRunner):
+        '''Overridden from BibleVersion.
+
+        Loads all the ranges at once, using the source's fetch plan for the run, so that each chapter is fetched
+        only once even if several ranges overlap, and books with many chapters needed can be downloaded in a
+        single request. Each chapter's data is released as soon as the last of the ranges needing it has been
+        filled.
+        '''
+        fetch_plan = self.bible_source.fetch_plan(bible_ranges, plan_runner)
+        chapter_uses = Counter((chap_range.start.book, chap_range.start.chap_num)
+                               for bible_range in bible_ranges for chap_range in fetch_plan.chapter_ranges(bible_range))
+        try:
+            for bible_range, bible_content in zip(bible_ranges, bible_contents):
+                self._init_content_body(bible_content)
+                for chap_range in fetch_plan.chapter_ranges(bible_range):
+                    chapter_key = (chap_range.start.book, chap_range.start.chap_num)
+                    resp_dict = fetch_plan.get_chapter(self.id, *chapter_key)
+                    self._add_chapter_verses(bible_range, chap_range, resp_dict, bible_content)
+                    chapter_uses[chapter_key] -= 1
+                    if chapter_uses[chapter_key] == 0:
+                        fetch_plan.release_chapter(self.id, *chapter_key)
+        finally:
+            fetch_plan.release_version(self.id)
+
+    def _init_content_body(self, bible_content):
         content_body = bible_content.body
         content_body.strip_text = True
         content_body.insert_missing_whitespace = True
         content_body.insert_missing_chap_num = True
 
-        bible_ranges = bible_range.split(by_chap=True, num_verses=None)
-        for indiv_range in bible_ranges:
-            indiv_range: BibleRange = indiv_range
-            url = f'https://api.getbible.net/v2/{self.id}/{book_code}/{indiv_range.start.chap_num}.json'
-            response = requests.get(url, timeout=15)
-            resp_dict = response.json()
-            for verse_dict in resp_dict['verses']:
-                verse_num = int(verse_dict['verse'])
-                verse_ref = BibleVerse(indiv_range.start.book, indiv_range.start.chap_num, verse_num)
-                if bible_range.contains(verse_ref):
-                    content_body.current_verse = verse_ref
-                    content_body.add_start_verse_num()
-                    content_body.add_text(str(verse_num))
-                    content_body.add_end_verse_num()
-                    content_body.add_text(verse_dict['text'])
\ No newline at end of file
+    def _add_chapter_verses(self, bible_range: BibleRange, indiv_range: BibleRange, resp_dict, bible_content):
+        '''Adds the verses of bible_range found in the chapter data resp_dict (for the single-chapter range
+        indiv_range) to bible_content.
+        '''
+        start_id, end_id = range_to_ids(bible_range)
+        chap_id = chap_base_id(indiv_range.start.book, indiv_range.start.chap_num)
+        verses = ((chap_id + int(verse_dict['verse']), verse_dict['text']) for verse_dict in resp_dict['verses'])
+        bible_content.body.add_verses((verse_from_id(id), str(id - chap_id), text, None)
+                                      for id, text in verses if start_id <= id <= end_id)
+
+
+class GetBibleDotNetFetchPlan:
+    '''Plans the chapters to fetch for a set of BibleRanges, which are the same for every version in a plan run.
+
+    The ranges are split into single-chapter ranges, and the distinct chapters needed from each book are worked
+    out, only once. The chapters of each book are then fetched at most once per version, no matter how many of
+    the ranges overlap, and each range is carved out of the shared chapter data.
+    '''
+    def __init__(self, bible_source: GetBibleDotNetSource, bible_ranges):
+        self.bible_source = bible_source
+
+        # Single-chapter ranges making up each BibleRange
+        self._chapter_ranges: dict[BibleRange, list[BibleRange]] = {}
+
+        # Distinct chapter numbers needed from each book, in order of first use
+        self._chap_nums_by_book: dict[BibleBook, list[int]] = {}
+
+        for bible_range in bible_ranges:
+            if bible_range in self._chapter_ranges:
+                continue
+            chapter_ranges = bible_range.split(by_chap=True, num_verses=None)
+            self._chapter_ranges[bible_range] = chapter_ranges
+            for chap_range in chapter_ranges:
+                chap_nums = self._chap_nums_by_book.setdefault(chap_range.start.book, [])
+                if chap_range.start.chap_num not in chap_nums:
+                    chap_nums.append(chap_range.start.chap_num)
+
+        # Fetched chapter data by (version_id, book), and a lock for each key so that concurrent
+        # loads for the same version and book wait for a single fetch. Chapters are removed once released.
+        self._book_chapters: dict[tuple[str, BibleBook], dict[int, dict]] = {}
+        self._book_locks: dict[tuple[str, BibleBook], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def covers(self, bible_ranges) -> bool:
+        '''Returns True if this plan includes all of bible_ranges.'''
+        return all(bible_range in self._chapter_ranges for bible_range in bible_ranges)
+
+    def chapter_ranges(self, bible_range: BibleRange) -> list[BibleRange]:
+        '''Returns the single-chapter ranges that make up bible_range.'''
+        return self._chapter_ranges[bible_range]
+
+    def get_chapter(self, version_id: str, book: BibleBook, chap_num: int) -> dict:
+        '''Returns the decoded JSON data for a chapter of a version. The first call for a version and book fetches
+        all the chapters needed from that book, and later calls share the result until the chapter is released
+        (after which it's fetched again if needed).
+        '''
+        key = (version_id, book)
+        with self._lock:
+            book_lock = self._book_locks.setdefault(key, threading.Lock())
+        with book_lock:
+            if key not in self._book_chapters:
+                self._book_chapters[key] = self.bible_source.get_book_chapters(version_id, book,
+                                                                               self._chap_nums_by_book[book])
+            elif chap_num not in self._book_chapters[key]:
+                self._book_chapters[key].update(self.bible_source.get_book_chapters(version_id, book, [chap_num]))
+            return self._book_chapters[key][chap_num]
+
+    def release_chapter(self, version_id: str, book: BibleBook, chap_num: int):
+        '''Discards the data for a chapter of a version fetched by get_chapter(), once nothing else needs it.'''
+        key = (version_id, book)
+        with self._lock:
+            book_lock = self._book_locks.get(key)
+        if book_lock is None:
+            return
+        with book_lock:
+            self._book_chapters.get(key, {}).pop(chap_num, None)
+
+    def release_version(self, version_id: str):
+        '''Discards the data for all the chapters of a version fetched by get_chapter().'''
+        with self._lock:
+            keys = [key for key in self._book_locks if key[0] == version_id]
+        for key in keys:
+            with self._book_locks[key]:
+                self._book_chapters.pop(key, None)
+
+
+class GetBibleDotNetAppConfig(SourceAppConfig):
+    def __init__(self, bible_source):
+        super().__init__(bible_source)
+        self.use_chapter_cache = True           # True if downloaded chapters should be cached between runs
+        self.chapter_cache_max_mb = 200         # Maximum size of the chapter cache in megabytes
+        self.chapter_cache_ttl_days = 30        # Number of days before a cached chapter is downloaded again
+        self.offline_mode = False               # If True, only cached chapters are used, and nothing is downloaded
+        self.http_pool_size = http.DEFAULT_POOL_SIZE            # Max connections kept alive to the server
+        self.http_max_retries = http.DEFAULT_MAX_RETRIES        # Max times a failed request is retried
+        self.http_backoff_factor = http.DEFAULT_BACKOFF_FACTOR  # Base delay in seconds for exponential backoff
+        self.max_concurrent_downloads = DEFAULT_MAX_CONCURRENT_DOWNLOADS # Max chapters downloaded at once
+        self.use_rate_limiter = True            # If True, adapt request rate and concurrency to the server's responses
+        self.http_max_requests_per_sec = http.DEFAULT_MAX_REQUESTS_PER_SEC  # Max rate of requests to the server
+
+    def new_config_widget(self):
+        from multiscript.sources.getbible_dot_net_app_config_panel import GetBibleDotNetAppConfigPanel
+        return GetBibleDotNetAppConfigPanel(None)
+
+
+class ChapterNotCachedError(MultiscriptException):
+    def __init__(self, version_id, book_code, chap_num):
+        super().__init__(f"Chapter {chap_num} of book {book_code} of version {version_id} is not available " +
+                         "offline, as it is not in the chapter cache.")
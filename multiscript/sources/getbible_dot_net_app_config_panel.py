@@ -0,0 +1,60 @@
+from PySide6.QtCore import Qt
+
+from multiscript.qt_custom.widgets import ConfigWidget
+from multiscript.sources.getbible_dot_net_app_config_panel_generated import Ui_GetBibleDotNetAppConfigPanel
+
+
+class GetBibleDotNetAppConfigPanel(ConfigWidget, Ui_GetBibleDotNetAppConfigPanel):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.bible_source = None
+        self.setupUi()
+
+    def setupUi(self):
+        super().setupUi(self)
+        self.useChapterCacheCheckBox.stateChanged.connect(self.on_use_chapter_cache_checkbox_state_changed)
+        self.useRateLimiterCheckBox.stateChanged.connect(self.on_use_rate_limiter_checkbox_state_changed)
+        self.clearCacheButton.clicked.connect(self.on_clear_cache_button_clicked)
+        self.on_use_chapter_cache_checkbox_state_changed(self.useChapterCacheCheckBox.checkState().value)
+
+    def load_config(self, config):
+        '''Load the contents of config into this widget.
+        '''
+        self.bible_source = config.bible_source
+        self.useChapterCacheCheckBox.setChecked(config.use_chapter_cache)
+        self.cacheMaxSizeSpinBox.setValue(config.chapter_cache_max_mb)
+        self.cacheTtlSpinBox.setValue(config.chapter_cache_ttl_days)
+        self.offlineModeCheckBox.setChecked(config.offline_mode)
+        self.httpPoolSizeSpinBox.setValue(config.http_pool_size)
+        self.maxConcurrentDownloadsSpinBox.setValue(config.max_concurrent_downloads)
+        self.httpMaxRetriesSpinBox.setValue(config.http_max_retries)
+        self.useRateLimiterCheckBox.setChecked(config.use_rate_limiter)
+        self.maxRequestsPerSecSpinBox.setValue(int(config.http_max_requests_per_sec))
+        self.on_use_rate_limiter_checkbox_state_changed(self.useRateLimiterCheckBox.checkState().value)
+
+    def save_config(self, config):
+        '''Save the contents of this widget into config.
+        '''
+        config.use_chapter_cache = self.useChapterCacheCheckBox.isChecked()
+        config.chapter_cache_max_mb = self.cacheMaxSizeSpinBox.value()
+        config.chapter_cache_ttl_days = self.cacheTtlSpinBox.value()
+        config.offline_mode = self.offlineModeCheckBox.isChecked()
+        config.http_pool_size = self.httpPoolSizeSpinBox.value()
+        config.max_concurrent_downloads = self.maxConcurrentDownloadsSpinBox.value()
+        config.http_max_retries = self.httpMaxRetriesSpinBox.value()
+        config.use_rate_limiter = self.useRateLimiterCheckBox.isChecked()
+        config.http_max_requests_per_sec = float(self.maxRequestsPerSecSpinBox.value())
+
+    def on_use_chapter_cache_checkbox_state_changed(self, state):
+        is_checked = (state == Qt.CheckState.Checked.value)
+        self.cacheMaxSizeSpinBox.setEnabled(is_checked)
+        self.cacheTtlSpinBox.setEnabled(is_checked)
+        self.offlineModeCheckBox.setEnabled(is_checked)
+
+    def on_use_rate_limiter_checkbox_state_changed(self, state):
+        self.maxRequestsPerSecSpinBox.setEnabled(state == Qt.CheckState.Checked.value)
+
+    def on_clear_cache_button_clicked(self, checked):
+        if self.bible_source is not None:
+            self.bible_source.clear_chapter_cache()
+            self.clearCacheButton.setEnabled(False)
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'getbible_dot_net_app_config_panel.ui'
+##
+## Created by: Qt User Interface Compiler version 6.6.3
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (QCoreApplication, QDate, QDateTime, QLocale,
+    QMetaObject, QObject, QPoint, QRect,
+    QSize, QTime, QUrl, Qt)
+from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
+    QFont, QFontDatabase, QGradient, QIcon,
+    QImage, QKeySequence, QLinearGradient, QPainter,
+    QPalette, QPixmap, QRadialGradient, QTransform)
+from PySide6.QtWidgets import (QApplication, QCheckBox, QFormLayout, QHBoxLayout,
+    QLabel, QPushButton, QSizePolicy, QSpacerItem,
+    QSpinBox, QVBoxLayout, QWidget)
+
+class Ui_GetBibleDotNetAppConfigPanel(object):
+    def setupUi(self, GetBibleDotNetAppConfigPanel):
+        if not GetBibleDotNetAppConfigPanel.objectName():
+            GetBibleDotNetAppConfigPanel.setObjectName(u"GetBibleDotNetAppConfigPanel")
+        GetBibleDotNetAppConfigPanel.resize(370, 325)
+        self.verticalLayout = QVBoxLayout(GetBibleDotNetAppConfigPanel)
+        self.verticalLayout.setObjectName(u"verticalLayout")
+        self.useChapterCacheCheckBox = QCheckBox(GetBibleDotNetAppConfigPanel)
+        self.useChapterCacheCheckBox.setObjectName(u"useChapterCacheCheckBox")
+
+        self.verticalLayout.addWidget(self.useChapterCacheCheckBox)
+
+        self.formLayout = QFormLayout()
+        self.formLayout.setObjectName(u"formLayout")
+        self.cacheMaxSizeLabel = QLabel(GetBibleDotNetAppConfigPanel)
+        self.cacheMaxSizeLabel.setObjectName(u"cacheMaxSizeLabel")
+
+        self.formLayout.setWidget(0, QFormLayout.LabelRole, self.cacheMaxSizeLabel)
+
+        self.cacheMaxSizeSpinBox = QSpinBox(GetBibleDotNetAppConfigPanel)
+        self.cacheMaxSizeSpinBox.setObjectName(u"cacheMaxSizeSpinBox")
+        self.cacheMaxSizeSpinBox.setMinimum(1)
+        self.cacheMaxSizeSpinBox.setMaximum(100000)
+
+        self.formLayout.setWidget(0, QFormLayout.FieldRole, self.cacheMaxSizeSpinBox)
+
+        self.cacheTtlLabel = QLabel(GetBibleDotNetAppConfigPanel)
+        self.cacheTtlLabel.setObjectName(u"cacheTtlLabel")
+
+        self.formLayout.setWidget(1, QFormLayout.LabelRole, self.cacheTtlLabel)
+
+        self.cacheTtlSpinBox = QSpinBox(GetBibleDotNetAppConfigPanel)
+        self.cacheTtlSpinBox.setObjectName(u"cacheTtlSpinBox")
+        self.cacheTtlSpinBox.setMinimum(1)
+        self.cacheTtlSpinBox.setMaximum(3650)
+
+        self.formLayout.setWidget(1, QFormLayout.FieldRole, self.cacheTtlSpinBox)
+
+
+        self.verticalLayout.addLayout(self.formLayout)
+
+        self.offlineModeCheckBox = QCheckBox(GetBibleDotNetAppConfigPanel)
+        self.offlineModeCheckBox.setObjectName(u"offlineModeCheckBox")
+
+        self.verticalLayout.addWidget(self.offlineModeCheckBox)
+
+        self.useRateLimiterCheckBox = QCheckBox(GetBibleDotNetAppConfigPanel)
+        self.useRateLimiterCheckBox.setObjectName(u"useRateLimiterCheckBox")
+
+        self.verticalLayout.addWidget(self.useRateLimiterCheckBox)
+
+        self.httpFormLayout = QFormLayout()
+        self.httpFormLayout.setObjectName(u"httpFormLayout")
+        self.httpPoolSizeLabel = QLabel(GetBibleDotNetAppConfigPanel)
+        self.httpPoolSizeLabel.setObjectName(u"httpPoolSizeLabel")
+
+        self.httpFormLayout.setWidget(0, QFormLayout.LabelRole, self.httpPoolSizeLabel)
+
+        self.httpPoolSizeSpinBox = QSpinBox(GetBibleDotNetAppConfigPanel)
+        self.httpPoolSizeSpinBox.setObjectName(u"httpPoolSizeSpinBox")
+        self.httpPoolSizeSpinBox.setMinimum(1)
+        self.httpPoolSizeSpinBox.setMaximum(100)
+
+        self.httpFormLayout.setWidget(0, QFormLayout.FieldRole, self.httpPoolSizeSpinBox)
+
+        self.maxConcurrentDownloadsLabel = QLabel(GetBibleDotNetAppConfigPanel)
+        self.maxConcurrentDownloadsLabel.setObjectName(u"maxConcurrentDownloadsLabel")
+
+        self.httpFormLayout.setWidget(1, QFormLayout.LabelRole, self.maxConcurrentDownloadsLabel)
+
+        self.maxConcurrentDownloadsSpinBox = QSpinBox(GetBibleDotNetAppConfigPanel)
+        self.maxConcurrentDownloadsSpinBox.setObjectName(u"maxConcurrentDownloadsSpinBox")
+        self.maxConcurrentDownloadsSpinBox.setMinimum(1)
+        self.maxConcurrentDownloadsSpinBox.setMaximum(100)
+
+        self.httpFormLayout.setWidget(1, QFormLayout.FieldRole, self.maxConcurrentDownloadsSpinBox)
+
+        self.httpMaxRetriesLabel = QLabel(GetBibleDotNetAppConfigPanel)
+        self.httpMaxRetriesLabel.setObjectName(u"httpMaxRetriesLabel")
+
+        self.httpFormLayout.setWidget(2, QFormLayout.LabelRole, self.httpMaxRetriesLabel)
+
+        self.httpMaxRetriesSpinBox = QSpinBox(GetBibleDotNetAppConfigPanel)
+        self.httpMaxRetriesSpinBox.setObjectName(u"httpMaxRetriesSpinBox")
+        self.httpMaxRetriesSpinBox.setMinimum(0)
+        self.httpMaxRetriesSpinBox.setMaximum(20)
+
+        self.httpFormLayout.setWidget(2, QFormLayout.FieldRole, self.httpMaxRetriesSpinBox)
+
+        self.maxRequestsPerSecLabel = QLabel(GetBibleDotNetAppConfigPanel)
+        self.maxRequestsPerSecLabel.setObjectName(u"maxRequestsPerSecLabel")
+
+        self.httpFormLayout.setWidget(3, QFormLayout.LabelRole, self.maxRequestsPerSecLabel)
+
+        self.maxRequestsPerSecSpinBox = QSpinBox(GetBibleDotNetAppConfigPanel)
+        self.maxRequestsPerSecSpinBox.setObjectName(u"maxRequestsPerSecSpinBox")
+        self.maxRequestsPerSecSpinBox.setMinimum(1)
+        self.maxRequestsPerSecSpinBox.setMaximum(1000)
+
+        self.httpFormLayout.setWidget(3, QFormLayout.FieldRole, self.maxRequestsPerSecSpinBox)
+
+
+        self.verticalLayout.addLayout(self.httpFormLayout)
+
+        self.clearCacheLayout = QHBoxLayout()
+        self.clearCacheLayout.setObjectName(u"clearCacheLayout")
+        self.clearCacheButton = QPushButton(GetBibleDotNetAppConfigPanel)
+        self.clearCacheButton.setObjectName(u"clearCacheButton")
+
+        self.clearCacheLayout.addWidget(self.clearCacheButton)
+
+        self.clearCacheSpacer = QSpacerItem(40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
+
+        self.clearCacheLayout.addItem(self.clearCacheSpacer)
+
+
+        self.verticalLayout.addLayout(self.clearCacheLayout)
+
+        self.verticalSpacer = QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
+
+        self.verticalLayout.addItem(self.verticalSpacer)
+
+
+        self.retranslateUi(GetBibleDotNetAppConfigPanel)
+
+        QMetaObject.connectSlotsByName(GetBibleDotNetAppConfigPanel)
+    # setupUi
+
+    def retranslateUi(self, GetBibleDotNetAppConfigPanel):
+        GetBibleDotNetAppConfigPanel.setWindowTitle(QCoreApplication.translate("GetBibleDotNetAppConfigPanel", u"Form", None))
+        self.useChapterCacheCheckBox.setText(QCoreApplication.translate("GetBibleDotNetAppConfigPanel", u"Keep a cache of downloaded chapters", None))
+        self.cacheMaxSizeLabel.setText(QCoreApplication.translate("GetBibleDotNetAppConfigPanel", u"Maximum cache size:", None))
+        self.cacheMaxSizeSpinBox.setSuffix(QCoreApplication.translate("GetBibleDotNetAppConfigPanel", u" MB", None))
+        self.cacheTtlLabel.setText(QCoreApplication.translate("GetBibleDotNetAppConfigPanel", u"Download chapters again after:", None))
+        self.cacheTtlSpinBox.setSuffix(QCoreApplication.translate("GetBibleDotNetAppConfigPanel", u" days", None))
+#if QT_CONFIG(tooltip)
+        self.offlineModeCheckBox.setToolTip(QCoreApplication.translate("GetBibleDotNetAppConfigPanel", u"Only use cached chapters, and never connect to GetBible.net when running a plan.", None))
+#endif // QT_CONFIG(tooltip)
+        self.offlineModeCheckBox.setText(QCoreApplication.translate("GetBibleDotNetAppConfigPanel", u"Offline mode (use cached chapters only)", None))
+#if QT_CONFIG(tooltip)
+        self.useRateLimiterCheckBox.setToolTip(QCoreApplication.translate("GetBibleDotNetAppConfigPanel", u"Automatically slow down downloads when GetBible.net is busy or asks for fewer requests.", None))
+#endif // QT_CONFIG(tooltip)
+        self.useRateLimiterCheckBox.setText(QCoreApplication.translate("GetBibleDotNetAppConfigPanel", u"Adapt download speed to the server", None))
+        self.httpPoolSizeLabel.setText(QCoreApplication.translate("GetBibleDotNetAppConfigPanel", u"Connections kept open:", None))
+        self.maxConcurrentDownloadsLabel.setText(QCoreApplication.translate("GetBibleDotNetAppConfigPanel", u"Simultaneous downloads:", None))
+        self.httpMaxRetriesLabel.setText(QCoreApplication.translate("GetBibleDotNetAppConfigPanel", u"Retries for failed downloads:", None))
+        self.maxRequestsPerSecLabel.setText(QCoreApplication.translate("GetBibleDotNetAppConfigPanel", u"Maximum requests per second:", None))
+        self.clearCacheButton.setText(QCoreApplication.translate("GetBibleDotNetAppConfigPanel", u"Clear Cache", None))
+    # retranslateUi
+
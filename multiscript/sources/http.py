@@ -0,0 +1,232 @@
+import email.utils
+import threading
+import time
+import urllib.parse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_POOL_SIZE       = 10
+DEFAULT_MAX_RETRIES     = 3
+DEFAULT_BACKOFF_FACTOR  = 0.5
+DEFAULT_TIMEOUT         = 15    # Seconds
+
+# Response status codes for which a request is retried
+RETRY_STATUS_CODES      = (429, 500, 502, 503, 504)
+
+
+def new_http_session(pool_size: int = DEFAULT_POOL_SIZE, max_retries: int = DEFAULT_MAX_RETRIES,
+                     backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+                     rate_limiter: 'AdaptiveRateLimiter' = None) -> requests.Session:
+    '''Returns a new requests.Session for BibleSources to use for their HTTP requests.
+
+    The session keeps up to pool_size connections alive per host, so that requests during a plan run
+    reuse existing connections rather than repeating the TCP and TLS handshakes for every request.
+
+    Failed connections, and responses with a status in RETRY_STATUS_CODES, are retried up to
+    max_retries times, with an exponential backoff of backoff_factor * (2 ** (retry_number - 1)) seconds
+    between attempts. If the server sends a Retry-After header, it is honoured instead.
+
+    If rate_limiter is supplied, every request is passed through it (see AdaptiveRateLimiter).
+
+    The session should be closed when no longer needed (it can be used as a context manager).
+    '''
+    retry = Retry(total=max_retries,
+                  backoff_factor=backoff_factor,
+                  status_forcelist=RETRY_STATUS_CODES,
+                  allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+                  respect_retry_after_header=True,
+                  raise_on_status=False)  # After the final retry, return the response rather than raising
+    if rate_limiter is not None:
+        adapter = RateLimitedHTTPAdapter(rate_limiter, pool_maxsize=pool_size, max_retries=retry)
+    else:
+        adapter = HTTPAdapter(pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+DEFAULT_MAX_REQUESTS_PER_SEC    = 20.0
+DEFAULT_INITIAL_CONCURRENCY     = 4
+
+# Response status codes that indicate the server wants us to slow down
+THROTTLE_STATUS_CODES   = (429, 503)
+
+
+class AdaptiveRateLimiter:
+    '''Limits the rate and concurrency of HTTP requests to each host, adapting to how the host responds.
+
+    For each host, a token bucket limits requests to at most max_requests_per_sec (with bursts of up to
+    burst requests), and a concurrency limit caps the number of requests in flight. The concurrency limit is
+    adjusted using additive-increase/multiplicative-decrease (AIMD): each successful response raises the limit
+    by 1/limit (i.e. by about one per round of requests), while a throttling response (429 or 503), a server
+    error, or a request that fails without a response (e.g. a timeout) halves it. Slow responses alone don't
+    lower the limit, as some requests (e.g. for whole books) are expected to take a while. If the host sends a
+    Retry-After header, no new requests are started to that host until it has passed.
+
+    A limiter is used by mounting a RateLimitedHTTPAdapter that refers to it (see new_http_session()).
+    Instances may be safely shared between threads and sessions.
+    '''
+    def __init__(self, max_requests_per_sec: float = DEFAULT_MAX_REQUESTS_PER_SEC, burst: int = None,
+                 initial_concurrency: int = DEFAULT_INITIAL_CONCURRENCY, max_concurrency: int = DEFAULT_POOL_SIZE):
+        self.max_requests_per_sec = max_requests_per_sec
+        self.burst = burst if burst is not None else max(1, int(max_requests_per_sec))
+        self.initial_concurrency = min(initial_concurrency, max_concurrency)
+        self.max_concurrency = max_concurrency
+        self._condition = threading.Condition()
+        self._hosts: dict[str, _HostLimit] = {}     # Access controlled by self._condition
+
+    def acquire(self, host: str):
+        '''Waits until a request to host is allowed to start, then counts it as in flight. Every call must be
+        followed by a call to release().
+        '''
+        with self._condition:
+            host_limit = self._host_limit(host)
+            waited = False
+            while True:
+                now = time.monotonic()
+                host_limit.refill_tokens(now, self.max_requests_per_sec, self.burst)
+                wait_time = max(host_limit.paused_until - now, 0)
+                if wait_time == 0 and host_limit.tokens < 1:
+                    wait_time = (1 - host_limit.tokens) / self.max_requests_per_sec
+                if wait_time == 0 and host_limit.in_flight >= int(host_limit.concurrency):
+                    wait_time = None    # Wait for a release()
+                if wait_time == 0:
+                    break
+                waited = True
+                self._condition.wait(wait_time)
+            host_limit.tokens -= 1
+            host_limit.in_flight += 1
+            host_limit.counters['requests'] += 1
+            if waited:
+                host_limit.counters['delayed'] += 1
+
+    def release(self, host: str, status_codes: list[int], latency: float, retry_after: float = None,
+                error_count: int = 0):
+        '''Records the outcome of a request to host started with acquire(), and adjusts the host's limits.
+
+        status_codes are the status codes of every response received for the request, including any
+        retried ones (an empty list if no response was received). latency is the time in seconds the
+        request took, and retry_after is the delay in seconds requested by any Retry-After header.
+        error_count is the number of attempts at the request that failed without a response (e.g. because
+        they timed out or the connection failed).
+        '''
+        with self._condition:
+            host_limit = self._host_limit(host)
+            host_limit.in_flight -= 1
+            host_limit.counters['latency_total'] += latency
+            num_throttled = sum(1 for status_code in status_codes if status_code in THROTTLE_STATUS_CODES)
+            host_limit.counters['throttled'] += num_throttled
+            num_failed = error_count + sum(1 for status_code in status_codes if status_code >= 500)
+            if num_throttled > 0 or num_failed > 0:
+                host_limit.concurrency = max(1.0, host_limit.concurrency / 2)
+            elif len(status_codes) > 0:
+                host_limit.concurrency = min(float(self.max_concurrency),
+                                             host_limit.concurrency + 1 / host_limit.concurrency)
+            if retry_after is not None and retry_after > 0:
+                host_limit.paused_until = max(host_limit.paused_until, time.monotonic() + retry_after)
+                host_limit.counters['retry_after_pauses'] += 1
+            host_limit.counters['min_concurrency'] = min(host_limit.counters['min_concurrency'],
+                                                         int(host_limit.concurrency))
+            self._condition.notify_all()
+
+    def counters(self) -> dict[str, dict]:
+        '''Returns a dictionary of the counters for each host since the last reset_counters(). Each host's
+        counters are in a dictionary with the keys requests, delayed, throttled, retry_after_pauses,
+        mean_latency, concurrency and min_concurrency.
+        '''
+        with self._condition:
+            all_counters = {}
+            for host, host_limit in self._hosts.items():
+                counters = dict(host_limit.counters)
+                latency_total = counters.pop('latency_total')
+                counters['mean_latency'] = latency_total / counters['requests'] if counters['requests'] > 0 else 0
+                counters['concurrency'] = int(host_limit.concurrency)
+                all_counters[host] = counters
+            return all_counters
+
+    def counters_summary(self) -> str:
+        '''Returns a one-line description of the counters for each host, suitable for logging.'''
+        return "; ".join(f"{host}: {counters['requests']} requests, {counters['delayed']} delayed, " +
+                         f"{counters['throttled']} throttled, {counters['retry_after_pauses']} Retry-After " +
+                         f"pauses, mean latency {counters['mean_latency']:.3f}s, concurrency " +
+                         f"{counters['concurrency']} (min {counters['min_concurrency']})"
+                         for host, counters in self.counters().items())
+
+    def reset_counters(self):
+        with self._condition:
+            for host_limit in self._hosts.values():
+                host_limit.reset_counters()
+
+    def _host_limit(self, host: str) -> '_HostLimit':
+        '''Returns the limit state for host. Must be called with self._condition held.'''
+        if host not in self._hosts:
+            self._hosts[host] = _HostLimit(self.initial_concurrency, self.burst)
+        return self._hosts[host]
+
+
+class _HostLimit:
+    '''The state of an AdaptiveRateLimiter for a single host.'''
+    def __init__(self, concurrency: int, tokens: int):
+        self.concurrency: float = float(concurrency)
+        self.in_flight: int = 0
+        self.tokens: float = float(tokens)
+        self.tokens_updated: float = time.monotonic()
+        self.paused_until: float = 0
+        self.counters: dict = {}
+        self.reset_counters()
+
+    def refill_tokens(self, now: float, rate: float, burst: int):
+        self.tokens = min(float(burst), self.tokens + (now - self.tokens_updated) * rate)
+        self.tokens_updated = now
+
+    def reset_counters(self):
+        self.counters = {'requests': 0, 'delayed': 0, 'throttled': 0, 'retry_after_pauses': 0,
+                         'latency_total': 0.0, 'min_concurrency': int(self.concurrency)}
+
+
+class RateLimitedHTTPAdapter(HTTPAdapter):
+    '''An HTTPAdapter that passes every request through an AdaptiveRateLimiter. The limiter observes every
+    response received, including those that were retried.
+    '''
+    def __init__(self, rate_limiter: AdaptiveRateLimiter, **kwargs):
+        self.rate_limiter = rate_limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        host = urllib.parse.urlsplit(request.url).netloc
+        self.rate_limiter.acquire(host)
+        start_time = time.monotonic()
+        status_codes = []
+        retry_after = None
+        error_count = 1     # Until a response is received
+        try:
+            response = super().send(request, **kwargs)
+            error_count = 0
+            retries = getattr(response.raw, 'retries', None)
+            if retries is not None:
+                status_codes.extend(entry.status for entry in retries.history if entry.status is not None)
+                error_count = sum(1 for entry in retries.history if entry.error is not None)
+            status_codes.append(response.status_code)
+            if response.status_code in THROTTLE_STATUS_CODES:
+                retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+            return response
+        finally:
+            self.rate_limiter.release(host, status_codes, time.monotonic() - start_time, retry_after, error_count)
+
+
+def _parse_retry_after(value: str) -> float:
+    '''Returns the delay in seconds given by a Retry-After header value, or None if there isn't one.'''
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,468 @@
+import json
+import logging
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Callable, Iterable, Iterator
+
+import requests
+
+from bibleref import BibleBook, BibleRange, BibleVerse
+
+import multiscript
+from multiscript.sources.base import BibleSource, SourceAppConfig, VersionProgressReporter
+from multiscript.sources import http
+from multiscript.sources.getbible_dot_net import API_BASE_URL, GetBibleDotNetVersion
+from multiscript.bible.verse_id import book_to_ids, range_to_ids, verse_from_id, verse_id, verse_to_id
+from multiscript.bible.version import BibleVersion
+from multiscript.plan.runner import PlanRunner
+from multiscript.util.exception import MultiscriptException
+
+
+_logger = logging.getLogger(__name__)
+
+STORE_FILENAME = "translations.sqlite3"
+
+_ALL_BOOKS = list(BibleBook)    # Indexed by BibleBook.order
+
+# BibleBooks by GetBible.net book code
+_BOOKS_BY_CODE = {book_code: book for book, book_code in GetBibleDotNetVersion.book_codes.items()}
+
+
+class TranslationStore:
+    '''A compact local store of complete Bible translations, kept in a single SQLite database file.
+
+    Each verse is keyed by (version id, verse id), where the verse id is an integer that sorts in canonical
+    order (see multiscript.bible.verse_id). Looking up a verse is a single primary key lookup, and loading a BibleRange is a
+    single scan over a contiguous span of the key, so no network access is ever needed once a translation
+    has been imported. The database file can be copied to other machines (e.g. air-gapped ones) as is.
+
+    Instances may be safely shared between threads. If read_only is True, the database file must already exist,
+    and it is neither created nor changed.
+    '''
+    def __init__(self, path, read_only: bool = False):
+        self.path: Path = Path(path)
+        self._lock = threading.RLock()
+
+        if read_only:
+            self._connection = sqlite3.connect(self.path.absolute().as_uri() + "?mode=ro", uri=True,
+                                               check_same_thread=False)
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute('''CREATE TABLE IF NOT EXISTS translations (
+                                        version_id  TEXT NOT NULL PRIMARY KEY,
+                                        name        TEXT NOT NULL,
+                                        lang        TEXT NOT NULL,
+                                        abbrev      TEXT NOT NULL,
+                                        copyright   TEXT NOT NULL,
+                                        updated     REAL NOT NULL
+                                    )''')
+        self._connection.execute('''CREATE TABLE IF NOT EXISTS verses (
+                                        version_id  TEXT NOT NULL,
+                                        verse_id    INTEGER NOT NULL,
+                                        text        TEXT NOT NULL,
+                                        PRIMARY KEY (version_id, verse_id)
+                                    ) WITHOUT ROWID''')
+        self._connection.execute('''CREATE TABLE IF NOT EXISTS translation_checksums (
+                                        version_id  TEXT NOT NULL PRIMARY KEY,
+                                        checksum    TEXT NOT NULL
+                                    )''')
+        self._connection.execute('''CREATE TABLE IF NOT EXISTS book_checksums (
+                                        version_id  TEXT NOT NULL,
+                                        book        INTEGER NOT NULL,
+                                        checksum    TEXT NOT NULL,
+                                        PRIMARY KEY (version_id, book)
+                                    )''')
+        self._connection.execute('''CREATE TABLE IF NOT EXISTS sync_log (
+                                        time        REAL NOT NULL,
+                                        version_id  TEXT,
+                                        url         TEXT NOT NULL,
+                                        status      INTEGER,
+                                        size        INTEGER NOT NULL,
+                                        note        TEXT NOT NULL
+                                    )''')
+        self._connection.commit()
+
+    def put_translation(self, version_id: str, name: str, lang: str, abbrev: str, copyright: str):
+        '''Adds a translation to the store, or updates the details of an existing one. Its verses are added
+        separately, using put_book().
+        '''
+        with self._lock:
+            self._connection.execute('INSERT OR REPLACE INTO translations ' +
+                                     '(version_id, name, lang, abbrev, copyright, updated) VALUES (?, ?, ?, ?, ?, ?)',
+                                     (version_id, name, lang, abbrev, copyright, time.time()))
+            self._connection.commit()
+
+    def put_book(self, version_id: str, book: BibleBook, verses: Iterable[tuple[int, int, str]],
+                 checksum: str = None):
+        '''Stores all the verses of a book of a translation, replacing any verses of that book already stored.
+        verses is an iterable of (chapter number, verse number, text) tuples.
+
+        If checksum is supplied, it is recorded as the checksum of the book's source data.
+        '''
+        with self._lock:
+            self._connection.execute('DELETE FROM verses WHERE version_id = ? AND verse_id BETWEEN ? AND ?',
+                                     (version_id, *book_to_ids(book)))
+            self._connection.executemany('INSERT OR REPLACE INTO verses (version_id, verse_id, text) ' +
+                                         'VALUES (?, ?, ?)',
+                                         ((version_id, verse_id(book, chap_num, verse_num), text)
+                                          for chap_num, verse_num, text in verses))
+            self._connection.execute('UPDATE translations SET updated = ? WHERE version_id = ?',
+                                     (time.time(), version_id))
+            if checksum is not None:
+                self._connection.execute('INSERT OR REPLACE INTO book_checksums (version_id, book, checksum) ' +
+                                         'VALUES (?, ?, ?)', (version_id, book.order, checksum))
+            self._connection.commit()
+
+    def get_translation_checksum(self, version_id: str) -> str:
+        '''Returns the recorded checksum of a translation's source data, or None if none has been recorded.'''
+        with self._lock:
+            row = self._connection.execute('SELECT checksum FROM translation_checksums WHERE version_id = ?',
+                                           (version_id,)).fetchone()
+        return row[0] if row is not None else None
+
+    def set_translation_checksum(self, version_id: str, checksum: str):
+        with self._lock:
+            self._connection.execute('INSERT OR REPLACE INTO translation_checksums (version_id, checksum) ' +
+                                     'VALUES (?, ?)', (version_id, checksum))
+            self._connection.commit()
+
+    def get_book_checksums(self, version_id: str) -> dict[BibleBook, str]:
+        '''Returns a dictionary of the recorded checksums of the source data of each book of a translation.'''
+        with self._lock:
+            rows = self._connection.execute('SELECT book, checksum FROM book_checksums WHERE version_id = ?',
+                                            (version_id,)).fetchall()
+        return {_ALL_BOOKS[book_order]: checksum for book_order, checksum in rows}
+
+    def log_request(self, version_id: str, url: str, status: int, size: int, note: str = ""):
+        '''Records a request made while syncing the store in the sync log. status is the HTTP status code of
+        the response, or None if no response was received.
+        '''
+        with self._lock:
+            self._connection.execute('INSERT INTO sync_log (time, version_id, url, status, size, note) ' +
+                                     'VALUES (?, ?, ?, ?, ?, ?)', (time.time(), version_id, url, status, size, note))
+            self._connection.commit()
+
+    def sync_log(self, limit: int = 100) -> list[dict]:
+        '''Returns the most recent entries of the sync log, newest first, as dictionaries with the keys time,
+        version_id, url, status, size and note.
+        '''
+        with self._lock:
+            cursor = self._connection.execute('SELECT time, version_id, url, status, size, note FROM sync_log ' +
+                                              'ORDER BY time DESC, rowid DESC LIMIT ?', (limit,))
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor]
+
+    def remove_translation(self, version_id: str):
+        '''Removes a translation and all its verses from the store.'''
+        with self._lock:
+            self._connection.execute('DELETE FROM verses WHERE version_id = ?', (version_id,))
+            self._connection.execute('DELETE FROM translations WHERE version_id = ?', (version_id,))
+            self._connection.execute('DELETE FROM translation_checksums WHERE version_id = ?', (version_id,))
+            self._connection.execute('DELETE FROM book_checksums WHERE version_id = ?', (version_id,))
+            self._connection.commit()
+
+    def translations(self) -> list[dict]:
+        '''Returns a list of the details of every translation in the store, as dictionaries with the keys
+        version_id, name, lang, abbrev, copyright and updated.
+        '''
+        with self._lock:
+            cursor = self._connection.execute('SELECT version_id, name, lang, abbrev, copyright, updated ' +
+                                              'FROM translations ORDER BY version_id')
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor]
+
+    def get_verse(self, version_id: str, verse: BibleVerse) -> str:
+        '''Returns the text of a single verse, or None if it isn't stored.'''
+        with self._lock:
+            row = self._connection.execute('SELECT text FROM verses WHERE version_id = ? AND verse_id = ?',
+                                           (version_id, verse_to_id(verse)))
+            row = row.fetchone()
+        return row[0] if row is not None else None
+
+    def get_verses(self, version_id: str, bible_range: BibleRange) -> list[tuple[BibleVerse, str]]:
+        '''Returns a list of (BibleVerse, text) tuples for all the stored verses of a translation in
+        bible_range, in canonical order.
+        '''
+        with self._lock:
+            rows = self._connection.execute('SELECT verse_id, text FROM verses ' +
+                                            'WHERE version_id = ? AND verse_id BETWEEN ? AND ? ORDER BY verse_id',
+                                            (version_id, *range_to_ids(bible_range))).fetchall()
+        return [(verse_from_id(id), text) for id, text in rows]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class LocalStoreSource(BibleSource):
+    '''A BibleSource that serves translations previously imported into a local TranslationStore, without
+    any network access during plan runs.
+    '''
+    def __init__(self, plugin):
+        super().__init__(plugin)
+        self.id = "local-store"
+        self.name = "Local Store"
+        self.allow_manual_versions = False
+        self.max_concurrent_loads = 8
+        self.api_base_url = API_BASE_URL    # Base URL of the GetBible.net v2 API used for imports and syncs
+        self._stores: dict[Path, TranslationStore] = {}    # Stores opened so far, by path
+        self._lock = threading.RLock()
+
+    def new_bible_version(self, version_id=None, name=None, lang=None, abbrev=None):
+        '''Overridden from BibleSource.
+
+        Constructs a new LocalStoreVersion for this BibleSource.
+        '''
+        return LocalStoreVersion(self, version_id, name, lang, abbrev)
+
+    def new_source_app_config(self):
+        '''Overridden from BibleSource.
+
+        Returns the LocalStoreAppConfig for this source.
+        '''
+        return LocalStoreAppConfig(self)
+
+    def get_all_versions(self, progress_reporter: VersionProgressReporter):
+        '''Overridden from BibleSource.
+
+        Return all of the BibleVersions in the local store.
+        '''
+        versions = []
+        for translation in self.stored_translations(self.app_config.store_path):
+            version = self.new_bible_version(translation['version_id'])
+            version.user_labels.name = translation['name']
+            version.user_labels.abbrev = translation['abbrev']
+            version.user_labels.lang = translation['lang']
+            version.copyright = translation['copyright']
+            versions.append(version)
+        return versions
+
+    @property
+    def store_path(self) -> Path:
+        '''The path of the store's database file, from the app config if set there.'''
+        return self.resolve_store_path(self.app_config.store_path)
+
+    def resolve_store_path(self, store_path) -> Path:
+        '''Returns store_path as a Path, or the default location of the store's database file if None.'''
+        if store_path is None:
+            store_path = multiscript.app().user_app_data_path / "Local Store" / STORE_FILENAME
+        return Path(store_path)
+
+    @property
+    def store(self) -> TranslationStore:
+        '''The TranslationStore at the path in the app config, which is opened when first needed.'''
+        return self.store_for_path(self.app_config.store_path)
+
+    def store_for_path(self, store_path) -> TranslationStore:
+        '''Returns the TranslationStore at store_path (or the default location if None), opening or creating it
+        if needed. The store is kept open for later calls.
+        '''
+        store_path = self.resolve_store_path(store_path)
+        with self._lock:
+            if store_path not in self._stores:
+                self._stores[store_path] = TranslationStore(store_path)
+            return self._stores[store_path]
+
+    def stored_translations(self, store_path) -> list[dict]:
+        '''Returns the details of every translation in the store at store_path (or the default location if None),
+        as returned by TranslationStore.translations(). The store is only read, and isn't created if it doesn't
+        exist yet.
+        '''
+        store_path = self.resolve_store_path(store_path)
+        with self._lock:
+            if store_path in self._stores:
+                return self._stores[store_path].translations()
+        if not store_path.exists():
+            return []
+        store = TranslationStore(store_path, read_only=True)
+        try:
+            return store.translations()
+        finally:
+            store.close()
+
+    def import_getbible_translation(self, version_id: str,
+                                    progress_callback: Callable[[int, int], None] = None,
+                                    store: TranslationStore = None):
+        '''Downloads a complete translation from GetBible.net into the store (or into store if supplied), one
+        book at a time. The checksums of the translation and its books are recorded, so later syncs only
+        download books that have changed.
+
+        If supplied, progress_callback is called after each book with the number of books done and the
+        total number of books.
+        '''
+        store = store if store is not None else self.store
+        with http.new_http_session() as http_session:
+            translations = self._sync_get(store, http_session, version_id,
+                                          f'{self.api_base_url}/translations.json').json()
+            if version_id not in translations:
+                raise TranslationNotFoundError(version_id)
+            vers_dict = translations[version_id]
+            store.put_translation(version_id, vers_dict['translation'], vers_dict['language'],
+                                  vers_dict['abbreviation'].upper(), vers_dict['distribution_license'])
+            self._sync_translation(store, http_session, version_id, vers_dict.get('sha'), progress_callback)
+
+    def sync_translations(self, progress_callback: Callable[[int, int], None] = None,
+                          store: TranslationStore = None) -> list[str]:
+        '''Brings every translation in the store (or in store if supplied) up to date with GetBible.net, by
+        comparing the stored checksums
+        against GetBible.net's checksum manifests. Only the books whose checksum has changed are downloaded.
+        Every request made is recorded in the store's sync log.
+
+        If supplied, progress_callback is called after each translation with the number of translations done
+        and the total number of translations.
+
+        Returns a list of the version ids of the translations that were updated. A translation that fails to sync
+        doesn't stop the others from syncing, but once they have, a TranslationSyncError is raised listing the
+        translations that failed.
+        '''
+        store = store if store is not None else self.store
+        updated_version_ids = []
+        failed_version_ids = []
+        with http.new_http_session() as http_session:
+            remote_checksums = self._sync_get(store, http_session, None, f'{self.api_base_url}/checksum.json').json()
+            translations = store.translations()
+            for trans_num, translation in enumerate(translations, start=1):
+                version_id = translation['version_id']
+                remote_checksum = remote_checksums.get(version_id)
+                if remote_checksum is None:
+                    store.log_request(version_id, f'{self.api_base_url}/checksum.json', None, 0,
+                                      "Translation not available from GetBible.net")
+                elif remote_checksum != store.get_translation_checksum(version_id):
+                    try:
+                        if self._sync_translation(store, http_session, version_id, remote_checksum) > 0:
+                            updated_version_ids.append(version_id)
+                    except Exception as exception:
+                        _logger.exception(exception)
+                        store.log_request(version_id, f'{self.api_base_url}/{version_id}/checksum.json', None, 0,
+                                          f"Sync failed: {exception}")
+                        failed_version_ids.append(version_id)
+                if progress_callback is not None:
+                    progress_callback(trans_num, len(translations))
+        if len(failed_version_ids) > 0:
+            raise TranslationSyncError(failed_version_ids, updated_version_ids)
+        return updated_version_ids
+
+    def _sync_translation(self, store: TranslationStore, http_session: requests.Session, version_id: str,
+                          remote_checksum: str, progress_callback: Callable[[int, int], None] = None) -> int:
+        '''Downloads the books of a translation whose checksums in GetBible.net's per-book checksum manifest
+        differ from those stored, then records the translation's checksum. Returns the number of books
+        downloaded.
+        '''
+        remote_book_checksums = self._sync_get(store, http_session, version_id,
+                                               f'{self.api_base_url}/{version_id}/checksum.json').json()
+        stored_book_checksums = store.get_book_checksums(version_id)
+        changed_books = [(_BOOKS_BY_CODE[book_code], checksum) for book_code, checksum in remote_book_checksums.items()
+                         if book_code in _BOOKS_BY_CODE and
+                            stored_book_checksums.get(_BOOKS_BY_CODE[book_code]) != checksum]
+        for book_num, (book, checksum) in enumerate(changed_books, start=1):
+            book_code = GetBibleDotNetVersion.book_codes[book]
+            response = self._sync_get(store, http_session, version_id,
+                                      f'{self.api_base_url}/{version_id}/{book_code}.json')
+            store.put_book(version_id, book, _getbible_book_verses(response.json()), checksum)
+            if progress_callback is not None:
+                progress_callback(book_num, len(changed_books))
+        if remote_checksum is not None:
+            store.set_translation_checksum(version_id, remote_checksum)
+        if len(changed_books) > 0:
+            self._discard_cached_content(version_id)
+        _logger.info(f"Synced {version_id} from GetBible.net: {len(changed_books)} book(s) downloaded.")
+        return len(changed_books)
+
+    def _sync_get(self, store: TranslationStore, http_session: requests.Session, version_id: str,
+                  url: str) -> requests.Response:
+        '''Performs a GET request while importing or syncing, and records it in store's sync log. Raises an
+        exception if the request fails.
+        '''
+        try:
+            response = http_session.get(url, timeout=http.DEFAULT_TIMEOUT)
+        except Exception as exception:
+            store.log_request(version_id, url, None, 0, str(exception))
+            raise
+        store.log_request(version_id, url, response.status_code, len(response.content),
+                               "" if response.ok else response.reason)
+        response.raise_for_status()
+        return response
+
+    def import_getbible_file(self, path, store: TranslationStore = None) -> str:
+        '''Imports a complete translation into the store (or into store if supplied) from a file in GetBible.net's
+        JSON translation format (as downloaded from https://api.getbible.net/v2/<translation>.json). Useful for
+        machines without network access.
+
+        Returns the version id of the imported translation, which is taken from the file name.
+        '''
+        store = store if store is not None else self.store
+        path = Path(path)
+        with open(path, encoding='utf-8') as file:
+            trans_dict = json.load(file)
+        version_id = path.stem
+        store.put_translation(version_id, trans_dict.get('translation', version_id),
+                              trans_dict.get('language', ""),
+                              trans_dict.get('abbreviation', version_id).upper(),
+                              trans_dict.get('distribution_license', ""))
+        for book_dict in trans_dict['books']:
+            store.put_book(version_id, _BOOKS_BY_CODE[str(book_dict['nr'])], _getbible_book_verses(book_dict))
+        self._discard_cached_content(version_id)
+        return version_id
+
+    def remove_translation(self, version_id: str, store: TranslationStore = None):
+        '''Removes a translation from the store (or from store if supplied).'''
+        store = store if store is not None else self.store
+        store.remove_translation(version_id)
+        self._discard_cached_content(version_id)
+
+    def _discard_cached_content(self, version_id: str):
+        '''Discards any content of a translation kept by earlier plan runs, as the translation has changed.'''
+        multiscript.app().bible_content_cache.discard_version(self.long_id + "/" + version_id)
+
+
+def _getbible_book_verses(book_dict) -> Iterator[tuple[int, int, str]]:
+    '''Yields (chapter number, verse number, text) tuples for the verses of a book in GetBible.net's JSON format.'''
+    for chap_dict in book_dict['chapters']:
+        chap_num = int(chap_dict['chapter'])
+        for verse_dict in chap_dict['verses']:
+            yield (chap_num, int(verse_dict['verse']), verse_dict['text'])
+
+
+class LocalStoreVersion(BibleVersion):
+    def __init__(self, source=None, id=None, name=None, lang=None, abbrev=None):
+        super().__init__(source, id, name, lang, abbrev)
+
+    def load_content(self, bible_range: BibleRange, bible_content, plan_runner: PlanRunner):
+        content_body = bible_content.body
+        content_body.strip_text = True
+        content_body.insert_missing_whitespace = True
+        content_body.insert_missing_chap_num = True
+
+        verses = self.bible_source.store.get_verses(self.id, bible_range)
+        if len(verses) == 0:
+            raise TranslationNotFoundError(self.id, bible_range)
+        content_body.add_verses((verse, str(verse.verse_num), text, None) for verse, text in verses)
+
+
+class LocalStoreAppConfig(SourceAppConfig):
+    def __init__(self, bible_source):
+        super().__init__(bible_source)
+        self.store_path: Path = None    # Path of the store's database file. None for the default location.
+
+    def new_config_widget(self):
+        from multiscript.sources.local_store_app_config_panel import LocalStoreAppConfigPanel
+        return LocalStoreAppConfigPanel(None)
+
+
+class TranslationNotFoundError(MultiscriptException):
+    def __init__(self, version_id, bible_range=None):
+        if bible_range is None:
+            super().__init__(f"The translation {version_id} could not be found.")
+        else:
+            super().__init__(f"{str(bible_range)} is not in the local store for the translation {version_id}.")
+
+
+class TranslationSyncError(MultiscriptException):
+    def __init__(self, failed_version_ids, updated_version_ids):
+        super().__init__("These translations could not be synced with GetBible.net: " +
+                         ", ".join(failed_version_ids))
+        self.failed_version_ids: list[str] = failed_version_ids
+        self.updated_version_ids: list[str] = updated_version_ids  # The translations that were updated regardless
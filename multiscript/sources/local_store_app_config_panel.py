@@ -0,0 +1,148 @@
+from pathlib import Path
+
+from PySide6 import QtWidgets
+from PySide6.QtCore import Qt
+
+from multiscript.qt_custom.concurrency import call_main_thread, call_nonblock
+from multiscript.qt_custom.widgets import ConfigWidget
+from multiscript.sources.local_store import TranslationSyncError
+from multiscript.sources.local_store_app_config_panel_generated import Ui_LocalStoreAppConfigPanel
+
+
+class LocalStoreAppConfigPanel(ConfigWidget, Ui_LocalStoreAppConfigPanel):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.bible_source = None
+        self.store_path = None
+        self.is_importing = False
+        self.setupUi()
+
+    def setupUi(self):
+        super().setupUi(self)
+        self.importGetBibleButton.clicked.connect(self.on_import_getbible_button_clicked)
+        self.importFileButton.clicked.connect(self.on_import_file_button_clicked)
+        self.removeButton.clicked.connect(self.on_remove_button_clicked)
+        self.syncButton.clicked.connect(self.on_sync_button_clicked)
+        self.storePathSelectButton.clicked.connect(self.on_store_path_select_button_clicked)
+        self.storePathDefaultButton.clicked.connect(self.on_store_path_default_button_clicked)
+
+    def load_config(self, config):
+        '''Load the contents of config into this widget.
+        '''
+        self.bible_source = config.bible_source
+        self.set_store_path(config.store_path)
+        self.refresh_translations()
+
+    def save_config(self, config):
+        '''Save the contents of this widget into config.
+        '''
+        config.store_path = self.store_path
+
+    def set_store_path(self, path):
+        self.store_path = Path(path) if path is not None else None
+        if self.store_path is not None:
+            self.storePathLabel.setText(str(self.store_path))
+        else:
+            self.storePathLabel.setText(self.tr("Default location"))
+
+    def selected_store(self):
+        '''Returns the TranslationStore at the path chosen in this panel, which may not be saved in the config yet.
+        The store is created if it doesn't exist.'''
+        return self.bible_source.store_for_path(self.store_path)
+
+    def refresh_translations(self):
+        self.translationsListWidget.clear()
+        for translation in self.bible_source.stored_translations(self.store_path):
+            item = QtWidgets.QListWidgetItem(f"{translation['abbrev']} - {translation['name']} " +
+                                             f"({translation['version_id']})")
+            item.setData(Qt.ItemDataRole.UserRole, translation['version_id'])
+            self.translationsListWidget.addItem(item)
+
+    def set_importing(self, is_importing):
+        self.is_importing = is_importing
+        self.importGetBibleButton.setEnabled(not is_importing)
+        self.importFileButton.setEnabled(not is_importing)
+        self.removeButton.setEnabled(not is_importing)
+        self.syncButton.setEnabled(not is_importing)
+
+    def on_import_getbible_button_clicked(self, checked=False):
+        version_ids_str, ok = QtWidgets.QInputDialog.getText(self, self.tr("Import from GetBible.net"),
+                                                             self.tr("GetBible.net translation ids " +
+                                                                     "(separated by commas, e.g. kjv, web):"))
+        version_ids = [version_id.strip() for version_id in version_ids_str.split(',') if version_id.strip() != ""]
+        if not ok or len(version_ids) == 0:
+            return
+        self.set_importing(True)
+        call_nonblock(self._import_getbible_translations, version_ids, self.selected_store(),
+                      callback=self.on_import_finished)
+
+    def _import_getbible_translations(self, version_ids, store):
+        '''Imports the translations from GetBible.net into store. Runs on a separate thread.'''
+        for version_id in version_ids:
+            def report_progress(num_done, num_total, version_id=version_id):
+                call_main_thread(self.statusLabel.setText,
+                                 f"Importing {version_id} ({num_done} of {num_total} books)...")
+            self.bible_source.import_getbible_translation(version_id, report_progress, store)
+
+    def on_import_file_button_clicked(self, checked=False):
+        path_str, selected_filter = QtWidgets.QFileDialog.getOpenFileName(self, self.tr("Select Translation File"),
+                                                                          "", self.tr("JSON Files (*.json)"))
+        if len(path_str) == 0:
+            return
+        self.set_importing(True)
+        self.statusLabel.setText(f"Importing {Path(path_str).name}...")
+        call_nonblock(self.bible_source.import_getbible_file, path_str, self.selected_store(),
+                      callback=self.on_import_finished)
+
+    def on_import_finished(self, future_result):
+        self.set_importing(False)
+        if future_result.error is not None:
+            self.statusLabel.setText(f"There was an error importing: {future_result.error}")
+        else:
+            self.statusLabel.setText(self.tr("Import complete."))
+        self.refresh_translations()
+
+    def on_remove_button_clicked(self, checked=False):
+        for item in self.translationsListWidget.selectedItems():
+            self.bible_source.remove_translation(item.data(Qt.ItemDataRole.UserRole), self.selected_store())
+        self.refresh_translations()
+
+    def on_sync_button_clicked(self, checked=False):
+        self.set_importing(True)
+        self.statusLabel.setText(self.tr("Syncing with GetBible.net..."))
+        call_nonblock(self._sync_translations, self.selected_store(), callback=self.on_sync_finished)
+
+    def _sync_translations(self, store):
+        '''Syncs the translations in store with GetBible.net. Runs on a separate thread.'''
+        def report_progress(num_done, num_total):
+            call_main_thread(self.statusLabel.setText,
+                             f"Syncing with GetBible.net ({num_done} of {num_total} translations)...")
+        return self.bible_source.sync_translations(report_progress, store)
+
+    def on_sync_finished(self, future_result):
+        self.set_importing(False)
+        if isinstance(future_result.error, TranslationSyncError) and \
+           len(future_result.error.updated_version_ids) > 0:
+            self.statusLabel.setText(f"Updated: {', '.join(future_result.error.updated_version_ids)}. " +
+                                     f"{future_result.error}")
+        elif future_result.error is not None:
+            self.statusLabel.setText(f"There was an error syncing: {future_result.error}")
+        elif len(future_result.value) == 0:
+            self.statusLabel.setText(self.tr("All translations are up to date."))
+        else:
+            self.statusLabel.setText(f"Updated: {', '.join(future_result.value)}")
+        self.refresh_translations()
+
+    def on_store_path_select_button_clicked(self, checked=False):
+        existing_path_str = str(self.store_path) if self.store_path is not None else ""
+        path_str, selected_filter = QtWidgets.QFileDialog.getSaveFileName(
+                                        self, self.tr("Select Store File"), existing_path_str,
+                                        self.tr("SQLite Databases (*.sqlite3)"),
+                                        options=QtWidgets.QFileDialog.Option.DontConfirmOverwrite)
+        if len(path_str) > 0:
+            self.set_store_path(path_str)
+            self.refresh_translations()
+
+    def on_store_path_default_button_clicked(self, checked=False):
+        self.set_store_path(None)
+        self.refresh_translations()
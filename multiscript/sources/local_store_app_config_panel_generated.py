@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'local_store_app_config_panel.ui'
+##
+## Created by: Qt User Interface Compiler version 6.6.3
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (QCoreApplication, QDate, QDateTime, QLocale,
+    QMetaObject, QObject, QPoint, QRect,
+    QSize, QTime, QUrl, Qt)
+from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
+    QFont, QFontDatabase, QGradient, QIcon,
+    QImage, QKeySequence, QLinearGradient, QPainter,
+    QPalette, QPixmap, QRadialGradient, QTransform)
+from PySide6.QtWidgets import (QAbstractItemView, QApplication, QFormLayout, QHBoxLayout,
+    QLabel, QListWidget, QListWidgetItem, QPushButton,
+    QSizePolicy, QSpacerItem, QVBoxLayout, QWidget)
+
+class Ui_LocalStoreAppConfigPanel(object):
+    def setupUi(self, LocalStoreAppConfigPanel):
+        if not LocalStoreAppConfigPanel.objectName():
+            LocalStoreAppConfigPanel.setObjectName(u"LocalStoreAppConfigPanel")
+        LocalStoreAppConfigPanel.resize(420, 320)
+        self.verticalLayout = QVBoxLayout(LocalStoreAppConfigPanel)
+        self.verticalLayout.setObjectName(u"verticalLayout")
+        self.translationsLabel = QLabel(LocalStoreAppConfigPanel)
+        self.translationsLabel.setObjectName(u"translationsLabel")
+
+        self.verticalLayout.addWidget(self.translationsLabel)
+
+        self.translationsListWidget = QListWidget(LocalStoreAppConfigPanel)
+        self.translationsListWidget.setObjectName(u"translationsListWidget")
+        self.translationsListWidget.setSelectionMode(QAbstractItemView.ExtendedSelection)
+
+        self.verticalLayout.addWidget(self.translationsListWidget)
+
+        self.translationButtonsLayout = QHBoxLayout()
+        self.translationButtonsLayout.setObjectName(u"translationButtonsLayout")
+        self.importGetBibleButton = QPushButton(LocalStoreAppConfigPanel)
+        self.importGetBibleButton.setObjectName(u"importGetBibleButton")
+
+        self.translationButtonsLayout.addWidget(self.importGetBibleButton)
+
+        self.importFileButton = QPushButton(LocalStoreAppConfigPanel)
+        self.importFileButton.setObjectName(u"importFileButton")
+
+        self.translationButtonsLayout.addWidget(self.importFileButton)
+
+        self.removeButton = QPushButton(LocalStoreAppConfigPanel)
+        self.removeButton.setObjectName(u"removeButton")
+
+        self.translationButtonsLayout.addWidget(self.removeButton)
+
+        self.syncButton = QPushButton(LocalStoreAppConfigPanel)
+        self.syncButton.setObjectName(u"syncButton")
+
+        self.translationButtonsLayout.addWidget(self.syncButton)
+
+        self.translationButtonsSpacer = QSpacerItem(40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
+
+        self.translationButtonsLayout.addItem(self.translationButtonsSpacer)
+
+
+        self.verticalLayout.addLayout(self.translationButtonsLayout)
+
+        self.statusLabel = QLabel(LocalStoreAppConfigPanel)
+        self.statusLabel.setObjectName(u"statusLabel")
+
+        self.verticalLayout.addWidget(self.statusLabel)
+
+        self.formLayout = QFormLayout()
+        self.formLayout.setObjectName(u"formLayout")
+        self.storePathTitleLabel = QLabel(LocalStoreAppConfigPanel)
+        self.storePathTitleLabel.setObjectName(u"storePathTitleLabel")
+
+        self.formLayout.setWidget(0, QFormLayout.LabelRole, self.storePathTitleLabel)
+
+        self.storePathLayout = QHBoxLayout()
+        self.storePathLayout.setObjectName(u"storePathLayout")
+        self.storePathLabel = QLabel(LocalStoreAppConfigPanel)
+        self.storePathLabel.setObjectName(u"storePathLabel")
+        sizePolicy = QSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Preferred)
+        sizePolicy.setHorizontalStretch(1)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.storePathLabel.sizePolicy().hasHeightForWidth())
+        self.storePathLabel.setSizePolicy(sizePolicy)
+
+        self.storePathLayout.addWidget(self.storePathLabel)
+
+        self.storePathSelectButton = QPushButton(LocalStoreAppConfigPanel)
+        self.storePathSelectButton.setObjectName(u"storePathSelectButton")
+
+        self.storePathLayout.addWidget(self.storePathSelectButton)
+
+        self.storePathDefaultButton = QPushButton(LocalStoreAppConfigPanel)
+        self.storePathDefaultButton.setObjectName(u"storePathDefaultButton")
+
+        self.storePathLayout.addWidget(self.storePathDefaultButton)
+
+
+        self.formLayout.setLayout(0, QFormLayout.FieldRole, self.storePathLayout)
+
+
+        self.verticalLayout.addLayout(self.formLayout)
+
+
+        self.retranslateUi(LocalStoreAppConfigPanel)
+
+        QMetaObject.connectSlotsByName(LocalStoreAppConfigPanel)
+    # setupUi
+
+    def retranslateUi(self, LocalStoreAppConfigPanel):
+        LocalStoreAppConfigPanel.setWindowTitle(QCoreApplication.translate("LocalStoreAppConfigPanel", u"Form", None))
+        self.translationsLabel.setText(QCoreApplication.translate("LocalStoreAppConfigPanel", u"Translations in the local store:", None))
+        self.importGetBibleButton.setText(QCoreApplication.translate("LocalStoreAppConfigPanel", u"Import from GetBible.net...", None))
+        self.importFileButton.setText(QCoreApplication.translate("LocalStoreAppConfigPanel", u"Import from File...", None))
+        self.removeButton.setText(QCoreApplication.translate("LocalStoreAppConfigPanel", u"Remove", None))
+#if QT_CONFIG(tooltip)
+        self.syncButton.setToolTip(QCoreApplication.translate("LocalStoreAppConfigPanel", u"Download any books that have changed on GetBible.net since they were imported.", None))
+#endif // QT_CONFIG(tooltip)
+        self.syncButton.setText(QCoreApplication.translate("LocalStoreAppConfigPanel", u"Sync Now", None))
+        self.statusLabel.setText("")
+        self.storePathTitleLabel.setText(QCoreApplication.translate("LocalStoreAppConfigPanel", u"Store file:", None))
+        self.storePathLabel.setText("")
+        self.storePathSelectButton.setText(QCoreApplication.translate("LocalStoreAppConfigPanel", u"Choose...", None))
+        self.storePathDefaultButton.setText(QCoreApplication.translate("LocalStoreAppConfigPanel", u"Default", None))
+    # retranslateUi
+
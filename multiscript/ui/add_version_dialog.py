@@ -157,6 +157,22 @@ class AddVersionDialog(QtWidgets.QDialog, Ui_AddVersionDialog, VersionProgressRe
         returned by get_all_versions()'''
         self.append_versions(bible_versions)
 
+    @main_thread
+    def replace_source_versions(self, bible_source, bible_versions: list[BibleVersion]):
+        '''Replace all the versions from bible_source previously added with add_versions() by bible_versions.'''
+        if not self.is_open:
+            return
+        # Remove each contiguous run of rows from bible_source, working backwards so row indexes stay valid.
+        row_index = self.versionModel.rowCount() - 1
+        while row_index >= 0:
+            end_row_index = row_index
+            while row_index >= 0 and self.versionModel.items[row_index].bible_source is bible_source:
+                row_index -= 1
+            if row_index < end_row_index:
+                self.versionModel.remove_items(end_row_index - row_index, row_index + 1)
+            row_index -= 1
+        self.append_versions(bible_versions)
+
     def is_cancelled(self):
         '''Returns true if the caller of get_all_versions() wants the operation to be cancelled.'''
         # If the form has been closed, consider the operation cancelled.
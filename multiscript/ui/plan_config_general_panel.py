@@ -22,6 +22,7 @@ class GeneralPlanConfigPanel(ConfigWidget, Ui_GeneralPlanConfigPanel):
         self.confirmAfterTemplateExpansionCheckBox.setChecked(config.confirm_after_template_expansion)
         self.createTemplateCopiesCheckBox.setChecked(config.create_template_copies)
         self.alwaysOverwriteOutputCheckBox.setChecked(config.always_overwrite_output)
+        self.pipelinedRunCheckBox.setChecked(config.pipelined_run)
 
     def save_config(self, config):
         '''Save the contents of this widget into config.
@@ -30,6 +31,7 @@ class GeneralPlanConfigPanel(ConfigWidget, Ui_GeneralPlanConfigPanel):
         config.confirm_after_template_expansion = self.confirmAfterTemplateExpansionCheckBox.isChecked()
         config.create_template_copies = self.createTemplateCopiesCheckBox.isChecked()
         config.always_overwrite_output = self.alwaysOverwriteOutputCheckBox.isChecked()
+        config.pipelined_run = self.pipelinedRunCheckBox.isChecked()
     
     def allowConfirmationsCheckbox_stateChanged(self, state):
         self.confirmAfterTemplateExpansionCheckBox.setEnabled(state == Qt.CheckState.Checked.value)
\ No newline at end of file
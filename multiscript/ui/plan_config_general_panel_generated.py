@@ -51,6 +51,11 @@ class Ui_GeneralPlanConfigPanel(object):
 
         self.verticalLayout.addWidget(self.alwaysOverwriteOutputCheckBox)
 
+        self.pipelinedRunCheckBox = QCheckBox(GeneralPlanConfigPanel)
+        self.pipelinedRunCheckBox.setObjectName(u"pipelinedRunCheckBox")
+
+        self.verticalLayout.addWidget(self.pipelinedRunCheckBox)
+
         self.verticalSpacer = QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
 
         self.verticalLayout.addItem(self.verticalSpacer)
@@ -67,5 +72,6 @@ class Ui_GeneralPlanConfigPanel(object):
         self.confirmAfterTemplateExpansionCheckBox.setText(QCoreApplication.translate("GeneralPlanConfigPanel", u"Pause for confirmation after base template expansion", None))
         self.createTemplateCopiesCheckBox.setText(QCoreApplication.translate("GeneralPlanConfigPanel", u"Create output copies of templates (without tags)", None))
         self.alwaysOverwriteOutputCheckBox.setText(QCoreApplication.translate("GeneralPlanConfigPanel", u"Always overwrite output files, even if they been edited", None))
+        self.pipelinedRunCheckBox.setText(QCoreApplication.translate("GeneralPlanConfigPanel", u"Start creating outputs while Bible content is still loading", None))
     # retranslateUi
 
@@ -50,6 +50,13 @@ def save(obj, path):
     with open(path, 'w', encoding='utf-8') as file:
         json.dump(serialize_obj, file, indent=4, ensure_ascii=False, default=_serializer_handler)
 
+def dumps(obj) -> str:
+    '''Returns obj serialized to a JSON string, in the same form as save() writes it (but without the app version
+    or indentation, and with sorted keys, so that equal settings always give the same string). References to
+    sources, outputs and the like are serialized as their ids, so the string is the same in every process.
+    '''
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False, default=_serializer_handler)
+
 def load(path, error_list=None, remove_sentinels=True):
     '''Load an object from a serialized file at the given path. Any errors that are non-failure (i.e.
     still allow loading to complete) are appended to the optional error_list.
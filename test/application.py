@@ -11,5 +11,8 @@ class MultiscriptAppTestCase(unittest.TestCase):
     '''Test cases that need to use TEST_APP should inherit from MultiscriptAppTestCase. This allows us to add
     any necessary setup or teardown code we may need later on.
     '''
-    pass
+    def setUp(self):
+        # Don't let content loaded (or templates parsed) by one test be reused by another
+        TEST_APP.bible_content_cache.clear()
+        TEST_APP.template_document_cache.clear()
 
@@ -0,0 +1,122 @@
+'''Benchmark for PlanRunner.load_bible_content() using the GetBible.net source against a local stand-in server.
+
+Run from the repository root, for example:
+
+    python -m test.benchmark_load_bible_content --versions 10 --chapters 50 --latency 0.05 --jitter 0.05
+
+The stand-in serves fixture data with the requested latency, jitter and error rate, so the results measure
+the source and runner, not the live service. The chapter cache is disabled unless --use-cache is given.
+'''
+import argparse
+import os
+import time
+
+# Allow the benchmark to run without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from bibleref import BibleBook
+
+from test.application import TEST_APP
+from test.getbible_stand_in import GetBibleStandInServer
+import multiscript.plan
+from multiscript.plan.monitor import PlanMonitor
+from multiscript.plan.runner import PlanRunner
+
+
+GETBIBLE_SOURCE_ID = 'multiscript-builtin/getbible.net'
+
+
+class BenchmarkMonitor(PlanMonitor):
+    '''PlanMonitor that counts error confirmations instead of asking a user.'''
+    def __init__(self):
+        super().__init__()
+        self.error_messages = []
+
+    def request_confirmation(self, message=None, path=None):
+        self.error_messages.append(message)
+
+
+def passages_for_chapters(num_chapters: int) -> str:
+    '''Returns a passage string covering the first num_chapters chapters of the Bible, book by book.'''
+    passages = []
+    for book in BibleBook:
+        if num_chapters <= 0:
+            break
+        book_chapters = min(num_chapters, book.max_chap_num())
+        passages.append(f"{book.abbrev} 1-{book_chapters}" if book_chapters > 1 else f"{book.abbrev} 1")
+        num_chapters -= book_chapters
+    return ", ".join(passages)
+
+
+def run_benchmark(num_versions: int, num_chapters: int, latency: float = 0, jitter: float = 0,
+                  error_rate: float = 0, use_cache: bool = False, seed: int = None) -> dict:
+    '''Loads num_chapters chapters for each of num_versions versions from the GetBible.net source, served
+    by a local stand-in server. Returns a dictionary of the measurements.
+    '''
+    version_ids = [f"v{index}" for index in range(num_versions)]
+    source = TEST_APP.source(GETBIBLE_SOURCE_ID)
+    app_config = source.app_config
+    orig_api_base_url = source.api_base_url
+    orig_use_chapter_cache = app_config.use_chapter_cache
+
+    with GetBibleStandInServer(version_ids, latency=latency, jitter=jitter, error_rate=error_rate,
+                               seed=seed) as server:
+        try:
+            source.api_base_url = server.api_base_url
+            app_config.use_chapter_cache = use_cache
+
+            plan = multiscript.plan.Plan()
+            plan.bible_passages = passages_for_chapters(num_chapters)
+            plan.bible_versions = [source.new_bible_version(version_id, abbrev=version_id.upper())
+                                   for version_id in version_ids]
+            plan.version_selection = [[True] * num_versions]
+
+            monitor = BenchmarkMonitor()
+            runner = PlanRunner(plan, monitor)
+            runner.content_cache = None     # Measure loading, not the content cache
+            runner.total_progress_steps = len(runner.bible_ranges) * len(runner.all_versions)
+
+            start_time = time.perf_counter()
+            runner.load_bible_content()
+            elapsed = time.perf_counter() - start_time
+        finally:
+            source.api_base_url = orig_api_base_url
+            app_config.use_chapter_cache = orig_use_chapter_cache
+
+    num_tokens = sum(len(content.body.tokens) for contents in runner.bible_contents.values()
+                     for content in contents)
+    return {'versions':         num_versions,
+            'chapters':         num_chapters,
+            'seconds':          elapsed,
+            'chapters_per_sec': num_versions * num_chapters / elapsed,
+            'tokens':           num_tokens,
+            'requests':         server.request_count,
+            'server_errors':    server.error_count,
+            'max_in_flight':    server.max_in_flight,
+            'load_errors':      len(monitor.error_messages)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PlanRunner.load_bible_content() against a local " +
+                                                 "GetBible.net stand-in server.")
+    parser.add_argument("--versions", type=int, default=5, help="number of versions to load")
+    parser.add_argument("--chapters", type=int, default=20, help="number of chapters to load for each version")
+    parser.add_argument("--latency", type=float, default=0.05, help="base server latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="maximum random extra latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0, help="fraction of requests that fail with 503")
+    parser.add_argument("--repeat", type=int, default=1, help="number of times to repeat the benchmark")
+    parser.add_argument("--use-cache", action="store_true", help="use the chapter cache")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for latency and errors")
+    args = parser.parse_args()
+
+    for repeat_index in range(args.repeat):
+        result = run_benchmark(args.versions, args.chapters, args.latency, args.jitter, args.error_rate,
+                               args.use_cache, args.seed)
+        print(f"Run {repeat_index + 1}: {result['versions']} versions x {result['chapters']} chapters in " +
+              f"{result['seconds']:.3f}s ({result['chapters_per_sec']:.1f} chapters/s), " +
+              f"{result['requests']} requests, {result['server_errors']} server errors, " +
+              f"max {result['max_in_flight']} in flight, {result['load_errors']} load errors")
+
+
+if __name__ == "__main__":
+    main()
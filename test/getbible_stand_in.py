@@ -0,0 +1,220 @@
+'''A local stand-in for the GetBible.net v2 API, for tests and benchmarks that shouldn't depend on the live
+service.
+
+The server generates deterministic fixture JSON for any translation id, in the same shape as the real API,
+and can simulate a slow or unreliable service with configurable latency, jitter and error rate. Books can be
+changed (see GetBibleStandInServer.change_book()), which changes their text and checksums.
+'''
+import hashlib
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import random
+import re
+import threading
+import time
+
+from bibleref import BibleBook
+
+
+DEFAULT_VERSION_IDS = ("kjv", "web", "asv")
+
+_ALL_BOOKS = list(BibleBook)    # Indexed by GetBible.net book number - 1
+
+
+class GetBibleStandInServer:
+    '''Serves fixture JSON for the GetBible.net v2 API on localhost, on a background thread.
+
+    Use as a context manager, or call start() and stop(). Point a source at the server by setting its
+    api_base_url to the server's api_base_url.
+
+    latency is the base delay in seconds before each response, jitter is the maximum random delay in seconds
+    added to it, and error_rate is the fraction of requests answered with a 503 error (with a Retry-After
+    header of retry_after seconds). Requests for any paths (relative to api_base_url) added to missing_paths
+    are answered with a 404 error.
+    '''
+    def __init__(self, version_ids=DEFAULT_VERSION_IDS, latency: float = 0, jitter: float = 0,
+                 error_rate: float = 0, retry_after: int = 0, seed: int = None):
+        self.version_ids = list(version_ids)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._http_server: ThreadingHTTPServer = None
+        self._thread: threading.Thread = None
+        self.request_count = 0          # Number of requests received
+        self.error_count = 0            # Number of simulated errors returned
+        self.max_in_flight = 0          # Largest number of requests being handled at once
+        self._in_flight = 0
+        self.book_revisions: dict[tuple[str, int], int] = {}   # Number of changes to each book, by version id and
+                                                                # book number
+        self.missing_paths: set[str] = set()
+
+    @property
+    def api_base_url(self) -> str:
+        host, port = self._http_server.server_address[:2]
+        return f"http://{host}:{port}/v2"
+
+    def start(self):
+        server = self
+        class Handler(_GetBibleStandInHandler):
+            stand_in = server
+        self._http_server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._http_server.daemon_threads = True
+        self._thread = threading.Thread(target=self._http_server.serve_forever, name="GetBible stand-in server",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._thread.join()
+            self._http_server = None
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def change_book(self, version_id: str, book_num: int):
+        '''Changes the text of a book, and so its checksum and its translation's checksum.'''
+        with self._lock:
+            self.book_revisions[(version_id, book_num)] = self.book_revisions.get((version_id, book_num), 0) + 1
+
+    def reset_counts(self):
+        with self._lock:
+            self.request_count = 0
+            self.error_count = 0
+            self.max_in_flight = 0
+
+    #
+    # Fixture data
+    #
+
+    def translations(self) -> dict:
+        return {version_id: {"translation":             f"{version_id.upper()} Stand-In Version",
+                             "abbreviation":            version_id,
+                             "language":                "English",
+                             "lang":                    "en",
+                             "direction":               "LTR",
+                             "distribution_license":    "Public Domain",
+                             "sha":                     self.translation_checksum(version_id)}
+                for version_id in self.version_ids}
+
+    def translation_checksum(self, version_id: str) -> str:
+        revisions = sorted((book_num, revision)
+                           for (rev_version_id, book_num), revision in self.book_revisions.items()
+                           if rev_version_id == version_id)
+        return _sha(version_id + "".join(f"/{book_num}.{revision}" for book_num, revision in revisions))
+
+    def book_checksum(self, version_id: str, book_num: int) -> str:
+        revision = self.book_revisions.get((version_id, book_num), 0)
+        return _sha(f"{version_id}/{book_num}" + (f".{revision}" if revision > 0 else ""))
+
+    def chapter(self, version_id: str, book_num: int, chap_num: int) -> dict:
+        book = _ALL_BOOKS[book_num - 1]
+        revision = self.book_revisions.get((version_id, book_num), 0)
+        revision_text = f" (revision {revision})" if revision > 0 else ""
+        return {"translation":  f"{version_id.upper()} Stand-In Version",
+                "abbreviation": version_id,
+                "book_nr":      book_num,
+                "book_name":    book.name,
+                "chapter":      chap_num,
+                "name":         f"{book.name} {chap_num}",
+                "verses":       [{"chapter":    chap_num,
+                                  "verse":      verse_num,
+                                  "name":       f"{book.name} {chap_num}:{verse_num}",
+                                  "text":       f"{version_id} {book.name} {chap_num}:{verse_num}{revision_text}"}
+                                 for verse_num in range(1, book.max_verse_num(chap_num) + 1)]}
+
+    def book(self, version_id: str, book_num: int) -> dict:
+        book = _ALL_BOOKS[book_num - 1]
+        return {"translation":  f"{version_id.upper()} Stand-In Version",
+                "abbreviation": version_id,
+                "nr":           book_num,
+                "name":         book.name,
+                "chapters":     [self.chapter(version_id, book_num, chap_num)
+                                 for chap_num in range(1, book.max_chap_num() + 1)]}
+
+    def response_for_path(self, path: str):
+        '''Returns the decoded JSON for a request path, or None if there's nothing at that path.'''
+        if path.removeprefix("/v2") in self.missing_paths:
+            return None
+        if path == "/v2/translations.json":
+            return self.translations()
+        if path == "/v2/checksum.json":
+            return {version_id: self.translation_checksum(version_id) for version_id in self.version_ids}
+        match = re.fullmatch(r"/v2/(\w+)/(?:(checksum)|(\d+)(?:/(\d+))?)\.json", path)
+        if match is None or match[1] not in self.version_ids:
+            return None
+        version_id = match[1]
+        if match[2] is not None:
+            return {str(book_num): self.book_checksum(version_id, book_num)
+                    for book_num in range(1, len(_ALL_BOOKS) + 1)}
+        book_num = int(match[3])
+        if not 1 <= book_num <= len(_ALL_BOOKS):
+            return None
+        if match[4] is None:
+            return self.book(version_id, book_num)
+        chap_num = int(match[4])
+        if not 1 <= chap_num <= _ALL_BOOKS[book_num - 1].max_chap_num():
+            return None
+        return self.chapter(version_id, book_num, chap_num)
+
+
+class _GetBibleStandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Allow keep-alive connections, as the real service does
+    stand_in: GetBibleStandInServer = None
+
+    def do_GET(self):
+        stand_in = self.stand_in
+        with stand_in._lock:
+            stand_in.request_count += 1
+            stand_in._in_flight += 1
+            stand_in.max_in_flight = max(stand_in.max_in_flight, stand_in._in_flight)
+            delay = stand_in.latency + stand_in._random.uniform(0, stand_in.jitter)
+            is_error = stand_in._random.random() < stand_in.error_rate
+            if is_error:
+                stand_in.error_count += 1
+        try:
+            if delay > 0:
+                time.sleep(delay)
+            if is_error:
+                self.send_response(503)
+                self.send_header("Retry-After", str(stand_in.retry_after))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            data = stand_in.response_for_path(self.path)
+            if data is None:
+                self.send_error(404)
+                return
+            body = json.dumps(data).encode("utf-8")
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with stand_in._lock:
+                stand_in._in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass    # Keep test and benchmark output quiet
+
+
+def _sha(string: str) -> str:
+    return hashlib.sha1(string.encode("utf-8")).hexdigest()
@@ -0,0 +1,170 @@
+from pathlib import Path
+import tempfile
+import unittest
+from unittest import mock
+
+from multiscript import cli
+from test.application import TEST_APP, MultiscriptAppTestCase
+from test.benchmark_load_bible_content import run_benchmark
+from test.getbible_stand_in import GetBibleStandInServer
+import multiscript.plan
+from multiscript.plan.monitor import PlanMonitor
+from multiscript.plan.runner import PlanRunner
+from multiscript.sources.base import VersionProgressReporter
+from multiscript.sources.getbible_dot_net import GetBibleDotNetSource
+
+
+class TestGetBibleStandIn(MultiscriptAppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.source = TEST_APP.source('multiscript-builtin/getbible.net')
+        self.orig_api_base_url = self.source.api_base_url
+        self.orig_use_chapter_cache = self.source.app_config.use_chapter_cache
+        self.source.app_config.use_chapter_cache = False
+
+    def tearDown(self):
+        self.source.api_base_url = self.orig_api_base_url
+        self.source.app_config.use_chapter_cache = self.orig_use_chapter_cache
+
+    def test_load_bible_content(self):
+        with GetBibleStandInServer(["kjv", "web"]) as server:
+            self.source.api_base_url = server.api_base_url
+            plan = multiscript.plan.Plan()
+            plan.bible_passages = "John 3:16-17, Jude, John 3"
+            plan.bible_versions = [self.source.new_bible_version("kjv", abbrev="KJV"),
+                                   self.source.new_bible_version("web", abbrev="WEB")]
+            plan.version_selection = [[True, True]]
+            runner = PlanRunner(plan, PlanMonitor())
+            runner.total_progress_steps = len(runner.bible_ranges) * len(runner.all_versions)
+            fetch_plans = []
+            orig_fetch_plan = GetBibleDotNetSource.fetch_plan
+            def recording_fetch_plan(source, bible_ranges, runner=None):
+                fetch_plans.append(orig_fetch_plan(source, bible_ranges, runner))
+                return fetch_plans[-1]
+            with mock.patch.object(GetBibleDotNetSource, 'fetch_plan', autospec=True,
+                                   side_effect=recording_fetch_plan):
+                runner.load_bible_content()
+
+        web_contents = runner.bible_contents[plan.bible_versions[1]]
+        self.assertEqual(web_contents[0].body.all_text(), "16 web John 3:16 17 web John 3:17")
+        self.assertTrue(web_contents[1].body.all_text().endswith("25 web Jude 1:25"))
+        self.assertTrue(web_contents[2].body.all_text().startswith("3:1 web John 3:1 2 web John 3:2"))
+        # John 3 is only fetched once per version, despite appearing in two passages, and no chapter data is
+        # kept once the versions have loaded
+        self.assertEqual(server.request_count, 4)
+        self.assertEqual(len(fetch_plans), 2)
+        self.assertEqual([fetch_plan._book_chapters for fetch_plan in fetch_plans], [{}, {}])
+
+    def test_chapter_missing_from_book(self):
+        with MissingChapterStandInServer(["web"]) as server:
+            self.source.api_base_url = server.api_base_url
+            plan = multiscript.plan.Plan()
+            plan.bible_passages = "Ruth 1-4"
+            plan.bible_versions = [self.source.new_bible_version("web", abbrev="WEB")]
+            plan.version_selection = [[True]]
+            runner = PlanRunner(plan, PlanMonitor())
+            runner.total_progress_steps = len(runner.bible_ranges) * len(runner.all_versions)
+            runner.load_bible_content()
+
+        # The chapter missing from the downloaded book is downloaded by itself
+        self.assertEqual(runner.errors, [])
+        self.assertEqual(server.request_count, 2)
+        ruth_text = runner.bible_contents[plan.bible_versions[0]][0].body.all_text()
+        for chap_num in range(1, 5):
+            self.assertIn(f"web Ruth {chap_num}:1", ruth_text)
+
+    def test_batch_load(self):
+        # Two plans loading from the source at the same time share its session, executor and chapter cache, and
+        # the first to finish loading mustn't close them while the other is still loading.
+        with GetBibleStandInServer(["kjv", "web"], latency=0.2) as server, \
+                tempfile.TemporaryDirectory() as temp_dir:
+            self.source.api_base_url = server.api_base_url
+            temp_dir_path = Path(temp_dir)
+            template_path = temp_dir_path / "Template.txt"
+            template_path.write_text("[MSC_ALL_TABLES]", encoding='utf-8')
+            plan_paths = []
+            for version_id, bible_passages in (("kjv", "Jude"), ("web", "Ruth 1-4")):
+                plan = multiscript.plan.Plan()
+                plan.path = temp_dir_path / f"{version_id} Plan.mplan"
+                plan.bible_passages = bible_passages
+                plan.bible_versions = [self.source.new_bible_version(version_id, abbrev=version_id.upper())]
+                plan.version_selection = [[True]]
+                plan.template_path = template_path
+                plan.save()
+                plan_paths.append(plan.path)
+
+            output_dir_path = temp_dir_path / "Output"
+            results = cli.run_batch(plan_paths, workers=2, output_dir_path=output_dir_path)
+            kjv_text = "\n".join(path.read_text(encoding='utf-8')
+                                  for path in (output_dir_path / "kjv Plan").rglob("*.txt"))
+            web_text = "\n".join(path.read_text(encoding='utf-8')
+                                  for path in (output_dir_path / "web Plan").rglob("*.txt"))
+
+        self.assertEqual([result.succeeded for result in results], [True, True])
+        self.assertEqual(server.request_count, 2)     # One whole book for each plan
+        self.assertEqual(self.source._fetch_plans, {})
+        self.assertIsNone(self.source._download_executor)
+        self.assertIsNone(self.source._http_session)
+        self.assertIn("kjv Jude 1:25", kjv_text)
+        for chap_num in range(1, 5):
+            self.assertIn(f"web Ruth {chap_num}:1", web_text)
+
+    def test_catalog_revalidation(self):
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                mock.patch.object(GetBibleDotNetSource, 'catalog_cache_path', new_callable=mock.PropertyMock,
+                                  return_value=Path(temp_dir, "catalog.json")):
+            with GetBibleStandInServer(["kjv", "web"]) as server:
+                self.source.api_base_url = server.api_base_url
+
+                # With no cached catalog, the versions are returned, and the catalog cached
+                versions = self.source.get_all_versions(RecordingProgressReporter())
+                self.assertEqual([version.id for version in versions], ["kjv", "web"])
+                cached_etag = self.source.load_catalog_cache()['etag']
+                self.assertIsNotNone(cached_etag)
+
+                # An unchanged catalog (a 304 response) keeps the cached versions
+                reporter = RecordingProgressReporter()
+                self.assertEqual(self.source.get_all_versions(reporter), [])
+                self.assertEqual(reporter.added_ids, ["kjv", "web"])
+                self.assertIsNone(reporter.replaced_ids)
+                self.assertEqual(self.source.load_catalog_cache()['etag'], cached_etag)
+
+                # A changed catalog replaces the cached versions
+                server.version_ids.append("asv")
+                reporter = RecordingProgressReporter()
+                self.assertEqual(self.source.get_all_versions(reporter), [])
+                self.assertEqual(reporter.added_ids, ["kjv", "web"])
+                self.assertEqual(reporter.replaced_ids, ["kjv", "web", "asv"])
+                self.assertNotEqual(self.source.load_catalog_cache()['etag'], cached_etag)
+
+            # If the catalog can't be revalidated, the cached versions are kept
+            reporter = RecordingProgressReporter()
+            self.assertEqual(self.source.get_all_versions(reporter), [])
+            self.assertEqual(reporter.added_ids, ["kjv", "web", "asv"])
+            self.assertIsNone(reporter.replaced_ids)
+
+    def test_load_with_server_errors(self):
+        result = run_benchmark(num_versions=2, num_chapters=2, error_rate=0.3, seed=0)
+        self.assertGreater(result['server_errors'], 0)
+        self.assertEqual(result['load_errors'], 0)
+
+
+class MissingChapterStandInServer(GetBibleStandInServer):
+    '''Stand-in whose whole books are missing their third chapter, which can still be requested by itself.'''
+    def book(self, version_id: str, book_num: int) -> dict:
+        book_dict = super().book(version_id, book_num)
+        book_dict["chapters"] = [chap_dict for chap_dict in book_dict["chapters"] if chap_dict["chapter"] != 3]
+        return book_dict
+
+
+class RecordingProgressReporter(VersionProgressReporter):
+    '''Records the ids of the versions reported to it.'''
+    def __init__(self):
+        self.added_ids = []
+        self.replaced_ids = None
+
+    def add_versions(self, bible_versions):
+        self.added_ids.extend(version.id for version in bible_versions)
+
+    def replace_source_versions(self, bible_source, bible_versions):
+        self.replaced_ids = [version.id for version in bible_versions]
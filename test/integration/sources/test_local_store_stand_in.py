@@ -0,0 +1,93 @@
+from pathlib import Path
+import tempfile
+
+from bibleref import BibleBook, BibleVerse
+
+from test.application import TEST_APP, MultiscriptAppTestCase
+from test.getbible_stand_in import GetBibleStandInServer
+from multiscript.sources.local_store import TranslationSyncError
+
+
+class TestLocalStoreStandIn(MultiscriptAppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.source = TEST_APP.source('multiscript-builtin/local-store')
+        self.orig_api_base_url = self.source.api_base_url
+        self.orig_store_path = self.source.app_config.store_path
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source.app_config.store_path = Path(self.temp_dir.name, "translations.sqlite3")
+
+    def tearDown(self):
+        self.source.store.close()
+        self.source.api_base_url = self.orig_api_base_url
+        self.source.app_config.store_path = self.orig_store_path
+        self.temp_dir.cleanup()
+
+    def test_sync_changed_book(self):
+        with GetBibleStandInServer(["kjv", "web"]) as server:
+            self.source.api_base_url = server.api_base_url
+            self.source.import_getbible_translation("kjv")
+            self.assertEqual(self.source.store.get_verse("kjv", BibleVerse(BibleBook.Ruth, 1, 1)), "kjv Ruth 1:1")
+
+            # With nothing changed, only the translation checksums are requested
+            self.assertEqual(self.source.sync_translations(), [])
+            self.assertEqual(self.synced_paths(server, 1), ["/checksum.json"])
+
+            # Only the changed book is requested
+            server.change_book("kjv", 8)
+            self.assertEqual(self.source.sync_translations(), ["kjv"])
+            self.assertEqual(self.synced_paths(server, 3), ["/checksum.json", "/kjv/checksum.json", "/kjv/8.json"])
+            self.assertEqual(self.source.store.get_verse("kjv", BibleVerse(BibleBook.Ruth, 1, 1)),
+                             "kjv Ruth 1:1 (revision 1)")
+            self.assertEqual(self.source.store.get_verse("kjv", BibleVerse(BibleBook.John, 1, 1)), "kjv John 1:1")
+
+    def test_sync_failed_translation(self):
+        with GetBibleStandInServer(["kjv", "web"]) as server:
+            self.source.api_base_url = server.api_base_url
+            self.source.import_getbible_translation("kjv")
+            self.source.import_getbible_translation("web")
+
+            # A translation that fails to sync doesn't stop the others
+            server.change_book("kjv", 8)
+            server.change_book("web", 8)
+            server.missing_paths.add("/kjv/8.json")
+            with self.assertRaises(TranslationSyncError) as context:
+                self.source.sync_translations()
+            self.assertEqual(context.exception.failed_version_ids, ["kjv"])
+            self.assertEqual(context.exception.updated_version_ids, ["web"])
+            self.assertEqual(self.source.store.get_verse("web", BibleVerse(BibleBook.Ruth, 1, 1)),
+                             "web Ruth 1:1 (revision 1)")
+            self.assertEqual(self.source.store.get_verse("kjv", BibleVerse(BibleBook.Ruth, 1, 1)), "kjv Ruth 1:1")
+            self.assertIn("kjv/8.json", "".join(entry['url'] for entry in self.source.store.sync_log()
+                                                if entry['status'] == 404))
+            self.assertIn("Sync failed", "".join(entry['note'] for entry in self.source.store.sync_log()
+                                                 if entry['version_id'] == "kjv"))
+
+            # The failed translation is synced again next time
+            server.missing_paths.clear()
+            self.assertEqual(self.source.sync_translations(), ["kjv"])
+            self.assertEqual(self.source.store.get_verse("kjv", BibleVerse(BibleBook.Ruth, 1, 1)),
+                             "kjv Ruth 1:1 (revision 1)")
+
+    def test_other_store_path(self):
+        other_store_path = Path(self.temp_dir.name, "other.sqlite3")
+        with GetBibleStandInServer(["kjv", "web"]) as server:
+            self.source.api_base_url = server.api_base_url
+
+            # Listing translations doesn't create a store
+            self.assertEqual(self.source.get_all_versions(None), [])
+            self.assertEqual(self.source.stored_translations(other_store_path), [])
+            self.assertFalse(self.source.store_path.exists())
+            self.assertFalse(other_store_path.exists())
+
+            # A store other than the one in the app config can be used (e.g. as chosen in the config panel)
+            self.source.import_getbible_translation("web", store=self.source.store_for_path(other_store_path))
+            self.assertEqual([translation['version_id']
+                              for translation in self.source.stored_translations(other_store_path)], ["web"])
+            self.assertEqual(self.source.get_all_versions(None), [])
+            self.source.store_for_path(other_store_path).close()
+
+    def synced_paths(self, server: GetBibleStandInServer, count: int) -> list[str]:
+        '''Returns the paths (relative to the API base URL) of the last count requests in the store's sync log,
+        oldest first.'''
+        return [entry['url'].removeprefix(server.api_base_url) for entry in self.source.store.sync_log(count)][::-1]
@@ -0,0 +1,33 @@
+import unittest
+
+from bibleref.ref import BibleRange
+
+from test.application import TEST_APP, MultiscriptAppTestCase
+from multiscript.bible.cache import BibleContentCache
+from multiscript.bible.content import BibleContent
+
+
+class TestBibleContentCache(MultiscriptAppTestCase):
+    def test_lru_eviction(self):
+        source = TEST_APP.source('multiscript-builtin/getbible.net')
+        version = source.new_bible_version("kjv", abbrev="KJV")
+        contents = []
+        for chap_num in range(1, 4):
+            content = BibleContent()
+            content.bible_version = version
+            content.bible_range = BibleRange("John", chap_num)
+            content.body.current_verse = content.bible_range.start
+            content.body.add_text(f"John {chap_num}")
+            contents.append(content)
+        cache = BibleContentCache(max_bytes=2 * len(contents[0].to_bytes()))
+
+        cache.put(contents[0])
+        cache.put(contents[1])
+        self.assertEqual(cache.get(version, contents[0].bible_range).body.all_text(), "John 1")
+        cache.put(contents[2])   # Evicts John 2, the least recently used
+        self.assertIsNone(cache.get(version, contents[1].bible_range))
+        self.assertEqual(cache.get(version, contents[2].bible_range).body.all_text(), "John 3")
+        self.assertEqual(len(cache), 2)
+
+        cache.discard_version(version.long_id)
+        self.assertEqual((len(cache), cache.total_bytes), (0, 0))
@@ -1,4 +1,7 @@
 import unittest
+from collections import Counter
+
+from bibleref.ref import BibleRange, BibleVerse
 
 from multiscript.bible.content import *
 
@@ -15,3 +18,161 @@ class TestBibleContent(unittest.TestCase):
         self.assertEqual(token_str, str(BibleTextToken(None, None,"Hello World")))
         token_str = str(content.body.tokens.pop(0))
         self.assertEqual(token_str, str(BibleEndSmallCapsToken(None, None)))
+
+    def test_token_views(self):
+        content = BibleContent()
+        content.bible_range = BibleRange("Ps 23")
+        content.body.add_start_paragraph(is_poetry=True)
+        content.body.add_text("The Lord is my shepherd")
+        content.body.current_verse = BibleVerse("Ps 23:2")
+        content.body.add_text("He makes me lie down")
+        content.body.add_end_paragraph()
+
+        tokens = content.body.tokens
+        self.assertEqual(len(tokens), 4)
+        self.assertTrue(tokens[0].is_poetry)
+        self.assertIs(tokens[1].type, BibleStreamTokenType.TEXT)
+        self.assertEqual(tokens[2].bible_verse, BibleVerse("Ps 23:2"))
+        self.assertEqual([token.text for token in tokens if token.has_text],
+                         ["The Lord is my shepherd", "He makes me lie down"])
+
+        tokens[1].text = "I shall not want"
+        self.assertEqual(content.body.all_text(), "I shall not wantHe makes me lie down\n\n")
+
+        content.body.constrain(BibleRange("Ps 23:2"))
+        self.assertEqual([str(token) for token in content.body.tokens],
+                         [str(BibleTextToken(None, BibleVerse("Ps 23:2"), "He makes me lie down")),
+                          str(BibleEndParagraphToken(None, BibleVerse("Ps 23:2")))])
+
+    def test_stream_views(self):
+        content = BibleContent()
+        content.bible_range = BibleRange("Ps 23-24")
+        for chap_num in (23, 24):
+            content.body.add_start_paragraph()
+            for verse_num in range(1, 4):
+                content.body.current_verse = BibleVerse("Ps", chap_num, verse_num)
+                content.body.add_text(f"{chap_num}:{verse_num} ")
+            content.body.add_end_paragraph()
+
+        view = content.body.view(BibleRange("Ps 23:2-24:1"))
+        self.assertEqual(view.all_text(), "23:2 23:3 \n\n24:1 ")
+        self.assertEqual(view.view(BibleRange("Ps 23:3")).all_text(), "23:3 \n\n")
+        self.assertEqual(len(content.body.view(BibleRange("Ps 25"))), 0)
+
+        # Verses added out of order are still found
+        content.body.current_verse = BibleVerse("Ps 23:2")
+        content.body.add_text("more 23:2")
+        self.assertEqual(content.body.view(BibleRange("Ps 23:2")).all_text(), "23:2 more 23:2")
+
+        content.body.constrain(BibleRange("Ps 24"))
+        self.assertEqual(content.body.all_text(), "24:1 24:2 24:3 \n\n")
+
+    def test_text_merging_and_batches(self):
+        content = BibleContent()
+        content.bible_range = BibleRange("Ps 23:1-2")
+        content.body.add_text("The Lord ")
+        content.body.add_text("is my shepherd")
+        content.body.current_verse = BibleVerse("Ps 23:2")
+        content.body.add_text(" He makes me lie down")
+        content.body.add_start_small_caps()
+        content.body.add_text("lord")
+        content.body.add_end_small_caps()
+        self.assertEqual([token.text for token in content.body.tokens if token.has_text],
+                         ["The Lord is my shepherd", " He makes me lie down", "lord"])
+
+        class RecordingHandler(BibleStreamHandler):
+            def __init__(self):
+                self.token_batches = []
+
+            def add_token_batch(self, token_batch):
+                self.token_batches.append(token_batch)
+
+        handler = RecordingHandler()
+        content.body.copyStreamTo(handler)
+        self.assertEqual(handler.token_batches, [[(BibleStreamTokenType.TEXT, "The Lord is my shepherd"),
+                                                  (BibleStreamTokenType.TEXT, " He makes me lie down"),
+                                                  (BibleStreamTokenType.START_SMALL_CAPS, None),
+                                                  (BibleStreamTokenType.TEXT, "lord"),
+                                                  (BibleStreamTokenType.END_SMALL_CAPS, None)]])
+        self.assertEqual(content.body.all_text(), "The Lord is my shepherd He makes me lie downLORD")
+
+    def test_plain_text_and_scripts(self):
+        content = BibleContent()
+        content.bible_range = BibleRange("Ps 23:1-2")
+        content.body.add_start_paragraph()
+        content.body.add_text("The ")
+        content.body.add_start_small_caps()
+        content.body.add_text("Lord")
+        content.body.add_end_small_caps()
+        content.body.add_line_break()
+        content.body.current_verse = BibleVerse("Ps 23:2")
+        content.body.add_text("Κύριος")
+        content.body.add_end_paragraph()
+
+        self.assertEqual(content.body.all_text(), "The LORD\nΚύριος\n\n")
+        self.assertEqual(content.body.character_count, 17)
+        self.assertEqual(content.body.script_counts(), Counter({'Latin': 7, 'Greek': 6, 'Common': 4}))
+
+        content.body.add_text(" ποιμαίνει")
+        self.assertEqual(content.body.script_counts()['Greek'], 15)
+
+        content.body.constrain(BibleRange("Ps 23:1"))
+        self.assertEqual(content.body.all_text(), "The LORD\n")
+        self.assertEqual(content.body.script_counts(), Counter({'Latin': 7, 'Common': 2}))
+
+    def test_add_verses(self):
+        verses = [(BibleVerse("Ps 23:1"), "1", " The Lord is my shepherd ", VerseFlag.START_PARA | VerseFlag.POETRY),
+                  (BibleVerse("Ps 23:2"), "2", "He makes me lie down", VerseFlag.LINE_BREAK),
+                  (BibleVerse("Ps 23:3"), "3", "He restores my soul", VerseFlag.END_PARA),
+                  (BibleVerse("Ps 24:1"), "1", "The earth is the Lord's", None)]
+        bulk_content = BibleContent()
+        single_content = BibleContent()
+        for content in (bulk_content, single_content):
+            content.bible_range = BibleRange("Ps 23-24")
+            content.body.strip_text = True
+            content.body.insert_missing_whitespace = True
+            content.body.insert_missing_chap_num = True
+
+        bulk_content.body.add_verses(verses)
+        for bible_verse, verse_num_text, text, verse_flags in verses:
+            if verse_flags and verse_flags & VerseFlag.START_PARA:
+                single_content.body.add_start_paragraph(is_poetry=bool(verse_flags & VerseFlag.POETRY))
+            single_content.body.current_verse = bible_verse
+            single_content.body.add_start_verse_num()
+            single_content.body.add_text(verse_num_text)
+            single_content.body.add_end_verse_num()
+            single_content.body.add_text(text)
+            if verse_flags and verse_flags & VerseFlag.LINE_BREAK:
+                single_content.body.add_line_break()
+            if verse_flags and verse_flags & VerseFlag.END_PARA:
+                single_content.body.add_end_paragraph()
+
+        self.assertEqual([str(token) for token in bulk_content.body.tokens],
+                         [str(token) for token in single_content.body.tokens])
+        self.assertEqual(bulk_content.body.all_text(),
+                         "23:1 The Lord is my shepherd 2 He makes me lie down\n" +
+                         "3 He restores my soul\n\n 24:1 The earth is the Lord's")
+
+    def test_binary_encoding(self):
+        content = BibleContent()
+        content.bible_range = BibleRange("Ps 23-24")
+        content.body.add_start_paragraph(is_poetry=True)
+        for chap_num in (23, 24):
+            for verse_num in range(1, 3):
+                content.body.current_verse = BibleVerse("Ps", chap_num, verse_num)
+                content.body.add_text(f"Ψαλμός {chap_num}:{verse_num} ")
+        content.body.add_end_paragraph()
+        content.body.tokens.pop(1)  # Leave unused text in the text buffer
+
+        decoded = BibleContent.from_bytes(content.to_bytes())
+        self.assertEqual(decoded.bible_range, content.bible_range)
+        self.assertEqual([str(token) for token in decoded.body.tokens],
+                         [str(token) for token in content.body.tokens])
+        self.assertTrue(decoded.body.tokens[0].is_poetry)
+        self.assertEqual(decoded.body.view(BibleRange("Ps 24:1")).all_text(), "Ψαλμός 24:1 ")
+        self.assertEqual(decoded.body.all_text(), content.body.all_text())
+
+        with self.assertRaises(BibleContentFormatError):
+            BibleContent.from_bytes(b"not Bible content")
+        with self.assertRaises(BibleContentFormatError):
+            BibleContent.from_bytes(content.to_bytes()[:-16])
@@ -0,0 +1,29 @@
+import unittest
+
+from bibleref.ref import BibleBook, BibleRange, BibleVerse
+
+from multiscript.bible.verse_id import *
+
+
+class TestVerseId(unittest.TestCase):
+    def test_verse_ids(self):
+        verse = BibleVerse(BibleBook.Psa, 119, 176)
+        self.assertEqual(verse_from_id(verse_id(verse.book, verse.chap_num, verse.verse_num)), verse)
+        self.assertEqual(verse_to_id(verse), verse_id(BibleBook.Psa, 119, 176))
+        self.assertLess(verse_id(BibleBook.Gen, 50, 26), verse_id(BibleBook.Exod, 1, 1))
+        self.assertEqual(verse_to_id(None), NO_VERSE_ID)
+        self.assertIsNone(verse_from_id(NO_VERSE_ID))
+
+    def test_interning(self):
+        verse_1 = verse_from_id(verse_id(BibleBook.John, 3, 16))
+        verse_2 = intern_verse(BibleVerse("John 3:16"))
+        self.assertIs(verse_1, verse_2)
+        self.assertEqual(verse_1, BibleVerse("John 3:16"))
+
+    def test_range_ids(self):
+        start_id, end_id = range_to_ids(BibleRange("Ps 23"))
+        self.assertEqual(start_id, verse_id(BibleBook.Psa, 23, 1))
+        self.assertEqual(end_id, verse_id(BibleBook.Psa, 23, 6))
+        self.assertTrue(start_id < chap_base_id(BibleBook.Psa, 23) + 4 < end_id)
+        book_start_id, book_end_id = book_to_ids(BibleBook.Psa)
+        self.assertTrue(book_start_id < start_id < end_id < book_end_id < verse_id(BibleBook.Prov, 1, 1))
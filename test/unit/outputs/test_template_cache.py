@@ -0,0 +1,40 @@
+from pathlib import Path
+import tempfile
+from types import SimpleNamespace
+import unittest
+
+from test.application import TEST_APP, MultiscriptAppTestCase
+from multiscript.outputs.template_cache import TemplateDocumentCache
+
+
+class TestTemplateDocumentCache(MultiscriptAppTestCase):
+    def test_read_template(self):
+        output = TEST_APP.output('multiscript-builtin/plain_text')
+        cache = TemplateDocumentCache(max_entries=1)
+        runner = SimpleNamespace(template_document_cache=cache)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_path = Path(temp_dir, "Template.txt")
+            template_path.write_text("Template", encoding='utf-8')
+
+            # Each document read is a separate copy of the parsed template
+            document = output.read_template(runner, template_path)
+            document.append(" changed")
+            self.assertEqual(str(output.read_template(runner, template_path)), "Template")
+            self.assertEqual((cache.hit_count, cache.miss_count), (1, 1))
+
+            # An edited template is parsed again
+            template_path.write_text("Edited template", encoding='utf-8')
+            self.assertEqual(str(output.read_template(runner, template_path)), "Edited template")
+            self.assertEqual((cache.hit_count, cache.miss_count), (1, 2))
+            self.assertEqual(len(cache), 1)
+
+    def test_word_template_copies(self):
+        output = TEST_APP.output('multiscript-builtin/word')
+        cache = TemplateDocumentCache()
+        runner = SimpleNamespace(template_document_cache=cache)
+        document = output.read_template(runner, TEST_APP.default_template_path)
+        paragraph_count = len(document.paragraphs)
+        document.add_paragraph("Extra paragraph")
+        self.assertEqual(len(output.read_template(runner, TEST_APP.default_template_path).paragraphs),
+                         paragraph_count)
+        self.assertEqual(cache.hit_count, 1)
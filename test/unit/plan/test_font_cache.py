@@ -0,0 +1,25 @@
+import unittest
+
+from fontfinder import TextInfo
+
+from multiscript.plan.font_cache import FontCache
+
+
+class CountingFontFinder:
+    def __init__(self):
+        self.find_count = 0
+
+    def find_family(self, text_info):
+        self.find_count += 1
+        return f"Noto Sans {text_info.main_script}"
+
+
+class TestFontCache(unittest.TestCase):
+    def test_find_family(self):
+        cache = FontCache()
+        font_finder = CountingFontFinder()
+        cache._font_finder = font_finder
+        for main_script in ("Arabic", "Thai", "Arabic"):
+            self.assertEqual(cache.find_family(TextInfo(main_script=main_script)), f"Noto Sans {main_script}")
+        self.assertEqual(font_finder.find_count, 2)
+        self.assertEqual((cache.hit_count, cache.miss_count), (1, 2))
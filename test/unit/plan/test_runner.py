@@ -0,0 +1,400 @@
+import asyncio
+import os
+from pathlib import Path
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from bibleref import BibleRangeList
+
+from test.application import TEST_APP, MultiscriptAppTestCase
+import multiscript.plan
+from multiscript.bible.version import BibleVersion
+from multiscript.outputs.plain_text import PlainTextOutput
+from multiscript.plan.monitor import PlanMonitor
+from multiscript.plan.runner import CancelError, PlanRunner
+from multiscript.sources.base import BibleSource
+
+
+class AsyncTestSource(BibleSource):
+    def __init__(self):
+        super().__init__(None)
+        self.id = "async-test"
+        self.name = "Async Test"
+        self.max_concurrent_loads = 3
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.loop_resource = None
+
+    @property
+    def long_id(self):
+        return self.id
+
+    def new_bible_version(self, version_id=None, name=None, lang=None, abbrev=None):
+        return AsyncTestVersion(self, version_id, name, lang, abbrev)
+
+    async def bible_content_loading_async(self, runner):
+        self.loop_resource = asyncio.get_running_loop()
+
+    async def bible_content_loaded_async(self, runner):
+        self.loop_resource = None
+
+
+class AsyncTestVersion(BibleVersion):
+    async def load_content_async(self, bible_range, bible_content, plan_runner=None):
+        source = self.bible_source
+        assert source.loop_resource is asyncio.get_running_loop()
+        source.in_flight += 1
+        source.max_in_flight = max(source.max_in_flight, source.in_flight)
+        await asyncio.sleep(0.01)
+        source.in_flight -= 1
+        bible_content.body.current_verse = bible_range.start
+        bible_content.body.add_text(f"{self.id} {str(bible_range)}")
+
+
+class CountingTestVersion(BibleVersion):
+    def __init__(self, source=None, id=None, name=None, lang=None, abbrev=None):
+        super().__init__(source, id, name, lang, abbrev)
+        self.load_count = 0
+        self.text_suffix = ""
+
+    def load_content(self, bible_range, bible_content, plan_runner=None):
+        self.load_count += 1
+        bible_content.body.current_verse = bible_range.start
+        bible_content.body.add_text(f"{self.id} {str(bible_range)}{self.text_suffix}")
+
+
+class WaitingTestVersion(CountingTestVersion):
+    '''Version whose loads wait (for up to a few seconds) until a file appears in wait_dir_path.'''
+    def __init__(self, source=None, id=None, name=None, lang=None, abbrev=None):
+        super().__init__(source, id, name, lang, abbrev)
+        self.wait_dir_path: Path = None
+        self.found_file = False
+
+    def load_content(self, bible_range, bible_content, plan_runner=None):
+        wait_end_time = time.monotonic() + 5
+        while not self.found_file and time.monotonic() < wait_end_time:
+            self.found_file = any(self.wait_dir_path.glob("*.txt"))
+            time.sleep(0.01)
+        super().load_content(bible_range, bible_content, plan_runner)
+
+
+class QueuedTestVersion(CountingTestVersion):
+    '''Version whose loads wait (for up to a few seconds) until other_version has loaded wait_count ranges.'''
+    def __init__(self, source=None, id=None, name=None, lang=None, abbrev=None):
+        super().__init__(source, id, name, lang, abbrev)
+        self.other_version: CountingTestVersion = None
+        self.wait_count = 0
+        self.waited_in_vain = False
+
+    def load_content(self, bible_range, bible_content, plan_runner=None):
+        wait_end_time = time.monotonic() + 5
+        while self.other_version.load_count < self.wait_count:
+            if time.monotonic() >= wait_end_time:
+                self.waited_in_vain = True
+                break
+            time.sleep(0.01)
+        super().load_content(bible_range, bible_content, plan_runner)
+
+
+class FailingTestVersion(CountingTestVersion):
+    '''Version whose loads of the ranges in fail_passages fail.'''
+    def __init__(self, source=None, id=None, name=None, lang=None, abbrev=None):
+        super().__init__(source, id, name, lang, abbrev)
+        self.fail_passages = ""
+
+    def load_content(self, bible_range, bible_content, plan_runner=None):
+        if bible_range in BibleRangeList(self.fail_passages):
+            raise ValueError(f"Can't load {str(bible_range)}")
+        super().load_content(bible_range, bible_content, plan_runner)
+
+
+class ConfirmationRecordingMonitor(PlanMonitor):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def request_confirmation(self, message=None, path=None):
+        self.messages.append(message)
+
+
+class CancellingMonitor(PlanMonitor):
+    def __init__(self, cancel_after_calls):
+        super().__init__()
+        self.calls_remaining = cancel_after_calls
+
+    def allow_cancel(self):
+        self.calls_remaining -= 1
+        if self.calls_remaining <= 0:
+            raise CancelError()
+
+
+class TestPlanRunner(MultiscriptAppTestCase):
+    def test_async_load(self):
+        source = AsyncTestSource()
+        plan = multiscript.plan.Plan()
+        plan.bible_passages = "John 1, John 2, John 3, Rom 1, Rom 2"
+        plan.bible_versions = [source.new_bible_version(f"v{index}", abbrev=f"V{index}") for index in range(3)]
+        plan.version_selection = [[True] * 3]
+        runner = PlanRunner(plan, PlanMonitor())
+        runner.total_progress_steps = len(runner.bible_ranges) * len(runner.all_versions)
+        runner.load_bible_content()
+
+        self.assertEqual(runner.progress_step_count, 15)
+        self.assertEqual(source.max_in_flight, 3)
+        self.assertIsNone(source.loop_resource)
+        self.assertEqual([content.body.all_text() for content in runner.bible_contents[plan.bible_versions[2]]],
+                         [f"v2 {str(bible_range)}" for bible_range in BibleRangeList(plan.bible_passages)])
+
+    def test_async_load_cancel(self):
+        source = AsyncTestSource()
+        source.max_concurrent_loads = 1
+        plan = multiscript.plan.Plan()
+        plan.bible_passages = ", ".join(f"Psa {chap_num}" for chap_num in range(1, 101))
+        plan.bible_versions = [source.new_bible_version("v0", abbrev="V0")]
+        plan.version_selection = [[True]]
+        runner = PlanRunner(plan, CancellingMonitor(cancel_after_calls=3))
+        runner.total_progress_steps = len(runner.bible_ranges) * len(runner.all_versions)
+        with self.assertRaises(CancelError):
+            runner.load_bible_content()
+
+        # The remaining loads were cancelled, and the sources cleaned up
+        self.assertLess(runner.progress_step_count, 100)
+        self.assertIsNone(source.loop_resource)
+        self.assertIsNone(runner._async_loop)
+
+    def test_source_load_limit(self):
+        # A source limited to one load at a time doesn't hold up the loads of other sources, even though its
+        # versions' loads are scheduled first.
+        limited_source = AsyncTestSource()
+        limited_source.max_concurrent_loads = 1
+        other_source = AsyncTestSource()
+        other_version = CountingTestVersion(other_source, "v1", abbrev="V1")
+        limited_versions = [QueuedTestVersion(limited_source, f"v0{index}", abbrev=f"V0{index}")
+                            for index in range(2)]
+        for version in limited_versions:
+            version.other_version = other_version
+            version.wait_count = 4
+        plan = multiscript.plan.Plan()
+        plan.bible_passages = "John 1, John 2, John 3, Rom 1"
+        plan.bible_versions = limited_versions + [other_version]
+        plan.version_selection = [[True] * 3]
+        runner = PlanRunner(plan, PlanMonitor())
+        runner.max_load_workers = 2
+        runner.content_cache = None
+        runner.total_progress_steps = len(runner.bible_ranges) * len(runner.all_versions)
+        runner.load_bible_content()
+
+        self.assertFalse(any(version.waited_in_vain for version in limited_versions))
+        self.assertEqual([version.load_count for version in plan.bible_versions], [4, 4, 4])
+        self.assertEqual(runner.progress_step_count, 12)
+
+    def test_content_cache(self):
+        source = AsyncTestSource()
+        version = CountingTestVersion(source, "v0", abbrev="V0")
+        plan = multiscript.plan.Plan()
+        plan.bible_passages = "John 1, Rom 2"
+        plan.bible_versions = [version]
+        plan.version_selection = [[True]]
+        for passages, expected_load_count in (("John 1, Rom 2", 2), ("John 1, Rom 2", 2), ("Rom 2, Jude", 3)):
+            plan.bible_passages = passages
+            runner = PlanRunner(plan, PlanMonitor())
+            runner.total_progress_steps = len(runner.bible_ranges) * len(runner.all_versions)
+            runner.load_bible_content()
+
+            # Only content not loaded by an earlier run is loaded
+            self.assertEqual(version.load_count, expected_load_count)
+            self.assertEqual(runner.progress_step_count, 2)
+            self.assertEqual([content.body.all_text() for content in runner.bible_contents[version]],
+                             [f"v0 {str(bible_range)}" for bible_range in BibleRangeList(passages)])
+
+    def test_pipelined_run(self):
+        source = AsyncTestSource()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_path = Path(temp_dir, "Template.txt")
+            template_path.write_text("[MSC_ALL_TABLES]", encoding='utf-8')
+            output_texts = []
+            for pipelined_run in (False, True):
+                TEST_APP.bible_content_cache.clear()
+                output_dir_path = Path(temp_dir, f"pipelined_{pipelined_run}")
+                fast_version = CountingTestVersion(source, "v0", abbrev="V0")
+                slow_version = WaitingTestVersion(source, "v1", abbrev="V1")
+                slow_version.wait_dir_path = output_dir_path
+                plan = multiscript.plan.Plan()
+                plan.bible_passages = "John 1, Rom 2"
+                plan.bible_versions = [fast_version, slow_version]
+                plan.version_selection = [[True, True]]
+                plan.template_path = template_path
+                plan.output_dir_path = output_dir_path
+                plan.config.general.pipelined_run = pipelined_run
+                for version in plan.bible_versions:
+                    version.auto_font = False
+                runner = PlanRunner(plan, PlanMonitor())
+                runner.run()
+
+                # Only in a pipelined run are outputs created while the slow version is still loading
+                self.assertEqual(slow_version.found_file, pipelined_run)
+                output_texts.append({path.name: path.read_text(encoding='utf-8')
+                                     for path in output_dir_path.glob("*.txt")})
+            self.assertGreater(len(output_texts[0]), 2)
+            self.assertEqual(output_texts[0], output_texts[1])
+
+    def test_pipelined_font_download(self):
+        source = AsyncTestSource()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_path = Path(temp_dir, "Template.txt")
+            template_path.write_text("[MSC_ALL_TABLES]", encoding='utf-8')
+            versions = [CountingTestVersion(source, f"v{index}", abbrev=f"V{index}") for index in range(2)]
+            plan = multiscript.plan.Plan()
+            plan.bible_passages = "John 1"
+            plan.bible_versions = versions
+            plan.version_selection = [[True, True]]
+            plan.template_path = template_path
+            plan.output_dir_path = Path(temp_dir, "output")
+            plan.config.general.pipelined_run = True
+            for index, version in enumerate(versions):
+                version.auto_font = False
+                version.font_family = f"Family {index}"
+            font_finder = mock.Mock()
+            font_finder.not_installed_families.side_effect = lambda families: families
+            font_finder.find_family_fonts_to_download.side_effect = \
+                lambda families: [mock.Mock(family_name=family, **{'copy.return_value': mock.Mock(
+                                                filename=f"{family}.ttf", fullname=family)})
+                                  for family in families]
+            monitor = ConfirmationRecordingMonitor()
+            runner = PlanRunner(plan, monitor)
+            runner.font_cache = None
+            runner._font_finder = font_finder
+            with mock.patch("multiscript.plan.runner.FONT_PLATFORMS", (platform.system(),)), \
+                 mock.patch("multiscript.plan.runner.requests.get") as requests_get:
+                requests_get.return_value.iter_content.return_value = [b"font"]
+                runner.run()
+
+            # Each version's fonts are downloaded as it becomes ready, but the download is only confirmed once
+            self.assertEqual([call.args[0] for call in font_finder.not_installed_families.call_args_list],
+                             [["Family 0"], ["Family 1"]])
+            self.assertEqual(len([message for message in monitor.messages if "install fonts" in message]), 1)
+            self.assertEqual(runner.errors, [])
+
+    def test_incremental_run(self):
+        source = AsyncTestSource()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_path = Path(temp_dir, "Template.txt")
+            template_path.write_text("[MSC_ALL_TABLES]", encoding='utf-8')
+            versions = [CountingTestVersion(source, "v0", abbrev="V0"), CountingTestVersion(source, "v1", abbrev="V1")]
+            plan = multiscript.plan.Plan()
+            plan.bible_passages = "John 1, Rom 2"
+            plan.bible_versions = versions
+            plan.version_selection = [[True, True]]
+            plan.template_path = template_path
+            plan.output_dir_path = Path(temp_dir, "output")
+            for version in versions:
+                version.auto_font = False
+
+            load_counts = []
+            for text_suffix in ("", "", " changed"):
+                TEST_APP.bible_content_cache.clear()
+                versions[1].text_suffix = text_suffix
+                with mock.patch.object(PlainTextOutput, 'load_document', autospec=True,
+                                       side_effect=PlainTextOutput.load_document) as load_document:
+                    runner = PlanRunner(plan, PlanMonitor())
+                    runner.run()
+                load_counts.append(load_document.call_count)
+                output_texts = [path.read_text(encoding='utf-8') for path in plan.output_dir_path.glob("*.txt")]
+                self.assertTrue(any(f"v1 John 1{text_suffix}" in text for text in output_texts))
+
+            # Unchanged outputs aren't created again, and only those using the changed version are recreated
+            self.assertGreater(load_counts[0], 0)
+            self.assertEqual(load_counts[1], 0)
+            self.assertGreater(load_counts[2], 0)
+            self.assertLess(load_counts[2], load_counts[0])
+
+    def test_incremental_run_relabelled_version(self):
+        source = AsyncTestSource()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_path = Path(temp_dir, "Template.txt")
+            template_path.write_text("[MSC_ALL_TABLES]", encoding='utf-8')
+            versions = [CountingTestVersion(source, f"v{index}", abbrev=f"V{index}") for index in range(3)]
+            plan = multiscript.plan.Plan()
+            plan.bible_passages = "John 1"
+            plan.bible_versions = versions
+            plan.version_selection = [[True, True, True]]
+            plan.template_path = template_path
+            plan.output_dir_path = Path(temp_dir, "output")
+            for version in versions:
+                version.auto_font = False
+
+            load_counts = []
+            for version_name in ("Version", "Renamed Version"):
+                versions[1].user_labels.name = version_name
+                with mock.patch.object(PlainTextOutput, 'load_document', autospec=True,
+                                       side_effect=PlainTextOutput.load_document) as load_document:
+                    PlanRunner(plan, PlanMonitor()).run()
+                load_counts.append(load_document.call_count)
+
+            # Only the output using the renamed version is created again
+            self.assertGreater(load_counts[0], 1)
+            self.assertEqual(load_counts[1], 1)
+
+    def test_incremental_run_in_new_process(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Each run is in a new process, with new output objects
+            code = "from test.unit.plan.test_runner import run_incremental_plan; " + \
+                   f"print(run_incremental_plan({temp_dir!r}))"
+            load_counts = []
+            for run_index in range(2):
+                result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parents[3],
+                                        capture_output=True, text=True,
+                                        env={**os.environ, "QT_QPA_PLATFORM": "offscreen"})
+                self.assertEqual(result.returncode, 0, result.stderr)
+                load_counts.append(int(result.stdout.split()[-1]))
+
+            # The outputs are unchanged, so the second run doesn't create them again
+            self.assertGreater(load_counts[0], 0)
+            self.assertEqual(load_counts[1], 0)
+
+    def test_errors(self):
+        source = AsyncTestSource()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_path = Path(temp_dir, "Template.txt")
+            template_path.write_text("[MSC_ALL_TABLES]", encoding='utf-8')
+            version = FailingTestVersion(source, "v0", abbrev="V0")
+            version.fail_passages = "Rom 2"
+            version.auto_font = False
+            plan = multiscript.plan.Plan()
+            plan.bible_passages = "John 1, Rom 2"
+            plan.bible_versions = [version]
+            plan.version_selection = [[True]]
+            plan.template_path = template_path
+            plan.output_dir_path = Path(temp_dir, "output")
+            runner = PlanRunner(plan, PlanMonitor())
+            runner.run()
+
+            # The failed load is recorded, and the run continues
+            self.assertEqual(runner.errors, ["<b>There was an error loading Romans 2 for the V0.</b>"])
+            self.assertTrue(any(plan.output_dir_path.glob("*.txt")))
+
+
+def run_incremental_plan(dir_path) -> int:
+    '''Runs a plan with its template and output in dir_path, and returns the number of documents loaded.'''
+    template_path = Path(dir_path, "Template.txt")
+    if not template_path.exists():
+        template_path.write_text("[MSC_ALL_TABLES]", encoding='utf-8')
+    source = AsyncTestSource()
+    versions = [CountingTestVersion(source, "v0", abbrev="V0"), CountingTestVersion(source, "v1", abbrev="V1")]
+    plan = multiscript.plan.Plan()
+    plan.bible_passages = "John 1, Rom 2"
+    plan.bible_versions = versions
+    plan.version_selection = [[True, False], [False, True]]
+    plan.template_path = template_path
+    plan.output_dir_path = Path(dir_path, "output")
+    for version in versions:
+        version.auto_font = False
+    with mock.patch.object(PlainTextOutput, 'load_document', autospec=True,
+                           side_effect=PlainTextOutput.load_document) as load_document:
+        PlanRunner(plan, PlanMonitor()).run()
+    return load_document.call_count
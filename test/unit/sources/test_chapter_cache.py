@@ -0,0 +1,54 @@
+from pathlib import Path
+import tempfile
+import time
+import unittest
+
+from multiscript.sources.chapter_cache import ChapterCache
+
+
+class TestChapterCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = Path(self.temp_dir.name) / "chapters.sqlite3"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_put_and_get(self):
+        cache = ChapterCache(self.cache_path)
+        self.assertIsNone(cache.get("kjv", "43", 3))
+        cache.put("kjv", "43", 3, '{"verses": []}')
+        self.assertEqual(cache.get("kjv", "43", 3), '{"verses": []}')
+        self.assertIsNone(cache.get("web", "43", 3))
+        cache.close()
+
+        # Cache persists once reopened
+        cache = ChapterCache(self.cache_path)
+        self.assertEqual(cache.get("kjv", "43", 3), '{"verses": []}')
+        self.assertEqual(cache.total_size, len('{"verses": []}'))
+        cache.close()
+
+    def test_lru_eviction(self):
+        cache = ChapterCache(self.cache_path, max_size=30)
+        cache.put("kjv", "1", 1, "a" * 10)
+        time.sleep(0.01)
+        cache.put("kjv", "1", 2, "b" * 10)
+        time.sleep(0.01)
+        cache.get("kjv", "1", 1)    # Chapter 1 is now more recently used than chapter 2
+        time.sleep(0.01)
+        cache.put("kjv", "1", 3, "c" * 15)
+        self.assertIsNotNone(cache.get("kjv", "1", 1))
+        self.assertIsNone(cache.get("kjv", "1", 2))
+        self.assertIsNotNone(cache.get("kjv", "1", 3))
+        self.assertLessEqual(cache.total_size, 30)
+        cache.close()
+
+    def test_expiry(self):
+        cache = ChapterCache(self.cache_path, ttl=0.05)
+        cache.put("kjv", "1", 1, "text")
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("kjv", "1", 1))
+        self.assertEqual(cache.get("kjv", "1", 1, allow_expired=True), "text")
+        cache.remove_expired()
+        self.assertEqual(len(cache), 0)
+        cache.close()
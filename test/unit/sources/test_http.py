@@ -0,0 +1,53 @@
+import time
+import unittest
+
+from multiscript.sources.http import AdaptiveRateLimiter
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    def test_aimd_concurrency(self):
+        limiter = AdaptiveRateLimiter(max_requests_per_sec=1000, initial_concurrency=8, max_concurrency=10)
+        limiter.acquire("example.com")
+        limiter.release("example.com", [503, 200], 0.1)
+        self.assertEqual(limiter.counters()["example.com"]['concurrency'], 4)
+        limiter.acquire("example.com")
+        limiter.release("example.com", [200], 20.0)    # Slow, but successful
+        self.assertEqual(limiter.counters()["example.com"]['concurrency'], 4)
+        limiter.acquire("example.com")
+        limiter.release("example.com", [], 15.0, error_count=1)   # Timed out
+        self.assertEqual(limiter.counters()["example.com"]['concurrency'], 2)
+        limiter.acquire("example.com")
+        limiter.release("example.com", [500, 200], 0.1)
+        self.assertEqual(limiter.counters()["example.com"]['concurrency'], 1)
+        for count in range(10):
+            limiter.acquire("example.com")
+            limiter.release("example.com", [200], 0.1)
+        counters = limiter.counters()["example.com"]
+        self.assertGreater(counters['concurrency'], 1)
+        self.assertEqual(counters['requests'], 14)
+        self.assertEqual(counters['throttled'], 1)
+        self.assertEqual(counters['min_concurrency'], 1)
+
+        # Other hosts are limited separately
+        limiter.acquire("example.org")
+        limiter.release("example.org", [200], 0.1)
+        self.assertEqual(limiter.counters()["example.org"]['concurrency'], 8)
+
+        limiter.reset_counters()
+        self.assertEqual(limiter.counters()["example.com"]['requests'], 0)
+
+    def test_rate_and_retry_after(self):
+        limiter = AdaptiveRateLimiter(max_requests_per_sec=50, burst=1)
+        start_time = time.monotonic()
+        for count in range(6):
+            limiter.acquire("example.com")
+            limiter.release("example.com", [200], 0)
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.09)
+
+        limiter.acquire("example.com")
+        limiter.release("example.com", [429], 0, retry_after=0.2)
+        start_time = time.monotonic()
+        limiter.acquire("example.com")
+        limiter.release("example.com", [200], 0)
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.15)
+        self.assertEqual(limiter.counters()["example.com"]['retry_after_pauses'], 1)
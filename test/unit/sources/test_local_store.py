@@ -0,0 +1,77 @@
+from pathlib import Path
+import sqlite3
+import tempfile
+import unittest
+
+from bibleref import BibleBook, BibleRangeList, BibleVerse
+
+from multiscript.sources.local_store import TranslationStore
+
+
+class TestTranslationStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store_path = Path(self.temp_dir.name) / "translations.sqlite3"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_put_and_get(self):
+        store = TranslationStore(self.store_path)
+        store.put_translation("kjv", "King James Version", "English", "KJV", "Public Domain")
+        store.put_book("kjv", BibleBook.John, [(chap_num, verse_num, f"John {chap_num}:{verse_num}")
+                                              for chap_num in range(1, 4)
+                                              for verse_num in range(1, BibleBook.John.max_verse_num(chap_num) + 1)])
+        store.close()
+
+        # Store persists once reopened
+        store = TranslationStore(self.store_path)
+        self.assertEqual([translation['version_id'] for translation in store.translations()], ["kjv"])
+        self.assertEqual(store.get_verse("kjv", BibleVerse(BibleBook.John, 3, 16)), "John 3:16")
+        verses = store.get_verses("kjv", BibleRangeList("John 2:24-3:2")[0])
+        self.assertEqual([text for verse, text in verses], ["John 2:24", "John 2:25", "John 3:1", "John 3:2"])
+        self.assertEqual(verses[0][0], BibleVerse(BibleBook.John, 2, 24))
+
+        # Replacing a book replaces all of its verses
+        store.put_book("kjv", BibleBook.John, [(1, 1, "In the beginning")])
+        self.assertEqual(len(store.get_verses("kjv", BibleRangeList("John")[0])), 1)
+
+        store.remove_translation("kjv")
+        self.assertEqual(store.translations(), [])
+        self.assertIsNone(store.get_verse("kjv", BibleVerse(BibleBook.John, 1, 1)))
+        store.close()
+
+    def test_checksums_and_sync_log(self):
+        store = TranslationStore(self.store_path)
+        store.put_translation("kjv", "King James Version", "English", "KJV", "Public Domain")
+        self.assertIsNone(store.get_translation_checksum("kjv"))
+        store.set_translation_checksum("kjv", "abc")
+        store.put_book("kjv", BibleBook.Jude, [(1, 1, "Jude, the servant of Jesus Christ")], checksum="def")
+        self.assertEqual(store.get_translation_checksum("kjv"), "abc")
+        self.assertEqual(store.get_book_checksums("kjv"), {BibleBook.Jude: "def"})
+
+        store.log_request("kjv", "https://example.com/1.json", 200, 100)
+        store.log_request("kjv", "https://example.com/2.json", None, 0, "Timed out")
+        self.assertEqual([entry['url'] for entry in store.sync_log()],
+                         ["https://example.com/2.json", "https://example.com/1.json"])
+
+        store.remove_translation("kjv")
+        self.assertIsNone(store.get_translation_checksum("kjv"))
+        self.assertEqual(store.get_book_checksums("kjv"), {})
+        store.close()
+
+    def test_read_only(self):
+        store = TranslationStore(self.store_path)
+        store.put_translation("kjv", "King James Version", "English", "KJV", "Public Domain")
+        store.close()
+
+        store = TranslationStore(self.store_path, read_only=True)
+        self.assertEqual([translation['version_id'] for translation in store.translations()], ["kjv"])
+        with self.assertRaises(sqlite3.OperationalError):
+            store.remove_translation("kjv")
+        store.close()
+
+        # A read-only store isn't created
+        with self.assertRaises(sqlite3.OperationalError):
+            TranslationStore(Path(self.temp_dir.name) / "missing.sqlite3", read_only=True)
+        self.assertFalse((Path(self.temp_dir.name) / "missing.sqlite3").exists())
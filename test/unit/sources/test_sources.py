@@ -3,6 +3,7 @@ from collections import Counter
 
 from multiscript.plugins import BUILTIN_PLUGIN_ID
 from multiscript.sources.getbible_dot_net import GetBibleDotNetSource
+from multiscript.sources.local_store import LocalStoreSource
 
 from test.application import TEST_APP, MultiscriptAppTestCase
 
@@ -12,7 +13,7 @@ class TestBibleSource(MultiscriptAppTestCase):
         builtin_plugin = TEST_APP.plugin(BUILTIN_PLUGIN_ID)
         source_classes = [type(source) for source in builtin_plugin.all_sources]
         
-        expected_classes = set([GetBibleDotNetSource])
+        expected_classes = set([GetBibleDotNetSource, LocalStoreSource])
         self.assertEqual(Counter(source_classes), Counter(expected_classes))
 
     def test_getbible_dot_net_source(self):
@@ -0,0 +1,27 @@
+import os
+from pathlib import Path
+import tempfile
+import unittest
+from unittest import mock
+
+import multiscript
+from multiscript.base_application import MultiscriptBaseApplication
+
+
+class TestBaseApplication(unittest.TestCase):
+    @mock.patch.object(multiscript, 'get_platform_system', return_value="Linux")
+    def test_xdg_user_docs_path(self, get_platform_system):
+        app = MultiscriptBaseApplication()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with mock.patch.dict(os.environ, {"XDG_CONFIG_HOME": temp_dir}):
+                # Without a user-dirs.dirs file, the fallback is used
+                self.assertEqual(app.user_docs_path, Path.home() / "Documents")
+
+                Path(temp_dir, "user-dirs.dirs").write_text('# Written by xdg-user-dirs-update\n' +
+                                                            'XDG_DESKTOP_DIR="$HOME/Desktop"\n' +
+                                                            'XDG_DOCUMENTS_DIR="$HOME/Dokumente"\n',
+                                                            encoding='utf-8')
+                self.assertEqual(app.user_docs_path, Path.home() / "Dokumente")
+
+                Path(temp_dir, "user-dirs.dirs").write_text('XDG_DOCUMENTS_DIR="/srv/docs"\n', encoding='utf-8')
+                self.assertEqual(app.user_docs_path, Path("/srv/docs"))
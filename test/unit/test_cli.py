@@ -0,0 +1,88 @@
+import io
+import json
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+
+import multiscript.plan
+from multiscript import cli
+from multiscript.plan.runner import PlanRunner
+
+from test.application import TEST_APP, MultiscriptAppTestCase
+
+
+class TestCli(MultiscriptAppTestCase):
+    def test_console_monitor(self):
+        stream = io.StringIO()
+        monitor = cli.ConsolePlanMonitor(stream)
+        for percent in (0, 3, 9, 10, 15, 21, 99, 100, 100):
+            monitor.set_progress_percent(percent)
+        monitor.request_confirmation("<b>There was an error creating an output for these versions:<br>A.</b>")
+        self.assertEqual(stream.getvalue().splitlines(),
+                         ["Progress: 0%", "Progress: 10%", "Progress: 21%", "Progress: 99%", "Progress: 100%",
+                          "Note: There was an error creating an output for these versions: A."])
+        self.assertEqual(len(monitor.confirmation_messages), 1)
+
+    def test_run_plan(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            plan_path = self.save_test_plan(Path(temp_dir))
+            output_dir_path = Path(temp_dir, "Other Output")
+            self.assertEqual(cli.main(["run", str(plan_path), "--output", str(output_dir_path)]), 0)
+            self.assertTrue(output_dir_path.is_dir())
+            self.assertFalse(Path(temp_dir, "Output").exists())
+
+            self.assertEqual(cli.main(["run", str(Path(temp_dir, "Missing.mplan"))]), 1)
+
+            # A run that reports errors fails
+            with mock.patch.object(PlanRunner, 'create_bible_outputs', autospec=True,
+                                   side_effect=lambda runner: runner.report_error("<b>Output error.</b>")):
+                self.assertEqual(cli.main(["run", str(plan_path)]), 1)
+
+    def test_batch(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir_path = Path(temp_dir)
+            plan_paths = [self.save_test_plan(temp_dir_path / "Plans", "Plan A"),
+                          self.save_test_plan(temp_dir_path / "Plans" / "More", "Plan B")]
+            bad_plan_path = temp_dir_path / "Bad Plan.mplan"
+            bad_plan_path.write_text("Not a plan", encoding='utf-8')
+            self.assertEqual(cli.find_plan_paths([str(temp_dir_path / "Plans"), str(temp_dir_path / "*.mplan"),
+                                                  str(plan_paths[0])]),
+                             [plan_paths[1].resolve(), plan_paths[0].resolve(), bad_plan_path.resolve()])
+
+            output_dir_path = temp_dir_path / "Batch Output"
+            report_path = temp_dir_path / "Report.json"
+            self.assertEqual(cli.main(["batch", str(temp_dir_path), "--workers", "2", "--output",
+                                       str(output_dir_path), "--report", str(report_path)]), 1)
+            self.assertEqual(sorted(path.name for path in output_dir_path.iterdir()), ["Plan A", "Plan B"])
+            with open(report_path, encoding='utf-8') as file:
+                report = json.load(file)
+            self.assertEqual([(Path(plan_report["plan"]).name, plan_report["succeeded"])
+                              for plan_report in report["plans"]],
+                             [("Bad Plan.mplan", False), ("Plan B.mplan", True), ("Plan A.mplan", True)])
+            self.assertNotEqual(report["plans"][0]["error"], "")
+            self.assertEqual(set(report["caches"].keys()), {"bible_content", "templates", "fonts"})
+
+    def test_run_without_qt(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            plan_path = self.save_test_plan(Path(temp_dir))
+            # Any import of PySide6 fails in the subprocess
+            code = "import sys; sys.modules['PySide6'] = None; from multiscript import cli; " + \
+                   f"sys.exit(cli.main(['run', {str(plan_path)!r}]))"
+            result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parents[2],
+                                    capture_output=True, text=True)
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertTrue(Path(temp_dir, "Output").is_dir())
+
+    def save_test_plan(self, dir_path: Path, plan_name: str = "Test Plan") -> Path:
+        dir_path.mkdir(parents=True, exist_ok=True)
+        template_path = dir_path / "Template.txt"
+        template_path.write_text("[MSC_ALL_TABLES]", encoding='utf-8')
+        plan = multiscript.plan.Plan()
+        plan.path = dir_path / f"{plan_name}.mplan"
+        plan.bible_passages = "John 1"
+        plan.template_path = template_path
+        plan.output_dir_path = dir_path / "Output"
+        plan.save()
+        return plan.path